@@ -0,0 +1,288 @@
+import os
+import sys
+import sqlite3
+import argparse
+from collections import OrderedDict
+
+from answer_generation.pattern_index import WILDCARDS
+from semantic_ranking.embedding_store import normalize_text
+from utils import instrumentation
+from utils.fingerprint import digest, source_fingerprint
+
+
+def normalize_pattern(pattern: str) -> str:
+    """Upper-case a slot pattern and write every wildcard as "?"."""
+    return "".join("?" if ch in WILDCARDS else ch for ch in pattern.upper())
+
+
+def cache_key(clue, pattern: str, uses_clue: bool = True) -> str:
+    """
+    Key shared by every spelling of a clue over the same pattern; the length is the pattern's.
+
+    For a source that ignores the clue (uses_clue=False) the key is the
+    pattern alone, so one entry serves every clue with that pattern.
+    """
+    if not uses_clue:
+        return normalize_pattern(pattern)
+    return f"{normalize_pattern(pattern)}\t{normalize_text(clue) if isinstance(clue, str) else ''}"
+
+
+def _matches(word: str, pattern: str) -> bool:
+    return len(word) == len(pattern) and all(p == "?" or p == w for w, p in zip(word, pattern))
+
+
+# A source is a callable (clues, patterns) -> candidate word lists. Two optional
+# attributes tell CandidateCache how to store it: uses_clue=False keys entries by
+# pattern alone, and fingerprint identifies the data and settings behind it, so a
+# cache file is never read back through a different source.
+
+def pattern_source(index, limit: int = None):
+    """Candidate source answering from a PatternIndex; clue text is ignored."""
+    def generate(clues, patterns):
+        return [index.match(pattern, limit) for pattern in patterns]
+    tables = [index.tables[length][name] for length in sorted(index.tables) for name in ("words", "freq")]
+    generate.uses_clue = False
+    generate.fingerprint = f"pattern:{digest(t.tobytes() for t in tables)}:limit={limit}"
+    return generate
+
+
+def retrieval_source(index, k: int = 50, limit: int = None):
+    """Candidate source ranking answers with a ClueRetrievalIndex, filtered to each pattern."""
+    def generate(clues, patterns):
+        hits = index.search([clue or "" for clue in clues], [len(p) for p in patterns], k=k)
+        results = []
+        for found, pattern in zip(hits, patterns):
+            words = [answer for answer, _ in found if _matches(answer, pattern)]
+            results.append(words[:limit] if limit is not None else words)
+        return results
+    answers = (" ".join(index.partitions[length]["answers"].tolist()).encode("utf-8")
+               for length in sorted(index.partitions))
+    generate.uses_clue = True
+    generate.fingerprint = f"retrieval:{digest(answers)}:k={k}:limit={limit}"
+    return generate
+
+
+class CandidateCache:
+    """
+    Memoizes a candidate source by (normalized clue, slot pattern).
+
+    Lookups go to a size-bounded in-process LRU first, then to an optional
+    SQLite file shared by every process that opens it, and only then to the
+    source, which is called once per batch of misses. The shared tier runs in
+    WAL mode, so pool workers read concurrently while one of them writes.
+    """
+
+    def __init__(self, source, path=None, maxsize: int = 100000):
+        """
+        Args:
+            source (callable): (clues, patterns) -> list of candidate word lists,
+                e.g. pattern_source(index) or retrieval_source(retriever)
+            path (str): SQLite file of the shared tier; None keeps the cache
+                in-process. A file filled by a source with a different
+                fingerprint is refused with ValueError.
+            maxsize (int): Entries held in the in-process LRU
+        """
+        self.source = source
+        self.uses_clue = getattr(source, "uses_clue", True)
+        self.fingerprint = source_fingerprint(source)
+        self.path = path
+        self.maxsize = maxsize
+        self._lru = OrderedDict()
+        self._db = None
+        self._db_pid = None
+        self.stats = {"hits": 0, "shared_hits": 0, "misses": 0, "source_calls": 0}
+
+    # ------------------------
+    # Shared tier
+    # ------------------------
+    def _conn(self):
+        # Connections must not cross a fork, so each process opens its own
+        if self._db is None or self._db_pid != os.getpid():
+            self._db = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS candidates (key TEXT PRIMARY KEY, words TEXT) WITHOUT ROWID")
+            self._db.execute("CREATE TABLE IF NOT EXISTS meta (name TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID")
+            self._db.execute("INSERT OR IGNORE INTO meta VALUES ('source', ?)", (self.fingerprint,))
+            stored = self._db.execute("SELECT value FROM meta WHERE name = 'source'").fetchone()[0]
+            if stored != self.fingerprint:
+                self._db.close()
+                self._db = None
+                raise ValueError(f"Cache at {self.path} holds candidates from '{stored}', not '{self.fingerprint}'.")
+            self._db_pid = os.getpid()
+        return self._db
+
+    def _shared_get(self, keys) -> dict:
+        if self.path is None or not keys:
+            return {}
+        found = {}
+        keys = list(keys)
+        for start in range(0, len(keys), 500):
+            chunk = keys[start:start + 500]
+            rows = self._conn().execute(
+                f"SELECT key, words FROM candidates WHERE key IN ({','.join('?' * len(chunk))})", chunk
+            )
+            found.update((key, words.split()) for key, words in rows)
+        return found
+
+    def _shared_put(self, entries: dict):
+        if self.path is None or not entries:
+            return
+        db = self._conn()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            db.executemany(
+                "INSERT OR IGNORE INTO candidates VALUES (?, ?)",
+                ((key, " ".join(words)) for key, words in entries.items()),
+            )
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+
+    def _remember(self, key, words):
+        self._lru[key] = words
+        self._lru.move_to_end(key)
+        if len(self._lru) > self.maxsize:
+            self._lru.popitem(last=False)
+
+    # ------------------------
+    # Lookup
+    # ------------------------
+    def get_many(self, clues, patterns) -> list:
+        """
+        Candidate lists for parallel clue / pattern sequences.
+
+        Returns:
+            list[list[str]]: One list per query, as the source ranked them
+        """
+        keys = [cache_key(clue, pattern, self.uses_clue) for clue, pattern in zip(clues, patterns)]
+        found = {}
+        for key in keys:
+            words = self._lru.get(key)
+            if words is not None:
+                self._lru.move_to_end(key)
+                found[key] = words
+
+        shared = self._shared_get({key for key in keys if key not in found})
+        shared_hits = sum(key in shared for key in keys)
+        found.update(shared)
+
+        missing = {}
+        for key, clue, pattern in zip(keys, clues, patterns):
+            if key not in found and key not in missing:
+                missing[key] = (clue, normalize_pattern(pattern))
+        # Repeats of a missing key within the call are served by the same source call
+        self.stats["hits"] += len(keys) - shared_hits - len(missing)
+        self.stats["shared_hits"] += shared_hits
+        self.stats["misses"] += len(missing)
+        if missing:
+            self.stats["source_calls"] += 1
+            with instrumentation.span("candidates.source", queries=len(missing)):
+                generated = self.source([c for c, _ in missing.values()], [p for _, p in missing.values()])
+            new = {key: list(words) for key, words in zip(missing, generated)}
+            self._shared_put(new)
+            found.update(new)
+
+        for key in found.keys() - self._lru.keys():
+            self._remember(key, found[key])
+        instrumentation.count("candidates.cache_hits", len(keys) - len(missing))
+        instrumentation.count("candidates.cache_misses", len(missing))
+        return [found[key] for key in keys]
+
+    def get(self, clue, pattern: str) -> list:
+        return self.get_many([clue], [pattern])[0]
+
+    def candidates(self, crossword, limit: int = None) -> dict:
+        """Candidate lists for every slot of a CrosswordGrid, ready for FillEngine."""
+        patterns = [crossword.slot_pattern(clue_id) for clue_id in crossword.slot_names]
+        found = self.get_many(crossword.slot_clues, patterns)
+        return {
+            clue_id: words[:limit] if limit is not None else words
+            for clue_id, words in zip(crossword.slot_names, found)
+        }
+
+    def hit_rate(self) -> float:
+        """Share of lookups answered without calling the source."""
+        total = self.stats["hits"] + self.stats["shared_hits"] + self.stats["misses"]
+        return (self.stats["hits"] + self.stats["shared_hits"]) / total if total else 0.0
+
+    def __contains__(self, query):
+        key = cache_key(*query, uses_clue=self.uses_clue)
+        return key in self._lru or bool(self._shared_get([key]))
+
+    def __len__(self):
+        if self.path is None:
+            return len(self._lru)
+        return self._conn().execute("SELECT COUNT(*) FROM candidates").fetchone()[0]
+
+    def close(self):
+        if self._db is not None and self._db_pid == os.getpid():
+            self._db.close()
+        self._db = None
+
+    # ------------------------
+    # Warm-up
+    # ------------------------
+    def warm(self, archive, chunksize: int = 10000, batch_size: int = 4096) -> int:
+        """
+        Preload every (clue, empty pattern) pair of an archive such as all_puzzles.csv.
+
+        These are exactly the queries a solve issues for a fresh grid, so a
+        warmed shared tier answers repeated clues without touching the source.
+        For a source that ignores clues this comes down to one entry per length.
+
+        Returns:
+            int: Entries added
+        """
+        import pandas as pd
+        from utils.puzzle_io import normalize_columns
+
+        stats = dict(self.stats)
+        added = 0
+        seen = set()
+        for chunk in pd.read_csv(archive, chunksize=chunksize):
+            chunk = normalize_columns(chunk)
+            if "length" in chunk.columns:
+                lengths = pd.to_numeric(chunk["length"], errors="coerce")
+            else:
+                lengths = chunk["answer"].str.strip().str.len()
+            queries = {}
+            for clue, length in zip(chunk["clue"].tolist(), lengths.tolist()):
+                if length != length or length <= 0:
+                    continue
+                pattern = "?" * int(length)
+                key = cache_key(clue, pattern, self.uses_clue)
+                if key not in seen:
+                    seen.add(key)
+                    queries[key] = (clue, pattern)
+            known = self._lru.keys() | self._shared_get(queries).keys()
+            todo = [query for key, query in queries.items() if key not in known]
+            for start in range(0, len(todo), batch_size):
+                batch = todo[start:start + batch_size]
+                self.get_many([c for c, _ in batch], [p for _, p in batch])
+                added += len(batch)
+        # Warm-up lookups are not part of the hit rate
+        self.stats = stats
+        return added
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Preload a shared candidate cache from a clue archive.")
+    parser.add_argument("archive", help="all_puzzles.csv-style archive")
+    parser.add_argument("cache", help="SQLite cache file to create or extend")
+    parser.add_argument("--index", required=True, help="PatternIndex file answering the misses")
+    parser.add_argument("--limit", type=int, default=None, help="candidates kept per entry")
+    args = parser.parse_args(argv)
+
+    from answer_generation.pattern_index import PatternIndex
+
+    cache = CandidateCache(pattern_source(PatternIndex.load(args.index), args.limit), path=args.cache, maxsize=0)
+    added = cache.warm(args.archive)
+    print(f"{added} entries added, {len(cache)} in {args.cache}")
+    cache.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
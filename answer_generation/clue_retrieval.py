@@ -0,0 +1,195 @@
+import numpy as np
+
+from answer_generation.pattern_index import ALPHABET
+from utils import instrumentation
+
+
+def _normalize_rows(x) -> np.ndarray:
+    x = np.asarray(x, dtype=np.float32)
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    return x / np.maximum(norms, 1e-12)
+
+
+def _merge_topk(scores, ids, new_scores, new_ids, k):
+    """Keep the k best (score, id) pairs per row of two candidate sets."""
+    scores = np.concatenate([scores, new_scores], axis=1)
+    ids = np.concatenate([ids, new_ids], axis=1)
+    if scores.shape[1] > k:
+        keep = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        scores = np.take_along_axis(scores, keep, axis=1)
+        ids = np.take_along_axis(ids, keep, axis=1)
+    return scores, ids
+
+
+def _spherical_kmeans(vectors, n_lists, iterations=10, seed=0):
+    """Cosine k-means; returns (unit centroids, list id per vector)."""
+    rng = np.random.default_rng(seed)
+    centroids = vectors[rng.choice(len(vectors), n_lists, replace=False)]
+    for _ in range(iterations):
+        assign = np.argmax(vectors @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assign, vectors)
+        empty = ~sums.any(axis=1)
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize_rows(sums)
+    return centroids, np.argmax(vectors @ centroids.T, axis=1)
+
+
+class ClueRetrievalIndex:
+    """
+    Nearest-neighbour retrieval from new clues to historical answers.
+
+    Historical clue embeddings are L2-normalized and partitioned by answer
+    length, so a query only scans clues whose answers fit its slot. Exact
+    search scores a batch of queries against each partition as blocked
+    matrix multiplies with a running top-k. Large partitions can instead be
+    coarse-quantized IVF-style: rows are clustered with k-means and stored
+    list by list, and a query scans only its `nprobe` closest lists.
+    """
+
+    def __init__(self, partitions: dict, embed):
+        """
+        Args:
+            partitions (dict): length -> {"vectors": float32 (n, dim), "answers": object (n,),
+                and for IVF partitions "centroids": (lists, dim), "offsets": (lists + 1,)}
+            embed (callable): texts -> (n, dim) array, used to encode queries
+        """
+        self.partitions = partitions
+        self.embed = embed
+
+    @classmethod
+    def build(cls, clues, answers, embed, ivf_lists: int = None, ivf_min_size: int = 50000,
+              seed: int = 0) -> "ClueRetrievalIndex":
+        """
+        Build an index from parallel clue / answer sequences.
+
+        Args:
+            clues, answers: Historical clue texts and their answers
+            embed (callable): texts -> (n, dim) array, e.g. EmbeddingStore.embed
+            ivf_lists (int): Coarse lists per partition; None keeps every partition exact
+            ivf_min_size (int): Partitions smaller than this stay exact even with ivf_lists
+            seed (int): k-means initialization seed
+        """
+        pairs = {}
+        for clue, answer in zip(clues, answers):
+            if isinstance(clue, str) and isinstance(answer, str):
+                answer = answer.strip().upper()
+                if answer and all(ch in ALPHABET for ch in answer):
+                    pairs.setdefault((clue, answer), None)
+        pairs = list(pairs)
+
+        by_length = {}
+        for i, (_, answer) in enumerate(pairs):
+            by_length.setdefault(len(answer), []).append(i)
+
+        vectors = _normalize_rows(embed([clue for clue, _ in pairs])) if pairs else None
+        partitions = {}
+        for length, rows in by_length.items():
+            part = {
+                "vectors": vectors[rows],
+                "answers": np.array([pairs[i][1] for i in rows], dtype=object),
+            }
+            if ivf_lists is not None and len(rows) >= max(ivf_min_size, ivf_lists):
+                centroids, assign = _spherical_kmeans(part["vectors"], ivf_lists, seed=seed)
+                order = np.argsort(assign, kind="stable")
+                part["vectors"] = np.ascontiguousarray(part["vectors"][order])
+                part["answers"] = part["answers"][order]
+                part["centroids"] = centroids
+                part["offsets"] = np.concatenate([[0], np.cumsum(np.bincount(assign, minlength=ivf_lists))])
+            partitions[length] = part
+        return cls(partitions, embed)
+
+    @classmethod
+    def from_csv(cls, path, embed, **kwargs) -> "ClueRetrievalIndex":
+        """Build an index from the clue and answer columns of a clue CSV such as all_puzzles.csv."""
+        from utils.puzzle_io import load_clue_df
+
+        df = load_clue_df(path)
+        return cls.build(df["clue"].tolist(), df["answer"].tolist(), embed, **kwargs)
+
+    # ------------------------
+    # Queries
+    # ------------------------
+    def _search_exact(self, part, queries, k, block_size):
+        vectors = part["vectors"]
+        m = len(queries)
+        scores = np.full((m, 0), -np.inf, dtype=np.float32)
+        ids = np.zeros((m, 0), dtype=np.int64)
+        for start in range(0, len(vectors), block_size):
+            block = queries @ vectors[start:start + block_size].T
+            block_ids = np.broadcast_to(np.arange(start, start + block.shape[1]), block.shape)
+            scores, ids = _merge_topk(scores, ids, block, block_ids, k)
+        return scores, ids
+
+    def _search_ivf(self, part, queries, k, nprobe, block_size):
+        centroids, offsets = part["centroids"], part["offsets"]
+        nprobe = min(nprobe, len(centroids))
+        probes = np.argpartition(-(queries @ centroids.T), nprobe - 1, axis=1)[:, :nprobe]
+        scores = np.full((len(queries), k), -np.inf, dtype=np.float32)
+        ids = np.zeros((len(queries), k), dtype=np.int64)
+        for q, lists in enumerate(probes):
+            rows = np.concatenate([np.arange(offsets[c], offsets[c + 1]) for c in lists])
+            if not len(rows):
+                continue
+            s, i = self._search_exact({"vectors": part["vectors"][rows]}, queries[q:q + 1], k, block_size)
+            scores[q, :s.shape[1]], ids[q, :s.shape[1]] = s[0], rows[i[0]]
+        return scores, ids
+
+    @instrumentation.timed("ranking.retrieval")
+    def search(self, clues, lengths, k: int = 50, nprobe: int = 8, block_size: int = 65536) -> list:
+        """
+        Retrieve answers for a batch of clues in one call.
+
+        Queries are encoded together, grouped by slot length, and each group
+        is scored against its partition at once.
+
+        Args:
+            clues (list[str]): New clue texts
+            lengths (list[int]): Slot length for each clue
+            k (int): Nearest historical clues considered per query
+            nprobe (int): Coarse lists scanned per query in IVF partitions
+            block_size (int): Corpus rows per matrix multiply
+
+        Returns:
+            list[list[tuple[str, float]]]: Per query, (answer, cosine similarity)
+            best first, each answer once at its best score
+        """
+        clues = list(clues)
+        results = [[] for _ in clues]
+        if not clues:
+            return results
+        queries = _normalize_rows(self.embed(clues))
+
+        groups = {}
+        for q, length in enumerate(lengths):
+            groups.setdefault(int(length), []).append(q)
+        for length, members in groups.items():
+            part = self.partitions.get(length)
+            if part is None:
+                continue
+            if "centroids" in part:
+                scores, ids = self._search_ivf(part, queries[members], k, nprobe, block_size)
+            else:
+                scores, ids = self._search_exact(part, queries[members], k, block_size)
+            order = np.argsort(-scores, axis=1)
+            scores = np.take_along_axis(scores, order, axis=1)
+            ids = np.take_along_axis(ids, order, axis=1)
+            for q, row_scores, row_ids in zip(members, scores.tolist(), ids.tolist()):
+                best = {}
+                for score, i in zip(row_scores, row_ids):
+                    if score != -np.inf:
+                        best.setdefault(part["answers"][i], score)
+                results[q] = list(best.items())
+        return results
+
+    def candidates(self, crossword, k: int = 50, **kwargs) -> dict:
+        """Candidate lists for every slot of a CrosswordGrid, ready for FillEngine."""
+        lengths = [len(crossword.slot_cells[sid]) for sid in range(len(crossword.slot_names))]
+        hits = self.search([clue or "" for clue in crossword.slot_clues], lengths, k=k, **kwargs)
+        return {
+            clue_id: [answer for answer, _ in found]
+            for clue_id, found in zip(crossword.slot_names, hits)
+        }
+
+    def __len__(self):
+        return sum(len(p["answers"]) for p in self.partitions.values())
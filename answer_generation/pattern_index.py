@@ -0,0 +1,167 @@
+import json
+from collections import Counter
+
+import numpy as np
+
+from utils import instrumentation
+from utils.puzzle_io import load_clue_df
+
+ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+WILDCARDS = {"?", ".", " ", "_"}
+
+MAGIC = b"XWPIDX01"
+HEADER_ALIGN = 64
+
+
+class PatternIndex:
+    """
+    Positional lexicon index over historical answers.
+
+    Words are grouped by length and, within a length, sorted by descending
+    frequency so that word ids double as a frequency ranking. Each length keeps
+    one packed bitmap per (position, letter) marking the ids that have that
+    letter there; a pattern query is the AND of the bitmaps for its fixed
+    letters.
+    """
+
+    def __init__(self, tables: dict):
+        """
+        Args:
+            tables (dict): length -> {"words": uint8 (n, length), "freq": uint32 (n,),
+                "bitmaps": uint8 (length, 26, ceil(n / 8))}
+        """
+        self.tables = tables
+        self._decoded = {}
+
+    @classmethod
+    def build(cls, answers) -> "PatternIndex":
+        """Build an index from an iterable of answers (repeats count toward frequency)."""
+        counts = Counter(a.strip().upper() for a in answers if isinstance(a, str))
+        by_length = {}
+        for word, freq in counts.items():
+            if word and all(ch in ALPHABET for ch in word):
+                by_length.setdefault(len(word), []).append((word, freq))
+
+        tables = {}
+        for length, entries in by_length.items():
+            entries.sort(key=lambda e: (-e[1], e[0]))
+            words = np.frombuffer("".join(w for w, _ in entries).encode("ascii"), dtype=np.uint8)
+            words = words.reshape(len(entries), length)
+            letters = words - ord("A")
+            hits = letters[None, :, :].T == np.arange(26, dtype=np.uint8)[None, None, :]  # (length, n, 26)
+            bitmaps = np.packbits(hits.transpose(0, 2, 1), axis=2)
+            tables[length] = {
+                "words": words,
+                "freq": np.array([f for _, f in entries], dtype=np.uint32),
+                "bitmaps": np.ascontiguousarray(bitmaps),
+            }
+        return cls(tables)
+
+    @classmethod
+    def from_csv(cls, path) -> "PatternIndex":
+        """Build an index from the answer column of a clue CSV such as all_puzzles.csv."""
+        return cls.build(load_clue_df(path)["answer"])
+
+    # ------------------------
+    # Queries
+    # ------------------------
+    def query(self, pattern: str) -> np.ndarray:
+        """
+        Return ids of words matching a pattern like "?A??E", most frequent first.
+
+        "?", ".", "_" and " " (an empty grid cell) are wildcards.
+        """
+        table = self.tables.get(len(pattern))
+        if table is None:
+            return np.zeros(0, dtype=np.int32)
+        n = len(table["freq"])
+
+        rows = []
+        for pos, ch in enumerate(pattern.upper()):
+            if ch in WILDCARDS:
+                continue
+            if ch not in ALPHABET:
+                return np.zeros(0, dtype=np.int32)
+            rows.append(table["bitmaps"][pos, ord(ch) - ord("A")])
+        if not rows:
+            return np.arange(n, dtype=np.int32)
+
+        hits = np.bitwise_and.reduce(np.stack(rows), axis=0)
+        return np.flatnonzero(np.unpackbits(hits, count=n)).astype(np.int32)
+
+    def words(self, length: int, ids) -> list:
+        """Decode word ids of the given length back to strings."""
+        if length not in self._decoded:
+            words = self.tables[length]["words"]
+            self._decoded[length] = np.array([bytes(w).decode("ascii") for w in words], dtype=object)
+        return self._decoded[length][ids].tolist()
+
+    def frequencies(self, length: int, ids) -> np.ndarray:
+        return np.asarray(self.tables[length]["freq"][ids])
+
+    def match(self, pattern: str, limit: int = None) -> list:
+        """Return matching words for a pattern, most frequent first."""
+        ids = self.query(pattern)
+        if limit is not None:
+            ids = ids[:limit]
+        return self.words(len(pattern), ids) if len(ids) else []
+
+    @instrumentation.timed("candidates.pattern")
+    def candidates(self, crossword, limit: int = None) -> dict:
+        """Candidate lists for every slot of a CrosswordGrid, ready for FillEngine."""
+        return {
+            clue_id: self.match(crossword.slot_pattern(clue_id), limit)
+            for clue_id in crossword.slot_names
+        }
+
+    def __len__(self):
+        return sum(len(t["freq"]) for t in self.tables.values())
+
+    # ------------------------
+    # Persistence
+    # ------------------------
+    def save(self, path):
+        """
+        Write the index as one binary file: magic, a JSON table of contents,
+        then every array raw and 64-byte aligned so load() can memory-map it.
+        """
+        toc, blobs, offset = [], [], 0
+        for length in sorted(self.tables):
+            for name, array in self.tables[length].items():
+                array = np.ascontiguousarray(array)
+                toc.append({"length": length, "name": name, "dtype": array.dtype.str,
+                            "shape": list(array.shape), "offset": offset})
+                blobs.append(array)
+                offset += -(-array.nbytes // HEADER_ALIGN) * HEADER_ALIGN
+
+        header = json.dumps(toc).encode("utf-8")
+        data_start = -(-(len(MAGIC) + 8 + len(header)) // HEADER_ALIGN) * HEADER_ALIGN
+        with open(path, "wb") as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, "little"))
+            f.write(header)
+            f.write(b"\0" * (data_start - f.tell()))
+            for entry, array in zip(toc, blobs):
+                f.seek(data_start + entry["offset"])
+                f.write(array.tobytes())
+            f.truncate(data_start + offset)
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "PatternIndex":
+        """Open an index written by save(); arrays are memory-mapped unless mmap=False."""
+        with open(path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{path} is not a pattern index file.")
+            header_size = int.from_bytes(f.read(8), "little")
+            toc = json.loads(f.read(header_size))
+        data_start = -(-(len(MAGIC) + 8 + header_size) // HEADER_ALIGN) * HEADER_ALIGN
+
+        raw = np.memmap(path, dtype=np.uint8, mode="r") if mmap else np.fromfile(path, dtype=np.uint8)
+        tables = {}
+        for entry in toc:
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"]))
+            start = data_start + entry["offset"]
+            array = raw[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+            tables.setdefault(entry["length"], {})[entry["name"]] = array
+        return cls(tables)
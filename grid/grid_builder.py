@@ -1,49 +1,167 @@
+from types import MappingProxyType
+from typing import TYPE_CHECKING
+
 import numpy as np
-import pandas as pd
+from utils import instrumentation
 from utils.validation import validate_clue_df
 
+if TYPE_CHECKING:
+    import pandas as pd
+
+ACROSS = 0
+DOWN = 1
+
+# Columns of CrosswordGrid.slot_table
+SLOT_NUMBER, SLOT_DIRECTION, SLOT_START_ROW, SLOT_START_COL, SLOT_LENGTH = range(5)
+# Columns of CrosswordGrid.crossing_edges
+EDGE_ACROSS, EDGE_DOWN, EDGE_ACROSS_OFFSET, EDGE_DOWN_OFFSET, EDGE_CELL = range(5)
+
+
 class CrosswordGrid:
-    def __init__(self, clue_df: pd.DataFrame):
+    @instrumentation.timed("grid.build")
+    def __init__(self, clue_df: "pd.DataFrame"):
         validate_clue_df(clue_df)
-        self.clue_df = self._enrich_clue_df(clue_df)
-        self.height = self.clue_df["end_row"].max() + 1
-        self.width = self.clue_df["end_col"].max() + 1
+        df = clue_df.reset_index(drop=True)
+        self._compile(
+            df["number"].to_numpy(dtype=np.int32),
+            df["start_row"].to_numpy(dtype=np.int32),
+            df["start_col"].to_numpy(dtype=np.int32),
+            df["end_row"].to_numpy(dtype=np.int32),
+            df["end_col"].to_numpy(dtype=np.int32),
+            df["clue"].tolist(),
+            df["answer"].tolist() if "answer" in df.columns else None,
+        )
+        self._clue_df = self._enrich_clue_df(df)
+
+    @classmethod
+    @instrumentation.timed("grid.build")
+    def from_slots(cls, number, start_row, start_col, end_row, end_col, clues, answers=None, cells=None):
+        """
+        Build a grid straight from per-slot arrays, without pandas.
+
+        Args:
+            number, start_row, start_col, end_row, end_col: Integer arrays, one entry per clue
+            clues (list[str]): Clue text per slot
+            answers (list[str] | None): Optional known answers per slot
+            cells (list[np.ndarray] | None): Optional precomputed flat cell arrays per slot
+        """
+        grid = cls.__new__(cls)
+        grid._compile(
+            *(np.asarray(a, dtype=np.int32) for a in (number, start_row, start_col, end_row, end_col)),
+            list(clues), None if answers is None else list(answers), cells,
+        )
+        grid._clue_df = None
+        return grid
+
+    def _compile(self, number, start_row, start_col, end_row, end_col, clues, answers=None, cells=None):
+        if len(number) == 0:
+            raise ValueError("Puzzle has no clues.")
+        bad = np.flatnonzero((start_row != end_row) & (start_col != end_col))
+        if bad.size:
+            raise ValueError(f"Invalid clue direction for clue {int(number[bad[0]])}")
+        self.height = int(end_row.max()) + 1
+        self.width = int(end_col.max()) + 1
+        self.slot_answers = answers if answers is not None else [None] * len(number)
+        self._build_slot_index(number, start_row, start_col, end_row, end_col, clues, cells)
         self.grid = self._generate_grid()
+        # Flat view sharing memory with self.grid, indexed by row * width + col
+        self._flat = self.grid.reshape(-1)
+
+        # Running fill counters, kept current by _write_cells
+        self.fillable_count = len(self._fillable)
+        self.filled_count = 0
+        self.slot_filled = np.zeros(len(self.slot_names), dtype=np.int32)
+        self.solved_slots = set()
+        self._listeners = []
+
+        # Slots holding a word placed with place_word, and the undo trail:
+        # (cells, old letters, new letters, slot id or None, was placed, now placed)
+        self.placed_slots = set()
+        self._trail = []
+        self._redo = []
+
+    def _build_slot_index(self, number, start_row, start_col, end_row, end_col, clues, cells=None):
+        """
+        Compile the clue table into dense NumPy lookup structures.
+
+        Each clue becomes a slot whose id is its row position in clue_df.
+        Built once so that placement, clue lookup and crossing checks never
+        touch the DataFrame again.
+        """
+        is_down = (start_row != end_row).astype(np.int32)
+        lengths = np.where(is_down, end_row - start_row, end_col - start_col) + 1
+
+        self.slot_names = [f"{n}-{'Down' if d else 'Across'}" for n, d in zip(number.tolist(), is_down.tolist())]
+        self.slot_ids = {name: sid for sid, name in enumerate(self.slot_names)}
+        self.slot_table = np.column_stack([number, is_down, start_row, start_col, lengths]).astype(np.int32)
+
+        if cells is None:
+            step = np.where(is_down, self.width, 1)
+            cells = [
+                np.arange(length, dtype=np.int32) * np.int32(s) + np.int32(r * self.width + c)
+                for r, c, length, s in zip(start_row, start_col, lengths, step)
+            ]
+        self.slot_cells = cells
+
+        # cell -> (across slot, down slot, across offset, down offset); -1 when absent
+        self.cell_slots = np.full((self.height * self.width, 4), -1, dtype=np.int32)
+        all_cells = np.concatenate(self.slot_cells)
+        slot_of_cell = np.repeat(np.arange(len(lengths), dtype=np.int32), lengths)
+        offsets = np.arange(len(all_cells), dtype=np.int32) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+        d = is_down[slot_of_cell]
+        self.cell_slots[all_cells, d] = slot_of_cell
+        self.cell_slots[all_cells, 2 + d] = offsets
+
+        # Slot-crossing graph: slots are nodes, every cell shared by an Across
+        # and a Down slot is an edge (across slot, down slot, offsets, cell)
+        crossed = np.flatnonzero((self.cell_slots[:, 0] >= 0) & (self.cell_slots[:, 1] >= 0))
+        self.crossing_edges = np.column_stack([self.cell_slots[crossed], crossed]).astype(np.int32)
+
+        self.slot_clues = clues
+        self._across_clues = {}
+        self._down_clues = {}
+        for sid, (number, d) in enumerate(self.slot_table[:, [SLOT_NUMBER, SLOT_DIRECTION]].tolist()):
+            target = self._down_clues if d == DOWN else self._across_clues
+            target[number] = clues[sid]
 
     def _generate_grid(self):
         grid = np.full((self.height, self.width), "■", dtype=str)
-        for _, row in self.clue_df.iterrows():
-            coords = row["coordinate_set"]
-            for x, y in coords:
-                grid[y][x] = " "
+        self._fillable = np.flatnonzero(self.cell_slots[:, 0] + self.cell_slots[:, 1] > -2)
+        grid.reshape(-1)[self._fillable] = " "
         return grid
 
+    @property
+    def clue_df(self):
+        """Enriched clue table; grids built with from_slots() assemble it on first access."""
+        if self._clue_df is None:
+            import pandas as pd
+
+            table = self.slot_table
+            end = table[:, [SLOT_START_ROW, SLOT_START_COL]] + np.where(
+                table[:, [SLOT_DIRECTION]] == DOWN, [[1, 0]], [[0, 1]]
+            ) * (table[:, [SLOT_LENGTH]] - 1)
+            df = pd.DataFrame({
+                "number": table[:, SLOT_NUMBER],
+                "start_col": table[:, SLOT_START_COL],
+                "start_row": table[:, SLOT_START_ROW],
+                "end_col": end[:, 1],
+                "end_row": end[:, 0],
+                "clue": self.slot_clues,
+                "length": table[:, SLOT_LENGTH],
+                "answer": self.slot_answers,
+            })
+            self._clue_df = self._enrich_clue_df(df)
+        return self._clue_df
+
     def _enrich_clue_df(self, df):
         df = df.copy()
-        df["number_direction"] = df.apply(self._get_number_direction, axis=1)
-        df["coordinate_set"] = df.apply(lambda row: self._get_coordinates(row), axis=1)
+        df["number_direction"] = self.slot_names
+        df["coordinate_set"] = [
+            list(zip((cells % self.width).tolist(), (cells // self.width).tolist()))
+            for cells in self.slot_cells
+        ]
         return df
 
-    def _get_number_direction(self, row):
-        if row["start_row"] == row["end_row"]:
-            return f"{row['number']}-Across"
-        elif row["start_col"] == row["end_col"]:
-            return f"{row['number']}-Down"
-        else:
-            raise ValueError(f"Invalid clue direction: {row}")
-
-    # def _get_coordinates(self, row):
-    #     if "Across" in row["number_direction"]:
-    #         return {(x, row["start_row"]) for x in range(row["start_col"], row["end_col"] + 1)}
-    #     else:
-    #         return {(row["start_col"], y) for y in range(row["start_row"], row["end_row"] + 1)}
-    def _get_coordinates(self, row):
-        if "Across" in row["number_direction"]:
-            return [(x, row["start_row"]) for x in range(row["start_col"], row["end_col"] + 1)]
-        else:
-            return [(row["start_col"], y) for y in range(row["start_row"], row["end_row"] + 1)]
-
-
     def display(self):
         """Full grid print with borders and fill percentage (replaces simple print)."""
         horizontal_border = "+" + "---" * self.width + "+"
@@ -75,10 +193,103 @@ class CrosswordGrid:
 
     def calculate_completion_percentage_by_char(self):
         """Returns % of non-black cells that are filled."""
-        fillable = (self.grid != "■").sum()
-        filled = ((self.grid != "■") & (self.grid != " ")).sum()
-        return (filled / fillable * 100) if fillable else 0
-    
+        return (self.filled_count / self.fillable_count * 100) if self.fillable_count else 0
+
+    def is_filled(self) -> bool:
+        return self.filled_count == self.fillable_count
+
+    def is_solved(self, number_direction: str) -> bool:
+        """True once every cell of the clue's slot holds a letter."""
+        return self.get_slot_id(number_direction) in self.solved_slots
+
+    def __getstate__(self):
+        # Listeners belong to this process (e.g. a GUI); _flat is a view of grid
+        state = dict(self.__dict__)
+        state["_listeners"] = []
+        del state["_flat"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._flat = self.grid.reshape(-1)
+
+    def subscribe(self, callback):
+        """
+        Register callback(cells) to run after letters change; cells is an int
+        array of flat indices (row * width + col) whose letter changed.
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def _write_cells(self, cells, letters):
+        """
+        Write letters to flat cells and update the fill counters in O(len(cells)).
+
+        Returns:
+            tuple: (changed cells, their previous letters, their new letters)
+        """
+        current = self._flat[cells]
+        changed = current != letters
+        cells, current, letters = cells[changed], current[changed], letters[changed]
+        if not len(cells):
+            return cells, current, letters
+        self._flat[cells] = letters
+
+        delta = (letters != " ").astype(np.int32) - (current != " ")
+        moved = delta != 0
+        if moved.any():
+            cells_moved, delta = cells[moved], delta[moved]
+            self.filled_count += int(delta.sum())
+            owners = self.cell_slots[cells_moved, :2]
+            touched = []
+            for d in (ACROSS, DOWN):
+                has = owners[:, d] >= 0
+                np.add.at(self.slot_filled, owners[has, d], delta[has])
+                touched.extend(owners[has, d].tolist())
+            lengths = self.slot_table[:, SLOT_LENGTH]
+            for sid in set(touched):
+                if self.slot_filled[sid] == lengths[sid]:
+                    self.solved_slots.add(sid)
+                else:
+                    self.solved_slots.discard(sid)
+
+        for callback in self._listeners:
+            callback(cells)
+        return cells, current, letters
+
+    def _record(self, written, sid=None, now_placed=None):
+        """Push a trail entry for a write; a new edit invalidates the redo stack."""
+        was_placed = sid in self.placed_slots
+        if sid is not None:
+            if now_placed:
+                self.placed_slots.add(sid)
+            else:
+                self.placed_slots.discard(sid)
+        self._trail.append((*written, sid, was_placed, now_placed))
+        self._redo.clear()
+
+    def set_cell(self, row: int, col: int, letter: str):
+        """
+        Write a single letter (or " " to clear) into an open cell.
+
+        Raises:
+            ValueError: If the cell is outside the grid or a black square, or
+                letter is not a single A-Z letter or " "
+        """
+        if not (0 <= row < self.height and 0 <= col < self.width):
+            raise ValueError(f"Cell ({col}, {row}) is outside the {self.width}x{self.height} grid.")
+        letter = letter.upper()
+        if letter != " " and not (len(letter) == 1 and "A" <= letter <= "Z"):
+            raise ValueError(f"Expected a single letter A-Z or \" \", got {letter!r}.")
+        cell = row * self.width + col
+        if self._flat[cell] == "■":
+            raise ValueError(f"Cell ({col}, {row}) is a black square.")
+        self._record(self._write_cells(
+            np.array([cell], dtype=np.int32), np.array([letter], dtype=self.grid.dtype)
+        ))
+
     def place_word(self, number_direction: str, word: str):
         """
         Fill in the given word for the specified clue into the grid.
@@ -90,34 +301,126 @@ class CrosswordGrid:
         Raises:
             ValueError: If the clue is not found or the word doesn't fit
         """
-        row = self.clue_df[self.clue_df["number_direction"] == number_direction]
-        if row.empty:
-            raise ValueError(f"Clue '{number_direction}' not found in clue_df.")
-
-        coords = list(row.iloc[0]["coordinate_set"])
-        if len(coords) != len(word):
-            raise ValueError(f"Word length {len(word)} does not match number of coordinates {len(coords)}.")
-        
-        for (x, y), letter in zip(coords, word.upper()):
-            current = self.grid[y][x]
-            if current not in {" ", "■"} and current != letter:
-                raise ValueError(f"Conflict at ({x}, {y}): grid has '{current}', trying to write '{letter}'")
-            self.grid[y][x] = letter
-
-        
+        sid = self.get_slot_id(number_direction)
+        cells = self.slot_cells[sid]
+        if len(cells) != len(word):
+            raise ValueError(f"Word length {len(word)} does not match number of coordinates {len(cells)}.")
+
+        letters = np.array(list(word.upper()), dtype=self.grid.dtype)
+        current = self._flat[cells]
+        conflicts = np.flatnonzero((current != " ") & (current != letters))
+        if conflicts.size:
+            if instrumentation.enabled:
+                instrumentation.count("grid.conflicts")
+            i = conflicts[0]
+            y, x = divmod(int(cells[i]), self.width)
+            raise ValueError(f"Conflict at ({x}, {y}): grid has '{current[i]}', trying to write '{letters[i]}'")
+        self._record(self._write_cells(cells, letters), sid, True)
+        if instrumentation.enabled:
+            instrumentation.count("grid.placements")
+
+    def erase_word(self, number_direction: str):
+        """
+        Remove a placed word's letters from the grid.
+
+        Cells shared with a crossing word that is still placed keep their letter.
+
+        Raises:
+            ValueError: If the clue is not found or no word is placed in it
+        """
+        sid = self.get_slot_id(number_direction)
+        if sid not in self.placed_slots:
+            raise ValueError(f"No word placed at '{number_direction}'.")
+        cells = self.slot_cells[sid]
+        crossing = self.cell_slots[cells, 1 - self.slot_table[sid, SLOT_DIRECTION]].tolist()
+        free = np.array([c < 0 or c not in self.placed_slots for c in crossing], dtype=bool)
+        blanks = np.full(int(free.sum()), " ", dtype=self.grid.dtype)
+        self._record(self._write_cells(cells[free], blanks), sid, False)
+
+    # ------------------------
+    # Trail: checkpoints and undo/redo
+    # ------------------------
+    def checkpoint(self) -> int:
+        """Mark the current state; pass the result to rollback() to return to it."""
+        return len(self._trail)
+
+    def _revert(self, entry):
+        cells, old, _, sid, was_placed, _ = entry
+        self._write_cells(cells, old)
+        if sid is not None:
+            if was_placed:
+                self.placed_slots.add(sid)
+            else:
+                self.placed_slots.discard(sid)
+
+    def rollback(self, mark: int):
+        """Undo every write made since checkpoint() returned mark, newest first."""
+        while len(self._trail) > mark:
+            self._revert(self._trail.pop())
+        self._redo.clear()
+
+    def undo(self) -> bool:
+        """Revert the most recent place_word / erase_word / set_cell; False if there is none."""
+        if not self._trail:
+            return False
+        entry = self._trail.pop()
+        self._revert(entry)
+        self._redo.append(entry)
+        return True
+
+    def redo(self) -> bool:
+        """Re-apply the most recently undone edit; False if there is none."""
+        if not self._redo:
+            return False
+        entry = self._redo.pop()
+        cells, _, new, sid, _, now_placed = entry
+        self._write_cells(cells, new)
+        if sid is not None:
+            if now_placed:
+                self.placed_slots.add(sid)
+            else:
+                self.placed_slots.discard(sid)
+        self._trail.append(entry)
+        return True
+
+    def get_slot_id(self, number_direction: str) -> int:
+        """Return the dense slot id for a clue ID like "12-Across"."""
+        try:
+            return self.slot_ids[number_direction]
+        except KeyError:
+            raise ValueError(f"Clue '{number_direction}' not found in clue_df.") from None
+
+    def get_clue(self, number_direction: str) -> str:
+        """Return the clue text for a clue ID like "12-Across"."""
+        return self.slot_clues[self.get_slot_id(number_direction)]
+
+    def slot_pattern(self, number_direction: str) -> str:
+        """Return the slot's current letters, with " " for empty cells."""
+        return "".join(self._flat[self.slot_cells[self.get_slot_id(number_direction)]])
+
+    def crossing_slots(self, number_direction: str):
+        """
+        Return the slots crossing the given clue.
+
+        Returns:
+            list[tuple[str, int, int]]: (crossing clue ID, offset in this slot,
+            offset in the crossing slot) for every shared cell.
+        """
+        sid = self.get_slot_id(number_direction)
+        other = 1 - int(self.slot_table[sid, SLOT_DIRECTION])
+        crossings = self.cell_slots[self.slot_cells[sid]]
+        return [
+            (self.slot_names[row[other]], offset, int(row[2 + other]))
+            for offset, row in enumerate(crossings.tolist())
+            if row[other] >= 0
+        ]
+
     @property
     def across_clues(self):
-        return {
-            row["number"]: row["clue"]
-            for _, row in self.clue_df.iterrows()
-            if "Across" in row["number_direction"]
-        }
+        """Read-only view of clue number -> clue text for the Across slots."""
+        return MappingProxyType(self._across_clues)
 
     @property
     def down_clues(self):
-        return {
-            row["number"]: row["clue"]
-            for _, row in self.clue_df.iterrows()
-            if "Down" in row["number_direction"]
-        }
-
+        """Read-only view of clue number -> clue text for the Down slots."""
+        return MappingProxyType(self._down_clues)
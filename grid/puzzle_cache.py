@@ -0,0 +1,271 @@
+import os
+import json
+import hashlib
+
+import numpy as np
+
+from grid.grid_builder import CrosswordGrid
+
+MAGIC = b"XWPUZ001"
+HEADER_ALIGN = 64
+CACHE_SUFFIX = ".xwc"
+DIRECTORY_CACHE_NAME = "puzzles" + CACHE_SUFFIX
+
+# Per-slot integer columns, stored as one (n_slots, 5) int32 array
+SLOT_FIELDS = ["number", "start_row", "start_col", "end_row", "end_col"]
+STRING_SEPARATOR = "\0"
+
+
+def default_cache_path(source) -> str:
+    """Cache file next to the source: archive.csv -> archive.xwc, dir -> dir/puzzles.xwc."""
+    if os.path.isdir(source):
+        return os.path.join(source, DIRECTORY_CACHE_NAME)
+    return os.path.splitext(source)[0] + CACHE_SUFFIX
+
+
+def _source_files(source) -> list:
+    if os.path.isdir(source):
+        from utils.puzzle_io import list_puzzle_files
+        return list_puzzle_files(source)
+    return [source]
+
+
+def _source_key(path, source) -> str:
+    """Path of a source file relative to the source, so a moved or copied tree keeps its cache."""
+    root = source if os.path.isdir(source) else os.path.dirname(source) or "."
+    return os.path.relpath(path, root).replace(os.sep, "/")
+
+
+def _sha1(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def _fingerprint(path, source) -> dict:
+    stat = os.stat(path)
+    return {"path": _source_key(path, source), "mtime": stat.st_mtime_ns, "size": stat.st_size, "sha1": _sha1(path)}
+
+
+def _encode_header(header: dict) -> bytes:
+    """JSON header padded with spaces so the data section starts on a HEADER_ALIGN boundary."""
+    raw = json.dumps(header).encode("utf-8")
+    data_start = -(-(len(MAGIC) + 8 + len(raw)) // HEADER_ALIGN) * HEADER_ALIGN
+    return raw.ljust(data_start - len(MAGIC) - 8)
+
+
+def _intern(strings, table: dict) -> np.ndarray:
+    """Map strings to ids in a shared table; missing values (NaN/None) become -1."""
+    return np.array(
+        [table.setdefault(s, len(table)) if isinstance(s, str) else -1 for s in strings], dtype=np.int32
+    )
+
+
+def compile_puzzles(source, path=None) -> str:
+    """
+    Compile an archive CSV, a single-puzzle CSV or a directory of puzzle CSVs
+    into one binary cache file.
+
+    Returns:
+        str: Path of the written cache
+    """
+    from utils.puzzle_io import iter_archive, load_clue_df, puzzle_name_from_path
+
+    path = path or default_cache_path(source)
+    files = _source_files(source)
+    if os.path.isdir(source):
+        puzzles = ((puzzle_name_from_path(p), load_clue_df(p)) for p in files)
+    else:
+        with open(source, encoding="utf-8") as f:
+            header = f.readline()
+        if "puzzle_name" in header:
+            puzzles = iter_archive(source)
+        else:
+            puzzles = [(puzzle_name_from_path(source), load_clue_df(source))]
+
+    names, slots, slot_offsets, cells, cell_offsets = [], [], [0], [], [0]
+    clue_ids, answer_ids, strings = [], [], {}
+    for name, clue_df in puzzles:
+        crossword = CrosswordGrid(clue_df)
+        names.append(str(name))
+        slots.append(clue_df[SLOT_FIELDS].to_numpy(dtype=np.int32))
+        slot_offsets.append(slot_offsets[-1] + len(clue_df))
+        for slot in crossword.slot_cells:
+            cells.append(slot)
+            cell_offsets.append(cell_offsets[-1] + len(slot))
+        clue_ids.append(_intern(crossword.slot_clues, strings))
+        answer_ids.append(_intern(crossword.slot_answers, strings))
+
+    arrays = {
+        "slots": np.concatenate(slots) if slots else np.zeros((0, len(SLOT_FIELDS)), dtype=np.int32),
+        "slot_offsets": np.array(slot_offsets, dtype=np.int64),
+        "cells": np.concatenate(cells).astype(np.int32) if cells else np.zeros(0, dtype=np.int32),
+        "cell_offsets": np.array(cell_offsets, dtype=np.int64),
+        "clue_ids": np.concatenate(clue_ids) if clue_ids else np.zeros(0, dtype=np.int32),
+        "answer_ids": np.concatenate(answer_ids) if answer_ids else np.zeros(0, dtype=np.int32),
+        "strings": np.frombuffer(STRING_SEPARATOR.join(strings).encode("utf-8"), dtype=np.uint8),
+    }
+    meta = {"names": names, "sources": [_fingerprint(p, source) for p in files]}
+
+    toc, offset = [], 0
+    for name, array in arrays.items():
+        toc.append({"name": name, "dtype": array.dtype.str, "shape": list(array.shape), "offset": offset})
+        offset += -(-array.nbytes // HEADER_ALIGN) * HEADER_ALIGN
+    header = _encode_header({"meta": meta, "arrays": toc})
+    data_start = len(MAGIC) + 8 + len(header)
+
+    # Write to a temp file and rename so a reader never sees a half-written cache
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(header).to_bytes(8, "little"))
+        f.write(header)
+        for entry, array in zip(toc, arrays.values()):
+            f.seek(data_start + entry["offset"])
+            f.write(np.ascontiguousarray(array).tobytes())
+        f.truncate(data_start + offset)
+    os.replace(tmp, path)
+    return path
+
+
+def _read_header(path):
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a puzzle cache file.")
+        header_size = int.from_bytes(f.read(8), "little")
+        header = json.loads(f.read(header_size))
+    data_start = -(-(len(MAGIC) + 8 + header_size) // HEADER_ALIGN) * HEADER_ALIGN
+    return header, data_start
+
+
+def _rewrite_header(path, header: dict):
+    """
+    Replace the header of an existing cache, leaving the array data untouched.
+
+    The header is overwritten in place when it still fits in the padding
+    before the data section; otherwise the file is rewritten with the data
+    shifted to the new alignment.
+    """
+    encoded = _encode_header(header)
+    with open(path, "r+b") as f:
+        f.seek(len(MAGIC))
+        old_size = int.from_bytes(f.read(8), "little")
+        if len(encoded) <= old_size:
+            f.seek(len(MAGIC) + 8)
+            f.write(encoded.ljust(old_size))
+            return
+        f.seek(-(-(len(MAGIC) + 8 + old_size) // HEADER_ALIGN) * HEADER_ALIGN)
+        data = f.read()
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(len(encoded).to_bytes(8, "little"))
+        f.write(encoded)
+        f.write(data)
+    os.replace(tmp, path)
+
+
+def is_fresh(path, source) -> bool:
+    """
+    True if the cache at `path` was compiled from the current `source`.
+
+    Sources are matched by their path relative to `source`. Files whose size
+    and mtime are unchanged are trusted; otherwise the content hash decides,
+    so a touched but unmodified file keeps its cache. The new mtimes of such
+    files are written back to the header so the hash is only paid once.
+    """
+    if not os.path.exists(path):
+        return False
+    try:
+        header, _ = _read_header(path)
+    except (ValueError, OSError):
+        return False
+    recorded = {entry["path"]: entry for entry in header["meta"]["sources"]}
+    files = {_source_key(p, source): p for p in _source_files(source)}
+    if sorted(recorded) != sorted(files):
+        return False
+    touched = False
+    for key, p in files.items():
+        entry, stat = recorded[key], os.stat(p)
+        if stat.st_size != entry["size"]:
+            return False
+        if stat.st_mtime_ns != entry["mtime"]:
+            if _sha1(p) != entry["sha1"]:
+                return False
+            entry["mtime"] = stat.st_mtime_ns
+            touched = True
+    if touched:
+        try:
+            _rewrite_header(path, header)
+        except OSError:
+            # A read-only cache is still valid; the hash is just paid again next time
+            pass
+    return True
+
+
+class PuzzleCache:
+    """
+    Read side of a compiled puzzle cache.
+
+    Slot coordinates and cell arrays for every puzzle live in a few flat
+    arrays sliced by per-puzzle offsets; clue and answer text is interned in
+    one shared string table. Grids are built with CrosswordGrid.from_slots,
+    so nothing on this path imports pandas.
+    """
+
+    def __init__(self, names: list, arrays: dict):
+        self.names = names
+        self.arrays = arrays
+        self._positions = {name: i for i, name in enumerate(names)}
+        self._strings = None
+
+    @classmethod
+    def load(cls, path, mmap: bool = True) -> "PuzzleCache":
+        """Open a cache written by compile_puzzles(); arrays are memory-mapped unless mmap=False."""
+        header, data_start = _read_header(path)
+        raw = np.memmap(path, dtype=np.uint8, mode="r") if mmap else np.fromfile(path, dtype=np.uint8)
+        arrays = {}
+        for entry in header["arrays"]:
+            dtype = np.dtype(entry["dtype"])
+            count = int(np.prod(entry["shape"]))
+            start = data_start + entry["offset"]
+            arrays[entry["name"]] = raw[start:start + count * dtype.itemsize].view(dtype).reshape(entry["shape"])
+        return cls(header["meta"]["names"], arrays)
+
+    @property
+    def strings(self) -> list:
+        if self._strings is None:
+            self._strings = bytes(self.arrays["strings"]).decode("utf-8").split(STRING_SEPARATOR)
+        return self._strings
+
+    def grid(self, key) -> CrosswordGrid:
+        """Build the CrosswordGrid for a puzzle, by name or position."""
+        i = self._positions[key] if isinstance(key, str) else int(key)
+        a = self.arrays
+        lo, hi = int(a["slot_offsets"][i]), int(a["slot_offsets"][i + 1])
+        slots = a["slots"][lo:hi]
+        bounds = np.asarray(a["cell_offsets"][lo:hi + 1])
+        flat = np.array(a["cells"][bounds[0]:bounds[-1]])
+        cells = np.split(flat, bounds[1:-1] - bounds[0])
+        strings = self.strings
+        clues = [strings[k] if k >= 0 else None for k in a["clue_ids"][lo:hi].tolist()]
+        answers = [strings[k] if k >= 0 else None for k in a["answer_ids"][lo:hi].tolist()]
+        return CrosswordGrid.from_slots(*slots.T, clues, answers, cells=cells)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self._positions
+
+    def __iter__(self):
+        """Yield (puzzle_name, CrosswordGrid) pairs in archive order."""
+        for i, name in enumerate(self.names):
+            yield name, self.grid(i)
+
+
+def load_puzzles(source, cache_path=None, rebuild: bool = False) -> PuzzleCache:
+    """Open the cache for a source, compiling it first if it is missing or stale."""
+    cache_path = cache_path or default_cache_path(source)
+    if rebuild or not is_fresh(cache_path, source):
+        compile_puzzles(source, cache_path)
+    return PuzzleCache.load(cache_path)
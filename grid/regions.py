@@ -0,0 +1,155 @@
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from grid.grid_builder import EDGE_ACROSS, EDGE_DOWN, SLOT_LENGTH
+
+
+@dataclass
+class Region:
+    """A group of slots that can be filled on its own."""
+    slots: list                                     # slot ids, ascending
+    boundary: list = field(default_factory=list)    # cut slots this region shares with other regions
+
+    def __len__(self):
+        return len(self.slots)
+
+
+def slot_adjacency(crossword, exclude=()) -> list:
+    """
+    Neighbor sets of the slot-crossing graph.
+
+    Args:
+        crossword (CrosswordGrid): Grid whose crossing_edges define the graph
+        exclude: Slot ids removed from the graph, e.g. slots already fixed
+
+    Returns:
+        list[set[int]]: For every slot id, the ids of the slots it crosses
+    """
+    adjacency = [set() for _ in range(len(crossword.slot_names))]
+    removed = set(exclude)
+    for a, d in crossword.crossing_edges[:, [EDGE_ACROSS, EDGE_DOWN]].tolist():
+        if a not in removed and d not in removed:
+            adjacency[a].add(d)
+            adjacency[d].add(a)
+    return adjacency
+
+
+def connected_components(adjacency, nodes) -> list:
+    """Connected components of the subgraph induced by nodes, each a sorted list."""
+    nodes = set(nodes)
+    seen, components = set(), []
+    for start in sorted(nodes):
+        if start in seen:
+            continue
+        seen.add(start)
+        stack, component = [start], []
+        while stack:
+            node = stack.pop()
+            component.append(node)
+            for other in adjacency[node]:
+                if other in nodes and other not in seen:
+                    seen.add(other)
+                    stack.append(other)
+        components.append(sorted(component))
+    return components
+
+
+def cut_slots(adjacency, nodes) -> list:
+    """
+    Articulation points of the subgraph induced by nodes: slots whose removal
+    disconnects it. Iterative Tarjan low-link, so deep grids cannot hit the
+    recursion limit.
+    """
+    nodes = set(nodes)
+    order, low, cuts = {}, {}, set()
+    for root in sorted(nodes):
+        if root in order:
+            continue
+        order[root] = low[root] = len(order)
+        root_children = 0
+        stack = [(root, None, iter(sorted(adjacency[root] & nodes)))]
+        while stack:
+            node, parent, neighbors = stack[-1]
+            advanced = False
+            for other in neighbors:
+                if other == parent:
+                    continue
+                if other in order:
+                    low[node] = min(low[node], order[other])
+                    continue
+                order[other] = low[other] = len(order)
+                stack.append((other, node, iter(sorted(adjacency[other] & nodes))))
+                advanced = True
+                break
+            if advanced:
+                continue
+            stack.pop()
+            if parent is None:
+                continue
+            low[parent] = min(low[parent], low[node])
+            if parent == root:
+                root_children += 1
+            elif low[node] >= order[parent]:
+                cuts.add(parent)
+        if root_children > 1:
+            cuts.add(root)
+    return sorted(cuts)
+
+
+def _split(adjacency, component, max_size):
+    """Recursively split a component at its most balancing cut slot until pieces fit max_size."""
+    if len(component) <= max_size:
+        return [Region(component)]
+    best = None
+    for cut in cut_slots(adjacency, component):
+        pieces = connected_components(adjacency, set(component) - {cut})
+        largest = max(len(p) for p in pieces)
+        if best is None or largest < best[0]:
+            best = (largest, cut, pieces)
+    if best is None:
+        return [Region(component)]
+
+    _, cut, pieces = best
+    regions = []
+    for piece in pieces:
+        for region in _split(adjacency, sorted(piece + [cut]), max_size):
+            if cut in region.slots and cut not in region.boundary:
+                region.boundary.append(cut)
+            regions.append(region)
+    return regions
+
+
+def decompose(crossword, fixed=(), max_size: int = None) -> list:
+    """
+    Split a grid's open slots into regions that can be solved separately.
+
+    Fixed slots (given answers plus every slot whose cells are already all
+    filled) are taken out of the slot-crossing graph; their letters stay in
+    the grid and constrain the slots crossing them. What remains falls apart
+    into connected components, which are fully independent. With max_size,
+    components larger than that are further cut at articulation slots into
+    loosely coupled regions that share only the cut slot, listed in each
+    region's boundary.
+
+    Args:
+        crossword (CrosswordGrid): Grid to decompose
+        fixed: Clue IDs treated as answered
+        max_size (int): Largest region to aim for; None keeps whole components
+
+    Returns:
+        list[Region]: Regions, largest first
+    """
+    full = crossword.slot_filled == crossword.slot_table[:, SLOT_LENGTH]
+    removed = set(np.flatnonzero(full).tolist()) | {crossword.get_slot_id(clue_id) for clue_id in fixed}
+    adjacency = slot_adjacency(crossword, exclude=removed)
+    open_slots = [sid for sid in range(len(crossword.slot_names)) if sid not in removed]
+
+    regions = []
+    for component in connected_components(adjacency, open_slots):
+        if max_size is None:
+            regions.append(Region(component))
+        else:
+            regions.extend(_split(adjacency, component, max_size))
+    regions.sort(key=len, reverse=True)
+    return regions
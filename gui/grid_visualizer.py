@@ -1,7 +1,12 @@
 import time
+import numpy as np
 import pygame
 import sys
 
+from grid.grid_builder import SLOT_LENGTH
+from utils import instrumentation
+from solver.events import DONE, HIGHLIGHT, PLACE
+
 CELL_SIZE = 40
 FONT_SIZE = 24
 GRID_PADDING = 2
@@ -12,20 +17,19 @@ PADDING = 10
 BUTTON_HEIGHT = 50
 
 class CrosswordVisualizer:
-    def __init__(self, crossword_grid):
-            pygame.init()
+    def __init__(self, crossword_grid, events=None, playback_rate=None):
+            """
+            Args:
+                crossword_grid (CrosswordGrid): Grid to display; only this thread writes to it
+                events (SolveEventQueue): Optional solver events replayed by run()
+                playback_rate (float): Words placed per second; None or 0 for unthrottled
+            """
             self.crossword = crossword_grid
             self.grid = crossword_grid.grid
             self.height, self.width = self.grid.shape
-            # self.window = pygame.display.set_mode((self.width * CELL_SIZE, self.height * CELL_SIZE))
-            pygame.display.set_caption("Crossword Solver Visualizer")
-            self.font = pygame.font.SysFont(None, FONT_SIZE)
-            self.number_font = pygame.font.SysFont(None, 14)
             self.cell_numbers = self._build_cell_to_number_map()
-            total_width = self.width * CELL_SIZE + RIGHT_PANEL_WIDTH
-            total_height = max(self.height * CELL_SIZE + BUTTON_HEIGHT, 1000)
-            self.window = pygame.display.set_mode((total_width, total_height))
-            self.clue_font = pygame.font.SysFont(None, 16)  # smaller for sidebar clues
+            # Display and fonts are set up by open_window() on the first frame
+            self.window = None
             self.scroll_offset = 0
             self.max_scroll = 0
             self.scroll_speed = 20
@@ -36,15 +40,65 @@ class CrosswordVisualizer:
             self.elapsed_time = 0
             self.timer_running = False
 
-
+            # Retained-mode state: what each cell currently shows on screen
+            self._glyphs = {}
+            self._cell_rects = [
+                [pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE) for col in range(self.width)]
+                for row in range(self.height)
+            ]
+            self._drawn_active = np.zeros(self.grid.shape, dtype=bool)
+            self._full_redraw = True
+            # Flat indices of cells whose letter changed since the last frame
+            self._dirty_cells = set()
+            self.crossword.subscribe(self._on_cells_changed)
+
+            # Clue panel caches; the composed panel is keyed by solved/active state
+            self._clue_wrap = {}
+            self._clue_line_cache = {}
+            self._clue_panel = None
+            self._clue_panel_height = 0
+            self._clue_panel_state = None
+            # What the clue and control panels show on screen; redrawn only when it changes
+            self._clues_drawn = None
+            self._controls_drawn = None
+            self._timer_text = (None, None)
+
+            # Solver event playback
+            self.events = events
+            self.playback_rate = playback_rate or None
+            self._held_event = None
+            self._place_credit = 1.0
+            self._last_poll = None
+            # Solver placements that conflicted with the grid and were not applied
+            self.skipped_placements = 0
+
+
+
+    def open_window(self):
+        """Initialize pygame and open the window; draw_grid() calls this on the first frame."""
+        if self.window is not None:
+            return
+        pygame.init()
+        pygame.display.set_caption("Crossword Solver Visualizer")
+        self.font = pygame.font.SysFont(None, FONT_SIZE)
+        self.number_font = pygame.font.SysFont(None, 14)
+        self.clue_font = pygame.font.SysFont(None, 16)  # smaller for sidebar clues
+        total_width = self.width * CELL_SIZE + RIGHT_PANEL_WIDTH
+        total_height = max(self.height * CELL_SIZE + BUTTON_HEIGHT, 1000)
+        self.window = pygame.display.set_mode((total_width, total_height))
+
+    def save_frame(self, path):
+        """Draw the current grid and write the window contents to an image file."""
+        self.draw_grid()
+        pygame.image.save(self.window, path)
 
     def _build_cell_to_number_map(self):
         """Return {(row, col): clue_number} for start cells."""
-        mapping = {}
-        for _, row in self.crossword.clue_df.iterrows():
-            r, c = row["start_row"], row["start_col"]
-            mapping[(r, c)] = row["number"]
-        return mapping
+        df = self.crossword.clue_df
+        return {
+            (r, c): number
+            for r, c, number in zip(df["start_row"].tolist(), df["start_col"].tolist(), df["number"].tolist())
+        }
     
     def highlight_clues(self, clue_ids):
         """Set the currently active clues being solved."""
@@ -52,102 +106,104 @@ class CrosswordVisualizer:
         self.draw_grid()
 
     
-    def draw_clues(self):
-        """Draws Across and Down clues in two side-by-side columns with scroll and greyed-out solved clues."""
-
-        panel_start_x = self.width * CELL_SIZE + PADDING
+    def _slot_solved(self):
+        """Per-slot flags: every cell of the slot holds a letter."""
+        return self.crossword.slot_filled == self.crossword.slot_table[:, SLOT_LENGTH]
+
+    def _clue_lines(self, clue_id, text, solved):
+        """Rendered, word-wrapped lines of a clue, cached per clue and solved state."""
+        key = (clue_id, solved)
+        lines = self._clue_line_cache.get(key)
+        if lines is not None:
+            return lines
+
+        wrapped = self._clue_wrap.get(clue_id)
+        if wrapped is None:
+            # Word wrapping, measured without rendering
+            max_width = (RIGHT_PANEL_WIDTH - 3 * PADDING) // 2
+            wrapped, current_line = [], ""
+            for word in text.split():
+                test_line = f"{current_line} {word}".strip()
+                if self.clue_font.size(test_line)[0] > max_width and current_line:
+                    wrapped.append(current_line)
+                    current_line = word
+                else:
+                    current_line = test_line
+            if current_line:
+                wrapped.append(current_line)
+            self._clue_wrap[clue_id] = wrapped
+
+        fg_color = (150, 150, 150) if solved else (0, 0, 0)
+        lines = self._clue_line_cache[key] = [self.clue_font.render(line, True, fg_color) for line in wrapped]
+        return lines
+
+    @instrumentation.timed("render.clue_panel")
+    def _compose_clue_panel(self, solved):
+        """Lay out both clue columns onto a persistent surface sized to fit them."""
         column_width = (RIGHT_PANEL_WIDTH - 3 * PADDING) // 2
         across_x = PADDING
         down_x = across_x + column_width + PADDING
         surface_width = RIGHT_PANEL_WIDTH - 2 * PADDING
+        slot_ids = self.crossword.slot_ids
 
-        # Temporary surface to render all clues
-        clue_surface_height = 5000  # large enough buffer; we’ll crop later
-        clue_surface = pygame.Surface((surface_width, clue_surface_height))
-        clue_surface.fill((255, 255, 255))
-
-        y_across = 0
-        y_down = 0
-
+        sections = []
         total_height = 0
-
-        def render_section(title, clues_dict, start_x, y):
-            nonlocal total_height
-            title_surface = self.font.render(title, True, (0, 0, 0))
-            clue_surface.blit(title_surface, (start_x, y))
-            y += title_surface.get_height() + 10
-
-            clue_type = "Across" if title.lower() == "across" else "Down"
-
-            # Determine solved clues
-            solved_set = set()
-            for _, row in self.crossword.clue_df.iterrows():
-                coords = row["coordinate_set"]
-                if all(self.grid[y_][x_] != " " and self.grid[y_][x_] != "■" for (x_, y_) in coords):
-                    solved_set.add(row["number_direction"])
-
+        for title, clues_dict, start_x in (
+            ("Across", self.crossword.across_clues, across_x),
+            ("Down", self.crossword.down_clues, down_x),
+        ):
             # Sort: unsolved first, then solved
-            clue_items = list(clues_dict.items())
-            sorted_clues = sorted(
-                clue_items,
-                key=lambda item: (
-                    f"{item[0]}-{clue_type}" in solved_set,  # False comes first
-                    item[0]
-                )
-            )
-
-            max_width = (RIGHT_PANEL_WIDTH - 3 * PADDING) // 2
-            for number, clue in sorted_clues:
-                nd = f"{number}-{clue_type}"
-                is_solved = nd in solved_set
-                is_active = nd in self.active_clue_ids
-
-                text = f"{number}. {clue}"
-                fg_color = (0, 0, 0)
-                bg_color = None
-
-                if is_solved:
-                    fg_color = (150, 150, 150)
-                if is_active:
-                    bg_color = (255, 255, 180)  # light yellow
-
-                # Word wrapping
-                words = text.split()
-                current_line = ""
-                line_surfaces = []
-
-                for word in words:
-                    test_line = f"{current_line} {word}".strip()
-                    test_surface = self.clue_font.render(test_line, True, fg_color)
-                    if test_surface.get_width() > max_width and current_line:
-                        line_surfaces.append(self.clue_font.render(current_line, True, fg_color))
-                        current_line = word
-                    else:
-                        current_line = test_line
-                if current_line:
-                    line_surfaces.append(self.clue_font.render(current_line, True, fg_color))
+            items = [(bool(solved[slot_ids[f"{number}-{title}"]]), number, clue) for number, clue in clues_dict.items()]
+            items.sort(key=lambda item: (item[0], item[1]))
+
+            y = self._glyph(self.font, title).get_height() + 10
+            blocks = []
+            for is_solved, number, clue in items:
+                nd = f"{number}-{title}"
+                lines = self._clue_lines(nd, f"{number}. {clue}", is_solved)
+                blocks.append((nd, y, lines))
+                y += sum(line.get_height() + 2 for line in lines) + 10  # extra padding between clues
+            y += 12  # spacing after section
+            sections.append((title, start_x, blocks))
+            total_height = max(total_height, y)
 
+        visible_clue_area = self.window.get_height() - BUTTON_HEIGHT - PADDING
+        panel = pygame.Surface((surface_width, max(total_height, visible_clue_area)))
+        panel.fill((255, 255, 255))
+        for title, start_x, blocks in sections:
+            panel.blit(self._glyph(self.font, title), (start_x, 0))
+            for nd, y, lines in blocks:
                 # Draw background for full block if active
-                if bg_color:
-                    block_height = sum(s.get_height() for s in line_surfaces) + (len(line_surfaces) - 1) * 2 + 4
-                    bg_rect = pygame.Rect(start_x - 5, y - 2, column_width + 10, block_height)
-                    pygame.draw.rect(clue_surface, bg_color, bg_rect)
+                if nd in self.active_clue_ids:
+                    block_height = sum(s.get_height() for s in lines) + (len(lines) - 1) * 2 + 4
+                    pygame.draw.rect(panel, (255, 255, 180), pygame.Rect(start_x - 5, y - 2, column_width + 10, block_height))
+                for line in lines:
+                    panel.blit(line, (start_x, y))
+                    y += line.get_height() + 2
 
-                for line_surface in line_surfaces:
-                    clue_surface.blit(line_surface, (start_x, y))
-                    y += line_surface.get_height() + 2
+        self._clue_panel = panel
+        self._clue_panel_height = total_height
 
+    def _clue_state(self):
+        """What the clue panel shows: solved flags, active clues and scroll position."""
+        return self._slot_solved().tobytes(), frozenset(self.active_clue_ids), self.scroll_offset
 
-                y += 10  # extra padding between clues
-
-            y += 12  # spacing after section
-            total_height = max(total_height, y)
-            return y
-
+    def draw_clues(self):
+        """
+        Draws Across and Down clues in two side-by-side columns with scroll and greyed-out solved clues.
+
+        The composed panel is rebuilt only when a clue's solved or active state
+        changes; otherwise this just blits the visible part of it.
+        """
+        solved = self._slot_solved()
+        state = (solved.tobytes(), frozenset(self.active_clue_ids))
+        if state != self._clue_panel_state:
+            self._compose_clue_panel(solved)
+            self._clue_panel_state = state
 
-        height_across = render_section("Across", self.crossword.across_clues, across_x, y_across)
-        height_down = render_section("Down", self.crossword.down_clues, down_x, y_down)
-        total_height = max(height_across, height_down)
+        surface_width = RIGHT_PANEL_WIDTH - 2 * PADDING
+        clue_surface = self._clue_panel
+        total_height = self._clue_panel_height
 
         # Update scroll limit
         visible_clue_area = self.window.get_height() - BUTTON_HEIGHT - PADDING
@@ -177,22 +233,39 @@ class CrosswordVisualizer:
             pygame.draw.rect(self.window, (100, 100, 100), thumb_rect)
 
 
-    def draw_control_panel(self):
+    def _control_state(self):
+        """What the control panel shows: pause label, percent filled, clues solved, skipped placements and timer."""
+        if self.timer_running and self.start_time is not None:
+            current_elapsed = self.elapsed_time + (time.time() - self.start_time)
+        else:
+            current_elapsed = self.elapsed_time
+        minutes = int(current_elapsed // 60)
+        seconds = int(current_elapsed % 60)
+        return (
+            self.paused,
+            int(self.crossword.calculate_completion_percentage_by_char()),
+            len(self.crossword.solved_slots),
+            self.skipped_placements,
+            f"Time: {minutes:02}:{seconds:02}",
+        )
+
+    def draw_control_panel(self, state=None):
         """Draws control buttons like Start and Quit under the grid."""
+        paused, percent, solved, skipped, timer_label = state or self._control_state()
         y_offset = self.height * CELL_SIZE + 10
 
         # Start Button
         start_rect = pygame.Rect(PADDING, y_offset, 100, 30)
         pygame.draw.rect(self.window, (0, 120, 0), start_rect)  # green
         pygame.draw.rect(self.window, (0, 0, 0), start_rect, 2)
-        start_text = self.font.render("Start", True, (255, 255, 255))
+        start_text = self._glyph(self.font, "Start", (255, 255, 255))
         self.window.blit(start_text, start_text.get_rect(center=start_rect.center))
 
         # Quit Button
         quit_rect = pygame.Rect(PADDING + 120, y_offset, 100, 30)
         pygame.draw.rect(self.window, (200, 0, 0), quit_rect)  # red
         pygame.draw.rect(self.window, (0, 0, 0), quit_rect, 2)
-        quit_text = self.font.render("Quit", True, (255, 255, 255))
+        quit_text = self._glyph(self.font, "Quit", (255, 255, 255))
         self.window.blit(quit_text, quit_text.get_rect(center=quit_rect.center))
 
         # Pause Button
@@ -200,15 +273,23 @@ class CrosswordVisualizer:
         pygame.draw.rect(self.window, (100, 100, 200), pause_rect)  # blue
         pygame.draw.rect(self.window, (0, 0, 0), pause_rect, 2)
 
-        pause_label = "Paused" if self.paused else "Pause"
-        pause_text = self.font.render(pause_label, True, (255, 255, 255))
+        pause_label = "Paused" if paused else "Pause"
+        pause_text = self._glyph(self.font, pause_label, (255, 255, 255))
         self.window.blit(pause_text, pause_text.get_rect(center=pause_rect.center))
 
 
+        # Undo Button
+        undo_rect = pygame.Rect(PADDING + 360, y_offset, 100, 30)
+        pygame.draw.rect(self.window, (120, 120, 120), undo_rect)  # grey
+        pygame.draw.rect(self.window, (0, 0, 0), undo_rect, 2)
+        undo_text = self._glyph(self.font, "Undo")
+        self.window.blit(undo_text, undo_text.get_rect(center=undo_rect.center))
+
         # Save for click detection
         self.quit_button_rect = quit_rect
         self.start_button_rect = start_rect
         self.pause_button_rect = pause_rect
+        self.undo_button_rect = undo_rect
 
         # ------------------------
         # Progress Bar
@@ -221,118 +302,222 @@ class CrosswordVisualizer:
         # Background
         pygame.draw.rect(self.window, (200, 200, 200), (bar_x, bar_y, bar_width, bar_height))
 
-        # Compute progress
-        fillable = (self.grid != "■").sum()
-        filled = ((self.grid != "■") & (self.grid != " ")).sum()
-        percent = (filled / fillable) if fillable > 0 else 0
-
         # Filled bar
-        filled_width = int(bar_width * percent)
+        filled_width = int(bar_width * percent / 100)
         pygame.draw.rect(self.window, (0, 180, 0), (bar_x, bar_y, filled_width, bar_height))
 
         # Text label
-        percent_text = self.font.render(f"{int(percent * 100)}%", True, (0, 0, 0))
+        percent_text = self._glyph(self.font, f"{percent}%")
         self.window.blit(percent_text, (bar_x + bar_width + 10, bar_y - 2))
 
+        # Solver placements rejected by the grid
+        if skipped:
+            skipped_text = self._glyph(self.font, f"{skipped} skipped", (200, 0, 0))
+            self.window.blit(skipped_text, (bar_x + bar_width + 70, bar_y - 2))
+
         # ------------------------
         # Clue Progress (X / Y)
         # ------------------------
-        solved = 0
-        total = len(self.crossword.clue_df)
-
-        for _, row in self.crossword.clue_df.iterrows():
-            coords = row["coordinate_set"]
-            if all(self.grid[row_][col_] not in {" ", "■"} for (col_, row_) in coords):
-                solved += 1
+        total = len(self.crossword.slot_names)
 
-        clue_text = self.font.render(f"{solved} / {total} clues solved", True, (0, 0, 0))
+        clue_text = self._glyph(self.font, f"{solved} / {total} clues solved")
         self.window.blit(clue_text, (PADDING, bar_y + bar_height + 10))
 
         # ------------------------
         # Timer Display
         # ------------------------
-        if self.timer_running and self.start_time is not None:
-            current_elapsed = self.elapsed_time + (time.time() - self.start_time)
-        else:
-            current_elapsed = self.elapsed_time
+        # Kept apart from the glyph cache, which would gain an entry every second
+        if self._timer_text[0] != timer_label:
+            self._timer_text = (timer_label, self.font.render(timer_label, True, (0, 0, 0)))
+        self.window.blit(self._timer_text[1], (PADDING + 360, bar_y + bar_height + 10))
 
 
-        minutes = int(current_elapsed // 60)
-        seconds = int(current_elapsed % 60)
-        timer_text = self.font.render(f"Time: {minutes:02}:{seconds:02}", True, (0, 0, 0))
-        self.window.blit(timer_text, (PADDING + 360, bar_y + bar_height + 10))
 
 
+    def _on_cells_changed(self, cells):
+        self._dirty_cells.update(cells.tolist())
 
+    def _glyph(self, font, text, color=(0, 0, 0)):
+        """Rendered surface for a letter, clue number or label, cached per font, text and color."""
+        key = (id(font), text, color)
+        surface = self._glyphs.get(key)
+        if surface is None:
+            surface = self._glyphs[key] = font.render(text, True, color)
+        return surface
 
-    def draw_grid(self):
-        self.window.fill((255, 255, 255))  # white background
-        active_coords = set()
+    def _active_mask(self):
+        mask = np.zeros(self.height * self.width, dtype=bool)
         for clue_id in self.active_clue_ids:
-            for _, row in self.crossword.clue_df.iterrows():
-                if row["number_direction"] == clue_id:
-                    # coordinate_set is [(x, y)], but grid is grid[y][x], so row = y, col = x
-                    active_coords.update((row_, col_) for (col_, row_) in row["coordinate_set"])
-
+            if clue_id in self.crossword.slot_ids:
+                mask[self.crossword.slot_cells[self.crossword.slot_ids[clue_id]]] = True
+        return mask.reshape(self.grid.shape)
 
-        for row in range(self.height):
-            for col in range(self.width):
-                rect = pygame.Rect(col * CELL_SIZE, row * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-                cell = self.grid[row][col]
+    def _draw_cell(self, row, col, active):
+        rect = self._cell_rects[row][col]
+        cell = self.grid[row][col]
 
-                if cell == "■":
-                    pygame.draw.rect(self.window, (0, 0, 0), rect)
-                    continue
+        if cell == "■":
+            pygame.draw.rect(self.window, (0, 0, 0), rect)
+            return rect
 
-                # Background
-                pygame.draw.rect(self.window, (255, 255, 255), rect)
+        # Background, highlighted if active
+        pygame.draw.rect(self.window, (255, 255, 180) if active else (255, 255, 255), rect)
 
-                # Highlight if active
-                if (row, col) in active_coords:
-                    pygame.draw.rect(self.window, (255, 255, 180), rect)
+        # Grid border
+        pygame.draw.rect(self.window, (0, 0, 0), rect, GRID_PADDING)
 
-                # Grid border
-                pygame.draw.rect(self.window, (0, 0, 0), rect, GRID_PADDING)
+        if (row, col) in self.cell_numbers:
+            number_surface = self._glyph(self.number_font, str(self.cell_numbers[(row, col)]))
+            self.window.blit(number_surface, (col * CELL_SIZE + 5, row * CELL_SIZE + 3))
 
+        if cell != " ":
+            text_surface = self._glyph(self.font, cell)
+            self.window.blit(text_surface, text_surface.get_rect(center=rect.center))
+        return rect
 
-                if (row, col) in self.cell_numbers:
-                    number = str(self.cell_numbers[(row, col)])
-                    number_surface = self.number_font.render(number, True, (0, 0, 0))
-                    self.window.blit(number_surface, (col * CELL_SIZE + 5, row * CELL_SIZE + 3))
-
-                if cell != " ":
-                    text_surface = self.font.render(cell, True, (0, 0, 0))
-                    text_rect = text_surface.get_rect(center=rect.center)
-                    self.window.blit(text_surface, text_rect)
-
-        self.draw_clues()
-        self.draw_control_panel()
-        pygame.display.flip()
+    @instrumentation.timed("render.frame")
+    def draw_grid(self):
+        """
+        Redraw the cells whose letter or highlight changed since the last frame,
+        and the clue and control panels if what they show changed, and push
+        only those areas to the screen.
+        """
+        self.open_window()
+        active = self._active_mask()
+        if self._full_redraw:
+            self.window.fill((255, 255, 255))  # white background
+            dirty = range(self.height * self.width)
+            self._dirty_cells.clear()
+        else:
+            dirty = set(np.flatnonzero(active != self._drawn_active).tolist())
+            changed, self._dirty_cells = self._dirty_cells, set()
+            dirty |= changed
+        rects = [self._draw_cell(*divmod(cell, self.width), active.flat[cell]) for cell in dirty]
+        instrumentation.count("render.frames")
+        instrumentation.count("render.cells_drawn", len(rects))
+        self._drawn_active[:] = active
+
+        grid_width, grid_height = self.width * CELL_SIZE, self.height * CELL_SIZE
+        window_width, window_height = self.window.get_size()
+        clue_panel = pygame.Rect(grid_width, 0, window_width - grid_width, window_height)
+        control_panel = pygame.Rect(0, grid_height, grid_width, window_height - grid_height)
+        clue_state = self._clue_state()
+        if self._full_redraw or clue_state != self._clues_drawn:
+            self.window.fill((255, 255, 255), clue_panel)
+            self.draw_clues()
+            # draw_clues() may clamp the scroll offset
+            self._clues_drawn = self._clue_state()
+            rects.append(clue_panel)
+        control_state = self._control_state()
+        if self._full_redraw or control_state != self._controls_drawn:
+            self.window.fill((255, 255, 255), control_panel)
+            self.draw_control_panel(control_state)
+            self._controls_drawn = control_state
+            rects.append(control_panel)
+
+        if self._full_redraw:
+            pygame.display.flip()
+            self._full_redraw = False
+        elif rects:
+            pygame.display.update(rects)
 
 
     def on_start(self):
     # Placeholder for now — override or assign externally
 
         pass
+
+    def on_edit(self, row, col, letter):
+    # Called after update_cell(); e.g. re-solve with solver.incremental.IncrementalSolver
+
+        pass
     
     def is_puzzle_filled(self):
-        return ((self.grid != "■") & (self.grid != " ")).sum() == (self.grid != "■").sum()
+        return self.crossword.is_filled()
+
+    def _stop_timer_if_filled(self):
+        if self.is_puzzle_filled():
+            if self.timer_running and self.start_time is not None:
+                self.elapsed_time += time.time() - self.start_time
+                self.start_time = None
+            self.timer_running = False
+
+    def poll_events(self):
+        """
+        Apply pending solver events on the GUI thread.
+
+        Everything that arrived since the last call is applied before the next
+        frame, so a fast solver costs one redraw per tick rather than one per
+        word. With a playback_rate, placements beyond the rate wait for later
+        ticks. A placement that conflicts with the grid is not applied; it is
+        counted in skipped_placements, shown in the control panel, and in the
+        "gui.skipped_placements" counter. Returns True if anything changed.
+        """
+        if self.events is None or self.paused:
+            self._last_poll = None
+            return False
+
+        now = time.perf_counter()
+        if self.playback_rate and self._last_poll is not None:
+            cap = max(1.0, self.playback_rate / 10)
+            self._place_credit = min(self._place_credit + (now - self._last_poll) * self.playback_rate, cap)
+        self._last_poll = now
+
+        changed = False
+        while True:
+            event, self._held_event = self._held_event, None
+            if event is None:
+                pending = self.events.drain(1)
+                if not pending:
+                    break
+                event = pending[0]
+
+            if event.kind == PLACE:
+                if self.playback_rate and self._place_credit < 1:
+                    self._held_event = event
+                    break
+                self._place_credit -= 1
+                try:
+                    self.crossword.place_word(event.clue_ids[0], event.word)
+                except ValueError:
+                    self.skipped_placements += 1
+                    if instrumentation.enabled:
+                        instrumentation.count("gui.skipped_placements")
+            elif event.kind == HIGHLIGHT:
+                self.active_clue_ids = set(event.clue_ids)
+            elif event.kind == DONE:
+                self.active_clue_ids = set()
+                self._stop_timer_if_filled()
+            changed = True
+        return changed
 
     def run(self):
         try:
             running = True
             self.draw_grid()
             while running:
-                for event in pygame.event.get():
-                    # Redraw every 250ms for timer updates
-                    if self.timer_running and not self.paused:
-                        now = pygame.time.get_ticks()
-                        if not hasattr(self, "_last_tick") or now - self._last_tick >= 250:
-                            self._last_tick = now
-                            self.draw_grid()
+                # One frame per tick for all solver events that arrived since the last one
+                if self.poll_events():
+                    self.draw_grid()
+                # Redraw every 250ms for timer updates
+                elif self.timer_running and not self.paused:
+                    now = pygame.time.get_ticks()
+                    if not hasattr(self, "_last_tick") or now - self._last_tick >= 250:
+                        self._last_tick = now
+                        self.draw_grid()
 
+                for event in pygame.event.get():
                     if event.type == pygame.QUIT:
                         running = False
+                    elif event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+                        # Ctrl+Z / Ctrl+Y step through the grid's edit trail
+                        if event.key == pygame.K_z and self.crossword.undo():
+                            self.draw_grid()
+                        elif event.key == pygame.K_y and self.crossword.redo():
+                            self.draw_grid()
+                    elif event.type in (pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED):
+                        self._full_redraw = True
+                        self.draw_grid()
                     elif event.type == pygame.MOUSEBUTTONDOWN:
                         if event.button == 1:
                             if hasattr(self, "quit_button_rect") and self.quit_button_rect.collidepoint(event.pos):
@@ -357,6 +542,9 @@ class CrosswordVisualizer:
                                         self.start_time = time.time()
                                 print("⏸️ Paused" if self.paused else "▶️ Resumed")
                                 self.draw_grid()
+                            elif hasattr(self, "undo_button_rect") and self.undo_button_rect.collidepoint(event.pos):
+                                if self.crossword.undo():
+                                    self.draw_grid()
 
                         elif event.button == 4:
                             self.scroll_offset = max(self.scroll_offset - self.scroll_speed, 0)
@@ -379,11 +567,8 @@ class CrosswordVisualizer:
 
 
     def update_cell(self, row, col, letter):
-        self.grid[row][col] = letter
+        self.crossword.set_cell(row, col, letter)
+        self.on_edit(row, col, letter)
         self.draw_grid()
-        if self.is_puzzle_filled():
-            if self.timer_running and self.start_time is not None:
-                self.elapsed_time += time.time() - self.start_time
-                self.start_time = None
-            self.timer_running = False
+        self._stop_timer_if_filled()
 
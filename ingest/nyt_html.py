@@ -0,0 +1,123 @@
+from html.parser import HTMLParser
+
+# Column order of the processed per-puzzle CSVs
+CSV_COLUMNS = [
+    "number", "start_col", "start_row", "end_col", "end_row", "clue",
+    "length (optional column, for checking only)",
+    "answer (optional column, for checking only)",
+]
+
+BLOCK_CLASS = "xwd__cell--block"
+
+
+class _PuzzlePageParser(HTMLParser):
+    """
+    Collect board cells and clue lists from a saved NYT crossword page.
+
+    Each cell is a <g class="xwd__cell"> holding a <rect role="cell"> with
+    its position and, for open cells, a small start-anchored <text> for the
+    clue number and a middle-anchored <text> for the letter. Clues sit in
+    <li> items under an <h3> "Across" / "Down" title.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.cells = []         # [x, y, size, is_block, number text, letter text]
+        self.clues = {"Across": [], "Down": []}
+        self._text_role = None  # "number" / "letter" while inside a cell <text>
+        self._hidden_depth = 0  # nested aria-live copy of the letter, skipped
+        self._section = None
+        self._clue_field = None
+        self._title = None
+
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == "rect" and a.get("role") == "cell":
+            size = float(a["width"])
+            self.cells.append([float(a["x"]), float(a["y"]), size, BLOCK_CLASS in a.get("class", ""), "", ""])
+        elif tag == "text" and self.cells:
+            if "xwd__cell--hidden" in a.get("class", ""):
+                self._hidden_depth += 1
+            elif a.get("text-anchor") == "start":
+                self._text_role = "number"
+            elif a.get("text-anchor") == "middle":
+                self._text_role = "letter"
+        elif tag == "h3" and "xwd__clue-list--title" in a.get("class", ""):
+            self._title = ""
+        elif tag == "span" and self._section is not None:
+            cls = a.get("class", "")
+            if "xwd__clue--label" in cls:
+                self.clues[self._section].append(["", ""])
+                self._clue_field = 0
+            elif "xwd__clue--text" in cls:
+                self._clue_field = 1
+
+    def handle_endtag(self, tag):
+        if tag == "text":
+            if self._hidden_depth:
+                self._hidden_depth -= 1
+            else:
+                self._text_role = None
+        elif tag == "h3" and self._title is not None:
+            title = self._title.strip()
+            self._section = title if title in self.clues else None
+            self._title = None
+        elif tag == "span" and self._clue_field == 0:
+            self._clue_field = None
+        elif tag == "li":
+            self._clue_field = None
+        elif tag == "ol":
+            self._section = None
+
+    def handle_data(self, data):
+        if self._title is not None:
+            self._title += data
+        elif self._text_role is not None and not self._hidden_depth:
+            self.cells[-1][4 if self._text_role == "number" else 5] += data
+        elif self._clue_field is not None and self.clues[self._section]:
+            self.clues[self._section][-1][self._clue_field] += data
+
+
+def parse_puzzle_html(html: str) -> list:
+    """
+    Parse a saved NYT crossword page into clue rows.
+
+    Returns:
+        list[list]: Rows in CSV_COLUMNS order, Across clues first, each
+        direction in the page's clue-list order.
+
+    Raises:
+        ValueError: If the page has no board or a clue has no matching slot
+    """
+    parser = _PuzzlePageParser()
+    parser.feed(html)
+    parser.close()
+    if not parser.cells:
+        raise ValueError("No crossword board found in page.")
+
+    origin_x = min(c[0] for c in parser.cells)
+    origin_y = min(c[1] for c in parser.cells)
+    board, starts = {}, {}
+    for x, y, size, is_block, number, letter in parser.cells:
+        pos = (round((y - origin_y) / size), round((x - origin_x) / size))
+        if is_block:
+            continue
+        board[pos] = letter.strip().upper()
+        if number.strip():
+            starts[int(number)] = pos
+
+    rows = []
+    for direction, (dr, dc) in (("Across", (0, 1)), ("Down", (1, 0))):
+        for label, text in parser.clues[direction]:
+            number = int(label)
+            if number not in starts:
+                raise ValueError(f"Clue {number}-{direction} has no numbered cell on the board.")
+            r, c = starts[number]
+            letters = []
+            while (r, c) in board:
+                letters.append(board[(r, c)])
+                r, c = r + dr, c + dc
+            r, c = r - dr, c - dc
+            start_row, start_col = starts[number]
+            rows.append([number, start_col, start_row, c, r, text.strip(), len(letters), "".join(letters)])
+    return rows
@@ -0,0 +1,193 @@
+import os
+import csv
+import sys
+import json
+import glob
+import time
+import hashlib
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+from ingest.nyt_html import CSV_COLUMNS, parse_puzzle_html
+from utils.puzzle_io import ARCHIVE_FILENAME, puzzle_name_from_path
+
+MANIFEST_FILENAME = ".ingest_manifest.json"
+# Puzzles appended between manifest checkpoints
+MANIFEST_EVERY = 50
+ARCHIVE_COLUMNS = CSV_COLUMNS + ["puzzle_name"]
+
+
+def page_hash(path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def load_manifest(path) -> dict:
+    """
+    Read the ingest manifest.
+
+    pages: page name -> SHA-1 of the HTML it was last parsed from
+    archived: puzzle names present in the archive
+    archive_size: archive length in bytes after the last completed append
+    """
+    if not os.path.exists(path):
+        return {"pages": {}, "archived": None, "archive_size": None}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest: dict, path):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _parse_page(path):
+    """Worker: (puzzle name, rows, error message)."""
+    name = puzzle_name_from_path(path)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return name, parse_puzzle_html(f.read()), None
+    except Exception as e:
+        return name, None, f"{type(e).__name__}: {e}"
+
+
+def _writer(f):
+    return csv.writer(f, lineterminator="\n")
+
+
+def _archived_names(archive_path) -> set:
+    """Puzzle names in an existing archive, read with csv so pandas is not needed."""
+    names = set()
+    if os.path.exists(archive_path) and os.path.getsize(archive_path):
+        with open(archive_path, encoding="utf-8", newline="") as f:
+            reader = csv.reader(f)
+            column = next(reader).index("puzzle_name")
+            names.update(row[column] for row in reader if row)
+    return names
+
+
+def _drop_from_archive(archive_path, names: set):
+    """Stream the archive into a copy without the given puzzles, then swap it in."""
+    tmp = f"{archive_path}.tmp"
+    with open(archive_path, encoding="utf-8", newline="") as src, \
+            open(tmp, "w", encoding="utf-8", newline="") as dst:
+        reader, writer = csv.reader(src), _writer(dst)
+        header = next(reader)
+        column = header.index("puzzle_name")
+        writer.writerow(header)
+        writer.writerows(row for row in reader if row and row[column] not in names)
+    os.replace(tmp, archive_path)
+
+
+def ingest(raw_dir, out_dir, workers: int = None, chunksize: int = 4, force: bool = False,
+           progress: bool = False) -> dict:
+    """
+    Parse new or changed HTML pages into per-puzzle CSVs and the combined archive.
+
+    Pages are hashed up front and only those whose SHA-1 differs from the
+    manifest are sent to the process pool. Parsed puzzles are written as
+    they arrive: one CSV each, plus rows appended to all_puzzles.csv. The
+    archive is only rewritten when a page that is already in it changed, in
+    which case its old rows are streamed out first.
+
+    Args:
+        raw_dir (str): Directory of saved puzzle pages (*.html)
+        out_dir (str): Directory for per-puzzle CSVs, all_puzzles.csv and the manifest
+        workers (int): Process count (defaults to os.cpu_count())
+        chunksize (int): Pages per task sent to a worker
+        force (bool): Re-parse every page regardless of the manifest
+        progress (bool): Show a tqdm progress bar
+
+    Returns:
+        dict: Counts of "parsed", "skipped" and "failed" pages, plus "errors" by page name
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, MANIFEST_FILENAME)
+    archive_path = os.path.join(out_dir, ARCHIVE_FILENAME)
+    manifest = load_manifest(manifest_path)
+
+    # An append interrupted before its manifest update is rolled back
+    if manifest["archive_size"] is not None and os.path.exists(archive_path):
+        if os.path.getsize(archive_path) > manifest["archive_size"]:
+            with open(archive_path, "r+b") as f:
+                f.truncate(manifest["archive_size"])
+    archived = set(manifest["archived"]) if manifest["archived"] is not None else _archived_names(archive_path)
+
+    pages = {puzzle_name_from_path(p): p for p in sorted(glob.glob(os.path.join(raw_dir, "*.html")))}
+    hashes = {name: page_hash(p) for name, p in pages.items()}
+    todo = [name for name in pages if force or manifest["pages"].get(name) != hashes[name]]
+    summary = {"parsed": 0, "skipped": len(pages) - len(todo), "failed": 0, "errors": {}}
+    if not todo:
+        return summary
+
+    stale = archived & set(todo)
+    if stale:
+        _drop_from_archive(archive_path, stale)
+        archived -= stale
+        manifest.update(archived=sorted(archived), archive_size=os.path.getsize(archive_path))
+        save_manifest(manifest, manifest_path)
+
+    bar = None
+    if progress:
+        from tqdm import tqdm
+        bar = tqdm(total=len(todo), unit="page")
+
+    new_archive = not os.path.exists(archive_path) or not os.path.getsize(archive_path)
+    with ProcessPoolExecutor(workers or os.cpu_count() or 1) as pool, \
+            open(archive_path, "a", encoding="utf-8", newline="") as archive:
+        archive_writer = _writer(archive)
+        if new_archive:
+            archive_writer.writerow(ARCHIVE_COLUMNS)
+        results = pool.map(_parse_page, [pages[name] for name in todo], chunksize=chunksize)
+        for i, (name, rows, error) in enumerate(results, 1):
+            if bar is not None:
+                bar.update()
+            if error is not None:
+                summary["failed"] += 1
+                summary["errors"][name] = error
+            else:
+                with open(os.path.join(out_dir, f"{name}.csv"), "w", encoding="utf-8", newline="") as f:
+                    writer = _writer(f)
+                    writer.writerow(CSV_COLUMNS)
+                    writer.writerows(rows)
+                archive_writer.writerows(row + [name] for row in rows)
+                archived.add(name)
+                manifest["pages"][name] = hashes[name]
+                summary["parsed"] += 1
+            if i % MANIFEST_EVERY == 0 or i == len(todo):
+                archive.flush()
+                manifest.update(archived=sorted(archived), archive_size=archive.tell())
+                save_manifest(manifest, manifest_path)
+
+    if bar is not None:
+        bar.close()
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Ingest saved crossword pages into processed CSVs.")
+    parser.add_argument("raw_dir", help="directory of saved puzzle pages (*.html)")
+    parser.add_argument("out_dir", help="directory for per-puzzle CSVs and all_puzzles.csv")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4, help="pages per worker task")
+    parser.add_argument("--force", action="store_true", help="re-parse every page")
+    parser.add_argument("--progress", action="store_true", help="show a progress bar")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    summary = ingest(args.raw_dir, args.out_dir, workers=args.workers, chunksize=args.chunksize,
+                     force=args.force, progress=args.progress)
+    for name, error in summary["errors"].items():
+        print(f"{name}: {error}", file=sys.stderr)
+    print(f"{summary['parsed']} parsed, {summary['skipped']} unchanged, {summary['failed']} failed "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,71 +1,226 @@
+"""
+AI Crossword Solver command line.
+
+    python main.py solve puzzle.csv [--index answers.xwi] [--cache]
+    python main.py render puzzle.csv [--output frame.png]
+    python main.py batch all_puzzles.csv --mode solve --index answers.xwi
+    python main.py validate all_puzzles.csv
+    python main.py bench --startup
+
+Each subcommand imports only what it uses: this module pulls in nothing
+beyond the standard library and utils.instrumentation, pandas is imported
+when a CSV is read (never with --cache once the grid cache exists), pygame
+only by render, and a pattern index is opened only when --index is given.
+`main.py bench --startup` reports what every subcommand costs to start.
+Running without a subcommand keeps the old behaviour: the GUI, or a
+headless fill with --headless.
+"""
+import os
+import sys
 import time
-import pandas as pd
-import pygame
-from gui.grid_visualizer import CrosswordVisualizer
-from grid.grid_builder import CrosswordGrid
-
-
-def start_solving(crossword, visualizer):
-    visualizer.start_time = time.time()
-    visualizer.elapsed_time = 0
-    visualizer.timer_running = True
-
-    for clue in crossword.clue_df.itertuples():
-        clue_id = clue.number_direction
-        answer = clue.answer  # Assumes you've renamed the column on load
-        visualizer.highlight_clues([clue_id])
-
-        # Place the entire word at once
-        crossword.place_word(clue_id, answer)
-
-        # Update the full grid in one step
-        visualizer.draw_grid()
-
-        # Pause briefly to simulate solving
-        time.sleep(0.2)
+import argparse
+import importlib
+from utils import instrumentation
+
+DEFAULT_PUZZLE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)),
+    "data", "puzzle_samples", "processed_puzzle_samples", "crossword_2022_06_05.csv",
+)
+
+# Subcommands with their own argument parser: name -> (module with main(argv), help)
+DELEGATED = {
+    "batch": ("solver.batch", "validate or solve every puzzle of an archive on a process pool"),
+    "validate": ("utils.validation", "check an archive or puzzle CSV and report problems per row"),
+    "bench": ("scripts.benchmark", "benchmark the pipeline stages and subcommand startup"),
+}
+COMMANDS = ["solve", "render"] + list(DELEGATED)
+
+
+def start_solving(crossword, events):
+    """
+    Solver thread: publish each clue's answer to the event queue.
+
+    Only reads the crossword; the GUI applies the placements on its own thread.
+    """
+    for clue_id, answer in zip(crossword.slot_names, crossword.slot_answers):
+        if not isinstance(answer, str):
+            continue
+        events.highlight([clue_id])
+        events.place(clue_id, answer)
+    events.highlight([])
+    events.done()
+
+
+def solve_headless(crossword):
+    """Place every answer directly, with no GUI and no pygame import."""
+    started = time.perf_counter()
+    with instrumentation.span("solve.headless"):
+        for clue_id, answer in zip(crossword.slot_names, crossword.slot_answers):
+            if isinstance(answer, str):
+                crossword.place_word(clue_id, answer)
+    elapsed = time.perf_counter() - started
+    print(f"Placed {len(crossword.placed_slots)} words in {elapsed * 1000:.1f} ms "
+          f"({crossword.calculate_completion_percentage_by_char():.0f}% filled)")
+
+
+def solve_with_index(crossword, index_path, limit=None, max_nodes=None, time_limit=None):
+    """Fill the grid from a pattern index with the FillEngine, ignoring the answer key."""
+    from answer_generation.pattern_index import PatternIndex
+    from solver.fill_engine import FillEngine
+
+    index = PatternIndex.load(index_path)
+    engine = FillEngine(crossword, index.candidates(crossword, limit), max_nodes=max_nodes, time_limit=time_limit)
+    result = engine.solve()
+    engine.apply(result)
+    print(f"Filled {len(result.assignment)}/{len(crossword.slot_names)} slots in "
+          f"{result.stats['elapsed'] * 1000:.1f} ms ({result.stats['nodes']} nodes, "
+          f"{len(result.conflicts)} conflicts, "
+          f"{crossword.calculate_completion_percentage_by_char():.0f}% filled)")
+
+
+def load_grid(path, cache: bool = False):
+    """
+    Build the CrosswordGrid for a puzzle CSV.
+
+    With cache, the puzzle is read through a compiled grid cache next to the
+    CSV (see grid.puzzle_cache), compiled on first use; later runs then never
+    import pandas.
+    """
+    if cache:
+        from grid.puzzle_cache import load_puzzles
+        return load_puzzles(path).grid(0)
+    from grid.grid_builder import CrosswordGrid
+    from utils.puzzle_io import load_clue_df
+
+    return CrosswordGrid(load_clue_df(path))
+
+
+# ------------------------
+# Subcommands
+# ------------------------
+def _solve(args):
+    crossword = load_grid(args.puzzle, args.cache)
+    if args.index:
+        solve_with_index(crossword, args.index, args.limit, args.max_nodes, args.time_limit)
+    else:
+        solve_headless(crossword)
+    crossword.display()
 
-        # Wait if paused
-        while visualizer.paused:
-            pygame.time.wait(10)
 
-    visualizer.highlight_clues([])
+def _render(args):
+    if args.output:
+        # Drawing to a file needs no visible window
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    from gui.grid_visualizer import CrosswordVisualizer
 
-    # Force a final redraw and timer stop if grid is complete
-    visualizer.draw_grid()
-    if visualizer.is_puzzle_filled():
-        if visualizer.timer_running and visualizer.start_time is not None:
-            visualizer.elapsed_time += time.time() - visualizer.start_time
-            visualizer.start_time = None
-        visualizer.timer_running = False
+    crossword = load_grid(args.puzzle, args.cache)
+    if args.output:
+        for clue_id, answer in zip(crossword.slot_names, crossword.slot_answers):
+            if isinstance(answer, str):
+                crossword.place_word(clue_id, answer)
+        CrosswordVisualizer(crossword).save_frame(args.output)
+        print(f"Frame written to {args.output}")
+        return
 
+    print("🧠 Welcome to the AI Crossword Solver.\n")
+    crossword.display()
 
+    from threading import Thread
+    from solver.events import SolveEventQueue
 
-def main():
-    print("🧠 Welcome to the AI Crossword Solver.")
-    print("This is a placeholder. Add your pipeline call here.\n")
+    events = SolveEventQueue()
+    visualizer = CrosswordVisualizer(crossword, events=events, playback_rate=args.rate)
 
-    file_path = "crossword_solver\data\puzzle_samples\processed_puzzle_samples\crossword_2022_06_05.csv"
-    clue_df = pd.read_csv(file_path)     # read the CSV into a DataFrame
-    clue_df = clue_df.rename(columns={"answer (optional column, for checking only)": "answer"})
+    # Hook up the start button; the solver only publishes events
+    visualizer.on_start = lambda: Thread(target=start_solving, args=(crossword, events), daemon=True).start()
 
-    crossword = CrosswordGrid(clue_df)   # pass the DataFrame
+    visualizer.run()
     crossword.display()
 
-    visualizer = CrosswordVisualizer(crossword)
 
-    # Launch visualization in separate thread or inline for now
-    from threading import Thread
-    # Thread(target=visualizer.run).start()
-    # # Hook up the start button
-    visualizer.on_start = lambda: Thread(target=start_solving, args=(crossword, visualizer)).start()
+def _add_puzzle_arguments(parser):
+    parser.add_argument("puzzle", nargs="?", default=DEFAULT_PUZZLE, help="puzzle CSV (default: a bundled sample)")
+    parser.add_argument("--cache", action="store_true",
+                        help="read the puzzle through a compiled .xwc grid cache next to it (created if missing)")
+    parser.add_argument("--trace", metavar="PATH",
+                        help="record timers and counters; write a Chrome trace JSON to PATH and print a summary")
+
+
+def _add_render_arguments(parser):
+    parser.add_argument("--rate", type=float, default=5.0,
+                        help="GUI playback in words per second; 0 for unthrottled (default: %(default)s)")
+    parser.add_argument("--output", metavar="PNG", help="draw the filled grid to an image instead of opening the GUI")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="AI Crossword Solver.")
+    commands = parser.add_subparsers(dest="command", metavar="command")
+
+    solve = commands.add_parser("solve", help="fill a puzzle headless",
+                                description="Fill a puzzle without the GUI: from its answer key, or with "
+                                            "the FillEngine from a pattern index.")
+    _add_puzzle_arguments(solve)
+    solve.add_argument("--index", help="PatternIndex file; fill with the FillEngine instead of the answer key")
+    solve.add_argument("--limit", type=int, default=None, help="candidates per slot")
+    solve.add_argument("--max-nodes", type=int, default=None)
+    solve.add_argument("--time-limit", type=float, default=None, help="seconds")
+    solve.set_defaults(handler=_solve)
+
+    render = commands.add_parser("render", help="show a puzzle in the GUI",
+                                 description="Open the pygame visualizer, or draw one frame to an image.")
+    _add_puzzle_arguments(render)
+    _add_render_arguments(render)
+    render.set_defaults(handler=_render)
+
+    # These parse their own arguments, including -h
+    for name, (_, help_text) in DELEGATED.items():
+        delegated = commands.add_parser(name, help=help_text, add_help=False)
+        delegated.add_argument("args", nargs=argparse.REMAINDER)
+    return parser
+
+
+def build_legacy_parser() -> argparse.ArgumentParser:
+    """Arguments of main.py before it had subcommands."""
+    parser = argparse.ArgumentParser(description="AI Crossword Solver.")
+    _add_puzzle_arguments(parser)
+    _add_render_arguments(parser)
+    parser.add_argument("--headless", action="store_true", help="solve without the GUI")
+    parser.set_defaults(index=None)
+    return parser
+
+
+def load_command(name):
+    """Import a subcommand's module; returns its main(argv), or None for the commands defined here."""
+    if name in DELEGATED:
+        return importlib.import_module(DELEGATED[name][0]).main
+    if name not in COMMANDS:
+        raise ValueError(f"Unknown command '{name}', expected one of {COMMANDS}.")
+    return None
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] in DELEGATED:
+        return load_command(argv[0])(argv[1:])
+    if argv and (argv[0] in COMMANDS or argv[0] in ("-h", "--help")):
+        args = build_parser().parse_args(argv)
+    else:
+        args = build_legacy_parser().parse_args(argv)
+        args.handler = _solve if args.headless else _render
+
+    if args.trace:
+        from utils.puzzle_io import puzzle_name_from_path
+        instrumentation.enable()
+        instrumentation.set_puzzle(puzzle_name_from_path(args.puzzle))
+    try:
+        return args.handler(args)
+    finally:
+        if args.trace:
+            instrumentation.export_chrome_trace(args.trace)
+            print(instrumentation.format_summary())
+            print(f"Trace written to {args.trace}")
 
-    visualizer.run()
-    crossword.display()
-
-    print("\nSample across clue:")
-    print(crossword.across_clues[1])  # Replace with an actual number from your file
 
 if __name__ == "__main__":
-    main()
-
-    
+    sys.exit(main())
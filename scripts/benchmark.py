@@ -0,0 +1,325 @@
+"""
+Stage-by-stage benchmark over the bundled puzzle archive.
+
+    python scripts/benchmark.py -o bench.json
+    python scripts/benchmark.py --baseline bench.json --max-slowdown 0.15
+
+Every per-puzzle CSV in data/puzzle_samples/processed_puzzle_samples is the
+fixed corpus. Each stage is timed per puzzle and reported as percentiles;
+peak traced memory comes from a separate tracemalloc pass so tracing does
+not distort the timings. With --baseline, stages whose p50 time or peak
+memory grew past the thresholds are reported and the exit status is 1.
+
+    python scripts/benchmark.py --startup -o startup.json
+
+With --startup, every main.py subcommand is instead run in a fresh
+interpreter under -X importtime: each gets a "startup.<command>" stage (wall
+time of the whole run) and an "imports.<command>" stage (time spent
+importing), and the most expensive top-level imports are listed, so a module
+that starts importing pandas or pygame eagerly shows up against a baseline.
+"""
+import os
+import sys
+import gc
+import json
+import time
+import shutil
+import platform
+import argparse
+import tempfile
+import subprocess
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from grid.grid_builder import CrosswordGrid
+from utils.puzzle_io import list_puzzle_files, load_clue_df
+from utils.validation import validate_clue_df
+
+CORPUS_DIR = os.path.join(ROOT, "data", "puzzle_samples", "processed_puzzle_samples")
+STAGES = ["csv_load", "validate", "grid_init", "place_word", "clue_lookup", "draw_full", "draw_incremental"]
+PERCENTILES = [50, 90, 99]
+
+# main.py invocation timed per subcommand; {puzzle} and {tmp} are filled in,
+# and {tmp}/corpus/puzzle.csv is a copy of the puzzle (a one-puzzle batch source)
+STARTUP_COMMANDS = {
+    "help": ["--help"],
+    "solve": ["solve", "{puzzle}"],
+    "solve_cached": ["solve", "{tmp}/corpus/puzzle.csv", "--cache"],
+    "render": ["render", "{puzzle}", "--output", "{tmp}/frame.png"],
+    "validate": ["validate", "{puzzle}"],
+    "batch": ["batch", "{tmp}/corpus", "-o", "{tmp}/batch.csv", "-j", "1"],
+    "bench": ["bench", "--help"],
+}
+
+
+def _fill(crossword):
+    for clue_id, answer in zip(crossword.slot_names, crossword.slot_answers):
+        if isinstance(answer, str):
+            crossword.place_word(clue_id, answer)
+
+
+def _lookup(crossword):
+    for number in crossword.across_clues:
+        crossword.across_clues[number]
+    for number in crossword.down_clues:
+        crossword.down_clues[number]
+
+
+def _open_and_draw(visualizer_cls, crossword):
+    visualizer = visualizer_cls(crossword)
+    visualizer.draw_grid()
+    return visualizer
+
+
+def run_puzzle(path, stage_times, gui=True):
+    """Time every stage for one puzzle, appending seconds to stage_times[stage]."""
+    def timed(stage, fn, *args):
+        started = time.perf_counter()
+        result = fn(*args)
+        stage_times[stage].append(time.perf_counter() - started)
+        return result
+
+    clue_df = timed("csv_load", load_clue_df, path)
+    timed("validate", validate_clue_df, clue_df)
+    crossword = timed("grid_init", CrosswordGrid, clue_df)
+    if gui:
+        from gui.grid_visualizer import CrosswordVisualizer
+        visualizer = CrosswordVisualizer(crossword)
+        visualizer.open_window()
+        timed("draw_full", visualizer.draw_grid)
+        # One word placed and highlighted, as during animated solving
+        clue_id, answer = crossword.slot_names[0], crossword.slot_answers[0]
+        if isinstance(answer, str):
+            crossword.place_word(clue_id, answer)
+        visualizer.active_clue_ids = {clue_id}
+        timed("draw_incremental", visualizer.draw_grid)
+        crossword = CrosswordGrid(clue_df)
+    timed("place_word", _fill, crossword)
+    timed("clue_lookup", _lookup, crossword)
+
+
+def measure_memory(paths, gui=True) -> dict:
+    """Peak traced allocation per stage, in KiB, over the whole corpus."""
+    peaks = {}
+
+    def traced(stage, fn, *args):
+        gc.collect()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        result = fn(*args)
+        peaks[stage] = max(peaks.get(stage, 0), (tracemalloc.get_traced_memory()[1] - base) / 1024)
+        return result
+
+    tracemalloc.start()
+    try:
+        for path in paths:
+            clue_df = traced("csv_load", load_clue_df, path)
+            traced("validate", validate_clue_df, clue_df)
+            crossword = traced("grid_init", CrosswordGrid, clue_df)
+            if gui:
+                from gui.grid_visualizer import CrosswordVisualizer
+                visualizer = traced("draw_full", _open_and_draw, CrosswordVisualizer, crossword)
+                visualizer.active_clue_ids = set(crossword.slot_names[:1])
+                traced("draw_incremental", visualizer.draw_grid)
+                crossword = CrosswordGrid(clue_df)
+            traced("place_word", _fill, crossword)
+            traced("clue_lookup", _lookup, crossword)
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+
+def parse_importtime(stderr: str) -> tuple:
+    """
+    Total import time and the top-level imports from -X importtime output.
+
+    Returns:
+        tuple[float, dict]: (seconds spent importing, {module: cumulative seconds})
+    """
+    total, top_level = 0.0, {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        if not own.strip().isdigit():
+            continue  # column header
+        total += int(own) / 1e6
+        if not name.startswith("  "):
+            top_level[name.strip()] = int(cumulative) / 1e6
+    return total, top_level
+
+
+def measure_startup(puzzle, repeat: int = 3) -> tuple:
+    """
+    Run every STARTUP_COMMANDS entry `repeat` times in a fresh interpreter.
+
+    Returns:
+        tuple[dict, dict]: stage_times ({"startup.<cmd>" / "imports.<cmd>": seconds})
+        and the top-level imports of each command's last run
+    """
+    env = dict(os.environ, SDL_VIDEODRIVER="dummy", PYGAME_HIDE_SUPPORT_PROMPT="1")
+    stage_times, imports = {}, {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.mkdir(os.path.join(tmp, "corpus"))
+        shutil.copy(puzzle, os.path.join(tmp, "corpus", "puzzle.csv"))
+        for name, template in STARTUP_COMMANDS.items():
+            argv = [arg.format(puzzle=puzzle, tmp=tmp) for arg in template]
+            for _ in range(repeat):
+                started = time.perf_counter()
+                proc = subprocess.run([sys.executable, "-X", "importtime", os.path.join(ROOT, "main.py")] + argv,
+                                      cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                                      text=True)
+                elapsed = time.perf_counter() - started
+                if proc.returncode != 0:
+                    raise RuntimeError(f"main.py {' '.join(argv)} failed:\n{proc.stderr[-2000:]}")
+                total, imports[name] = parse_importtime(proc.stderr)
+                stage_times.setdefault(f"startup.{name}", []).append(elapsed)
+                stage_times.setdefault(f"imports.{name}", []).append(total)
+    return stage_times, imports
+
+
+def print_imports(imports: dict, top: int = 5):
+    for name, modules in imports.items():
+        heaviest = sorted(modules.items(), key=lambda item: -item[1])[:top]
+        print(f"{name:<14}" + ", ".join(f"{module} {seconds * 1000:.0f} ms" for module, seconds in heaviest))
+
+
+def summarize(stage_times: dict, peaks: dict) -> dict:
+    stages = {}
+    for stage, samples in stage_times.items():
+        if not samples:
+            continue
+        ms = np.array(samples) * 1000
+        stats = {f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES}
+        stats.update(mean_ms=float(ms.mean()), total_ms=float(ms.sum()), samples=len(ms))
+        stats["peak_kib"] = float(peaks.get(stage, 0.0))
+        stages[stage] = stats
+    return stages
+
+
+def compare(results: dict, baseline: dict, max_slowdown: float, max_memory_growth: float) -> list:
+    """Regressions as (stage, metric, baseline value, current value, relative change)."""
+    regressions = []
+    for stage, current in results["stages"].items():
+        before = baseline["stages"].get(stage)
+        if before is None:
+            continue
+        for metric, limit in (("p50_ms", max_slowdown), ("peak_kib", max_memory_growth)):
+            old, new = before.get(metric), current.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change > limit:
+                regressions.append((stage, metric, old, new, change))
+    return regressions
+
+
+def print_table(results: dict, baseline: dict = None):
+    header = f"{'stage':<22}" + "".join(f"{f'p{p} ms':>10}" for p in PERCENTILES) + f"{'mean ms':>10}{'peak KiB':>11}"
+    if baseline:
+        header += f"{'p50 vs base':>13}"
+    print(header)
+    for stage, s in results["stages"].items():
+        line = f"{stage:<22}" + "".join(f"{s[f'p{p}_ms']:>10.3f}" for p in PERCENTILES)
+        line += f"{s['mean_ms']:>10.3f}{s['peak_kib']:>11.1f}"
+        before = (baseline or {}).get("stages", {}).get(stage)
+        if before and before.get("p50_ms"):
+            line += f"{(s['p50_ms'] - before['p50_ms']) / before['p50_ms']:>+13.1%}"
+        print(line)
+
+
+def run(corpus=CORPUS_DIR, repeat: int = 3, gui: bool = True, memory: bool = True, startup: bool = False) -> dict:
+    if startup:
+        paths = list_puzzle_files(corpus)
+        if not paths:
+            raise ValueError(f"No puzzle CSVs found in {corpus}")
+        stage_times, imports = measure_startup(paths[0], repeat)
+        return {
+            "meta": {
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "puzzle": os.path.basename(paths[0]),
+                "repeat": repeat,
+            },
+            "stages": summarize(stage_times, {}),
+            "imports": imports,
+        }
+
+    if gui:
+        # Headless rendering; must be set before pygame initializes a display
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+        os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+    paths = list_puzzle_files(corpus)
+    if not paths:
+        raise ValueError(f"No puzzle CSVs found in {corpus}")
+
+    # Warm-up pass so imports and caches do not land in the first sample
+    run_puzzle(paths[0], {stage: [] for stage in STAGES}, gui=gui)
+
+    stage_times = {stage: [] for stage in STAGES}
+    for _ in range(repeat):
+        for path in paths:
+            run_puzzle(path, stage_times, gui=gui)
+    peaks = measure_memory(paths, gui=gui) if memory else {}
+
+    import pandas as pd
+    return {
+        "meta": {
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+            "puzzles": len(paths),
+            "repeat": repeat,
+        },
+        "stages": summarize(stage_times, peaks),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the grid and renderer over the bundled puzzles.")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="directory of puzzle CSVs (default: bundled samples)")
+    parser.add_argument("-n", "--repeat", type=int, default=3, help="passes over the corpus (default: %(default)s)")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    parser.add_argument("--baseline", help="results JSON to compare against")
+    parser.add_argument("--max-slowdown", type=float, default=0.15,
+                        help="allowed relative p50 increase per stage (default: %(default)s)")
+    parser.add_argument("--max-memory-growth", type=float, default=0.25,
+                        help="allowed relative peak-memory increase per stage (default: %(default)s)")
+    parser.add_argument("--no-gui", action="store_true", help="skip the pygame rendering stages")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--startup", action="store_true",
+                        help="time main.py subcommand startup and imports instead of the pipeline stages")
+    args = parser.parse_args(argv)
+
+    results = run(args.corpus, repeat=args.repeat, gui=not args.no_gui, memory=not args.no_memory,
+                  startup=args.startup)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+    if "imports" in results:
+        print("\nHeaviest top-level imports per command:")
+        print_imports(results["imports"])
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+    if baseline:
+        regressions = compare(results, baseline, args.max_slowdown, args.max_memory_growth)
+        for stage, metric, old, new, change in regressions:
+            print(f"REGRESSION {stage} {metric}: {old:.3f} -> {new:.3f} ({change:+.1%})")
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Throughput and accuracy of the clue-answer pair ranker, float vs int8.
+
+    python scripts/benchmark_ranker.py --model models/clue-bert -o ranker.json
+    python scripts/benchmark_ranker.py --model models/clue-bert --clues 2000 --workers 4
+
+Clues are sampled from all_puzzles.csv. Each is ranked against its true
+answer plus --distractors other archive answers of the same length, through
+a RankingEngine, once with the float model and once with the int8
+dynamically quantized one. Reported per variant: pairs per second, top-1
+accuracy and mean reciprocal rank of the true answer, and weight size; and
+between the two: how often they pick the same top answer, the mean Spearman
+correlation of their per-clue rankings, and the largest score difference.
+A true answer tied with distractors is ranked below all of them.
+
+--model is required: pass a cross-encoder fine-tuned on clue-answer pairs.
+The library default (DEFAULT_PAIR_MODEL) is a web-search passage ranker, so
+its accuracy here says nothing about a clue model.
+"""
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from answer_generation.pattern_index import PatternIndex
+from semantic_ranking.pair_ranker import PairModel, RankingEngine
+from utils.puzzle_io import load_clue_df
+
+ARCHIVE = os.path.join(ROOT, "data", "puzzle_samples", "processed_puzzle_samples", "all_puzzles.csv")
+VARIANTS = {"float32": False, "int8": True}
+
+
+def build_tasks(archive, clues: int = 500, distractors: int = 49, seed: int = 0) -> list:
+    """
+    Sample (clue, candidates, index of the true answer) tasks from an archive.
+
+    Distractors are other answers of the same length drawn from the whole
+    archive, as a pattern-only candidate generator would propose them.
+    """
+    df = load_clue_df(archive)
+    df = df[df["clue"].apply(lambda c: isinstance(c, str)) & df["answer"].apply(lambda a: isinstance(a, str))]
+    index = PatternIndex.build(df["answer"])
+    rng = np.random.default_rng(seed)
+    rows = df.iloc[rng.permutation(len(df))]
+
+    tasks = []
+    for clue, answer in zip(rows["clue"], rows["answer"].str.upper()):
+        pool = [word for word in index.match("?" * len(answer)) if word != answer]
+        if not pool:
+            continue
+        words = list(rng.choice(pool, size=min(distractors, len(pool)), replace=False)) + [answer]
+        rng.shuffle(words)
+        tasks.append((clue, [str(w) for w in words], words.index(answer)))
+        if len(tasks) == clues:
+            break
+    return tasks
+
+
+def run_variant(model, tasks, workers: int, max_batch: int, max_delay: float) -> dict:
+    with RankingEngine(model, max_batch=max_batch, max_delay=max_delay, workers=workers) as engine:
+        # Warm-up so lazy initialization does not land in the timing
+        engine.submit(tasks[0][0], tasks[0][1]).result()
+        started = time.perf_counter()
+        futures = [engine.submit(clue, words) for clue, words, _ in tasks]
+        scores = [future.result() for future in futures]
+        elapsed = time.perf_counter() - started
+        batches = engine.stats["batches"] - 1
+
+    pairs = sum(len(words) for _, words, _ in tasks)
+    # Ties count against the true answer, so a constant scorer does not rank it first
+    ranks = np.array([int((s >= s[truth]).sum()) - 1 for s, (_, _, truth) in zip(scores, tasks)])
+    return {
+        "pairs": pairs,
+        "elapsed_s": elapsed,
+        "pairs_per_s": pairs / elapsed,
+        "mean_batch": pairs / batches if batches else 0.0,
+        "top1": float((ranks == 0).mean()),
+        "mrr": float((1.0 / (ranks + 1)).mean()),
+        "size_mb": model.size_mb(),
+        "scores": scores,
+    }
+
+
+def _spearman(a, b) -> float:
+    ra, rb = np.argsort(np.argsort(a)), np.argsort(np.argsort(b))
+    if ra.std() == 0 or rb.std() == 0:
+        return 1.0
+    return float(np.corrcoef(ra, rb)[0, 1])
+
+
+def compare(reference: dict, quantized: dict) -> dict:
+    pairs = list(zip(reference["scores"], quantized["scores"]))
+    return {
+        "top1_agreement": float(np.mean([a.argmax() == b.argmax() for a, b in pairs])),
+        "mean_spearman": float(np.mean([_spearman(a, b) for a, b in pairs])),
+        "max_abs_diff": float(max(np.abs(a - b).max() for a, b in pairs)),
+        "speedup": quantized["pairs_per_s"] / reference["pairs_per_s"],
+        "size_ratio": quantized["size_mb"] / reference["size_mb"],
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare the float and int8 clue-answer ranker on CPU.")
+    parser.add_argument("--archive", default=ARCHIVE, help="clue archive (default: bundled all_puzzles.csv)")
+    parser.add_argument("--model", required=True,
+                        help="clue-answer cross-encoder: Hugging Face model id or checkpoint directory")
+    parser.add_argument("--clues", type=int, default=500, help="clues sampled (default: %(default)s)")
+    parser.add_argument("--distractors", type=int, default=49, help="wrong candidates per clue (default: %(default)s)")
+    parser.add_argument("-j", "--workers", type=int, default=2, help="RankingEngine scoring threads")
+    parser.add_argument("--threads", type=int, default=None,
+                        help="torch threads (default: CPU count // workers)")
+    parser.add_argument("--max-batch", type=int, default=256, help="pairs per model call")
+    parser.add_argument("--max-delay", type=float, default=0.005, help="seconds a batch waits to fill")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    tasks = build_tasks(args.archive, args.clues, args.distractors, args.seed)
+    if not tasks:
+        raise ValueError(f"No clues with answers found in {args.archive}")
+    threads = args.threads or max(1, (os.cpu_count() or 1) // args.workers)
+
+    results = {}
+    for name, quantize in VARIANTS.items():
+        model = PairModel.load(args.model, quantize=quantize, threads=threads)
+        results[name] = run_variant(model, tasks, args.workers, args.max_batch, args.max_delay)
+    comparison = compare(results["float32"], results["int8"])
+
+    print(f"{len(tasks)} clues x {args.distractors + 1} candidates, {args.workers} workers x {threads} threads")
+    print(f"{'variant':<10}{'pairs/s':>10}{'mean batch':>12}{'top-1':>8}{'MRR':>8}{'MB':>8}")
+    for name, r in results.items():
+        print(f"{name:<10}{r['pairs_per_s']:>10.0f}{r['mean_batch']:>12.1f}{r['top1']:>8.3f}{r['mrr']:>8.3f}"
+              f"{r['size_mb']:>8.1f}")
+    print(f"int8 vs float32: {comparison['speedup']:.2f}x pairs/s, {comparison['size_ratio']:.2f}x size, "
+          f"top-1 agreement {comparison['top1_agreement']:.3f}, mean Spearman {comparison['mean_spearman']:.3f}, "
+          f"max |score diff| {comparison['max_abs_diff']:.3f}")
+
+    if args.output:
+        import torch
+
+        for r in results.values():
+            del r["scores"]
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "meta": {
+                    "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "torch": torch.__version__,
+                    "model": args.model,
+                    "clues": len(tasks),
+                    "candidates": args.distractors + 1,
+                    "workers": args.workers,
+                    "threads": threads,
+                },
+                "variants": results,
+                "comparison": comparison,
+            }, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+Load test for the local solve service (solver/service.py).
+
+    python scripts/load_test.py --index answers.xwi -c 16 -n 400
+    python scripts/load_test.py --url http://127.0.0.1:8765 -c 32 -n 2000 -o load.json
+
+With --index a service is started on a free loopback port for the run;
+otherwise --url must point at a running one. Puzzles from the corpus are
+posted round-robin over keep-alive connections, so after the first pass the
+service's result cache answers repeats. Reports requests per second, the
+rate of successful (200) replies on its own since a saturated service
+answers 503 fast, and latency percentiles per status code. With --retry a
+503 is re-posted after its Retry-After delay instead of being counted.
+"""
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import argparse
+import subprocess
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import numpy as np
+
+from utils.puzzle_io import list_puzzle_files
+
+CORPUS_DIR = os.path.join(ROOT, "data", "puzzle_samples", "processed_puzzle_samples")
+PERCENTILES = [50, 90, 99]
+
+
+async def _post(reader, writer, host, path, body):
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: text/csv\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode("latin-1") + body
+    )
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    headers = {}
+    while (line := await reader.readline()) not in (b"\r\n", b""):
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    reply = json.loads(await reader.readexactly(int(headers.get("content-length", 0))))
+    return status, headers, reply
+
+
+async def _client(url, payloads, counter, total, samples, retry, retries):
+    parts = urlsplit(url)
+    reader, writer = await asyncio.open_connection(parts.hostname, parts.port)
+    try:
+        while counter[0] < total:
+            i = counter[0]
+            counter[0] += 1
+            started = time.perf_counter()
+            while True:
+                status, headers, reply = await _post(reader, writer, parts.hostname, "/solve",
+                                                     payloads[i % len(payloads)])
+                if status != 503 or not retry:
+                    break
+                retries[0] += 1
+                await asyncio.sleep(float(headers.get("retry-after", 1)))
+            samples.append((status, time.perf_counter() - started, bool(reply.get("cached"))))
+    finally:
+        writer.close()
+
+
+async def run_load(url, payloads, concurrency: int = 16, requests: int = 400, retry: bool = False) -> dict:
+    """
+    Post `requests` puzzles over `concurrency` connections.
+
+    With retry, a 503 is re-posted after its Retry-After delay and the
+    request's latency includes the wait.
+    """
+    samples, counter, retries = [], [0], [0]
+    started = time.perf_counter()
+    await asyncio.gather(*(_client(url, payloads, counter, requests, samples, retry, retries)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    ok = sum(status == 200 for status, _, _ in samples)
+    result = {"requests": len(samples), "concurrency": concurrency, "elapsed_s": elapsed,
+              "rps": len(samples) / elapsed if elapsed else 0.0,
+              "ok": ok, "ok_rps": ok / elapsed if elapsed else 0.0,
+              "retries": retries[0], "by_status": {}}
+    for status in sorted({s for s, _, _ in samples}):
+        ms = np.array([t for s, t, _ in samples if s == status]) * 1000
+        stats = {f"p{p}_ms": float(np.percentile(ms, p)) for p in PERCENTILES}
+        stats.update(count=len(ms), mean_ms=float(ms.mean()))
+        result["by_status"][str(status)] = stats
+    result["cached"] = sum(cached for _, _, cached in samples)
+    return result
+
+
+def _start_service(args):
+    cmd = [sys.executable, "-m", "solver.service", "--index", args.index, "--port", "0"]
+    if args.workers:
+        cmd += ["--workers", str(args.workers)]
+    if args.time_limit is not None:
+        cmd += ["--time-limit", str(args.time_limit)]
+    # Own process group, so the service and its pool workers can be stopped together
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=subprocess.PIPE, text=True, start_new_session=True)
+    line = proc.stdout.readline()
+    if not line.startswith("Serving on "):
+        proc.kill()
+        raise RuntimeError("Solve service did not start.")
+    return proc, line.split()[-1]
+
+
+def _stop_service(proc, timeout: float = 30.0):
+    """SIGTERM lets the service shut its pool down; the whole group is killed if it takes too long."""
+    proc.terminate()
+    try:
+        proc.wait(timeout)
+    except subprocess.TimeoutExpired:
+        if hasattr(os, "killpg"):
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+        proc.wait()
+    proc.stdout.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure throughput and latency of the solve service.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765", help="running service (default: %(default)s)")
+    parser.add_argument("--index", help="start a service with this PatternIndex instead of using --url")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="solve processes of a started service")
+    parser.add_argument("--time-limit", type=float, default=None, help="per-puzzle budget of a started service")
+    parser.add_argument("--corpus", default=CORPUS_DIR, help="directory of puzzle CSVs to post")
+    parser.add_argument("-c", "--concurrency", type=int, default=16, help="parallel connections")
+    parser.add_argument("-n", "--requests", type=int, default=400, help="total requests")
+    parser.add_argument("--retry", action="store_true", help="re-post 503 replies after their Retry-After delay")
+    parser.add_argument("-o", "--output", help="write results as JSON")
+    args = parser.parse_args(argv)
+
+    payloads = []
+    for path in list_puzzle_files(args.corpus):
+        with open(path, "rb") as f:
+            payloads.append(f.read())
+    if not payloads:
+        raise ValueError(f"No puzzle CSVs found in {args.corpus}")
+
+    proc, url = None, args.url
+    if args.index:
+        proc, url = _start_service(args)
+    try:
+        result = asyncio.run(run_load(url, payloads, args.concurrency, args.requests, args.retry))
+    finally:
+        if proc is not None:
+            _stop_service(proc)
+
+    print(f"{result['requests']} requests in {result['elapsed_s']:.2f}s: {result['rps']:.1f} req/s, "
+          f"{result['ok']} solved at {result['ok_rps']:.1f} req/s "
+          f"({result['cached']} answered from the result cache, {result['retries']} 503 retries)")
+    print(f"{'status':<8}{'count':>8}" + "".join(f"{f'p{p} ms':>11}" for p in PERCENTILES) + f"{'mean ms':>11}")
+    for status, s in result["by_status"].items():
+        print(f"{status:<8}{s['count']:>8}" + "".join(f"{s[f'p{p}_ms']:>11.1f}" for p in PERCENTILES)
+              + f"{s['mean_ms']:>11.1f}")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
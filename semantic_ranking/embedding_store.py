@@ -0,0 +1,191 @@
+import os
+import json
+import hashlib
+import unicodedata
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils import instrumentation
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+DEFAULT_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+META_FILENAME = "meta.json"
+VECTORS_FILENAME = "vectors.f16"
+KEYS_FILENAME = "keys.u64"
+LOCK_FILENAME = "write.lock"
+
+
+def normalize_text(text: str) -> str:
+    """Canonical form used for keys: NFKC, case-folded, whitespace collapsed."""
+    return " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+
+
+def text_key(text: str) -> int:
+    """64-bit key of a text's normalized form."""
+    digest = hashlib.blake2b(normalize_text(text).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+@contextmanager
+def _file_lock(path):
+    """Exclusive inter-process lock held for the duration of the block."""
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class EmbeddingStore:
+    """
+    Persistent text -> embedding cache for clues and answers.
+
+    Vectors are appended to a float16 matrix file and their keys to a
+    parallel uint64 file; meta.json records how many rows are committed.
+    Rows are written and flushed before the count is published, and never
+    rewritten afterwards, so readers in other processes can memory-map the
+    committed prefix without locking. Writers serialize on a lock file.
+    """
+
+    def __init__(self, directory, encoder=None, model_name: str = DEFAULT_MODEL, batch_size: int = 256):
+        """
+        Args:
+            directory (str): Store location; created if missing
+            encoder (callable): texts -> (n, dim) array. Defaults to a
+                SentenceTransformer for model_name, loaded on the first miss.
+            model_name (str): Model the vectors come from; a store refuses to
+                open with a different one
+            batch_size (int): Texts per encoder call when filling misses
+        """
+        self.directory = directory
+        self.model_name = model_name
+        self.batch_size = batch_size
+        self._encoder = encoder
+        os.makedirs(directory, exist_ok=True)
+
+        self.dim = None
+        self.count = 0
+        self.vectors = np.zeros((0, 0), dtype=np.float16)
+        self.rows = {}  # key -> row
+        self.stats = {"hits": 0, "misses": 0, "encoded_batches": 0}
+
+        meta = self._read_meta()
+        if meta is not None and meta["model"] != model_name:
+            raise ValueError(f"Store at {directory} holds '{meta['model']}' embeddings, not '{model_name}'.")
+        self.refresh()
+
+    def _path(self, name):
+        return os.path.join(self.directory, name)
+
+    def _read_meta(self):
+        try:
+            with open(self._path(META_FILENAME), encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _write_meta(self, count):
+        tmp = self._path(f"{META_FILENAME}.tmp{os.getpid()}")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model_name, "dim": self.dim, "count": count}, f)
+        os.replace(tmp, self._path(META_FILENAME))
+
+    def refresh(self):
+        """Pick up rows committed by other processes since the last refresh."""
+        meta = self._read_meta()
+        if meta is None or meta["count"] == self.count:
+            return
+        self.dim, count = meta["dim"], meta["count"]
+        self.vectors = np.memmap(self._path(VECTORS_FILENAME), dtype=np.float16, mode="r", shape=(count, self.dim))
+        keys = np.memmap(self._path(KEYS_FILENAME), dtype=np.uint64, mode="r", shape=(count,))
+        self.rows.update(zip(keys[self.count:].tolist(), range(self.count, count)))
+        self.count = count
+
+    # ------------------------
+    # Encoding
+    # ------------------------
+    @property
+    def encoder(self):
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+
+            model = SentenceTransformer(self.model_name)
+            self._encoder = lambda texts: model.encode(texts, batch_size=self.batch_size, convert_to_numpy=True)
+        return self._encoder
+
+    def _append(self, keys, texts):
+        """Encode texts in batches and commit them; keys another writer added meanwhile are skipped."""
+        with _file_lock(self._path(LOCK_FILENAME)):
+            self.refresh()
+            todo = [(k, t) for k, t in zip(keys, texts) if k not in self.rows]
+            for start in range(0, len(todo), self.batch_size):
+                batch = todo[start:start + self.batch_size]
+                with instrumentation.span("ranking.encode", texts=len(batch)):
+                    vectors = np.asarray(self.encoder([t for _, t in batch]), dtype=np.float16)
+                self.stats["encoded_batches"] += 1
+                if self.dim is None:
+                    self.dim = vectors.shape[1]
+                elif vectors.shape[1] != self.dim:
+                    raise ValueError(f"Encoder returned dimension {vectors.shape[1]}, store has {self.dim}.")
+                with open(self._path(VECTORS_FILENAME), "ab") as f:
+                    f.truncate(self.count * self.dim * 2)
+                    f.write(np.ascontiguousarray(vectors).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                with open(self._path(KEYS_FILENAME), "ab") as f:
+                    f.truncate(self.count * 8)
+                    f.write(np.array([k for k, _ in batch], dtype=np.uint64).tobytes())
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._write_meta(self.count + len(batch))
+                self.refresh()
+
+    def embed(self, texts) -> np.ndarray:
+        """
+        Return float16 embeddings for texts, encoding only texts not yet stored.
+
+        Texts with the same normalized form share one row, so repeats within
+        the call and across runs are encoded once.
+        """
+        texts = list(texts)
+        keys = [text_key(t) for t in texts]
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in self.rows and key not in missing:
+                missing[key] = text
+        self.stats["misses"] += len(missing)
+        self.stats["hits"] += len(texts) - len(missing)
+        instrumentation.count("embed.cache_misses", len(missing))
+        instrumentation.count("embed.cache_hits", len(texts) - len(missing))
+        if missing:
+            self._append(list(missing), list(missing.values()))
+        if not texts:
+            return np.zeros((0, self.dim or 0), dtype=np.float16)
+        return np.asarray(self.vectors[[self.rows[k] for k in keys]])
+
+    def get(self, text: str):
+        """Stored embedding for a text, or None without encoding it."""
+        row = self.rows.get(text_key(text))
+        return None if row is None else np.asarray(self.vectors[row])
+
+    def __contains__(self, text):
+        return text_key(text) in self.rows
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,273 @@
+import io
+import time
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from utils import instrumentation
+from utils.fingerprint import source_fingerprint
+
+# Placeholder so PairModel.load() works out of the box: an MS MARCO passage
+# ranker, not trained on clues. Pass a clue-answer checkpoint for real use.
+DEFAULT_PAIR_MODEL = "cross-encoder/ms-marco-MiniLM-L-6-v2"
+
+
+class PairModel:
+    """
+    Cross-encoder scoring (clue, answer) pairs on CPU.
+
+    Wraps a transformers sequence-classification checkpoint, such as a
+    fine-tuned BERT clue-answer model. With quantize=True every nn.Linear is
+    replaced by its int8 dynamically quantized version: weights are stored as
+    int8 and activations quantized per batch, which is where a BERT-style
+    encoder spends nearly all of its CPU time. torch and transformers are
+    imported on load, not with this module.
+    """
+
+    def __init__(self, tokenizer, model, max_length: int = 32, quantized: bool = False):
+        self.tokenizer = tokenizer
+        self.model = model
+        self.name_or_path = f"{getattr(model, 'name_or_path', type(model).__name__)}{':int8' if quantized else ''}"
+        self.max_length = max_length
+        self.quantized = quantized
+
+    @classmethod
+    def load(cls, model_name: str = DEFAULT_PAIR_MODEL, quantize: bool = True, threads: int = None,
+             max_length: int = 32) -> "PairModel":
+        """
+        Args:
+            model_name (str): Hugging Face model id or local checkpoint directory
+            quantize (bool): Apply int8 dynamic quantization to the Linear layers
+            threads (int): torch intra-op threads (process-wide); with a
+                RankingEngine, about os.cpu_count() // workers avoids oversubscription
+            max_length (int): Token limit per pair; clues and answers are short
+        """
+        import torch
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+        if threads is not None:
+            torch.set_num_threads(threads)
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        model = AutoModelForSequenceClassification.from_pretrained(model_name).eval()
+        if quantize:
+            model = torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        return cls(tokenizer, model, max_length=max_length, quantized=quantize)
+
+    def __call__(self, pairs) -> np.ndarray:
+        """Relevance score per (clue, answer) pair; higher is better."""
+        import torch
+
+        clues = [clue for clue, _ in pairs]
+        answers = [answer.lower() for _, answer in pairs]
+        encoded = self.tokenizer(clues, answers, padding=True, truncation=True, max_length=self.max_length,
+                                 return_tensors="pt")
+        with torch.inference_mode():
+            logits = self.model(**encoded).logits
+        if logits.shape[-1] == 1:
+            scores = logits[:, 0]
+        else:
+            # Log-probability of the last ("matches") class
+            scores = torch.log_softmax(logits, dim=-1)[:, -1]
+        return scores.float().numpy()
+
+    def size_mb(self) -> float:
+        """Serialized size of the weights, the figure quantization shrinks."""
+        import torch
+
+        buffer = io.BytesIO()
+        torch.save(self.model.state_dict(), buffer)
+        return buffer.tell() / 2 ** 20
+
+
+class _Request:
+    __slots__ = ("future", "scores", "remaining")
+
+    def __init__(self, n):
+        self.future = Future()
+        self.scores = np.empty(n, dtype=np.float32)
+        self.remaining = n
+
+
+class RankingEngine:
+    """
+    Micro-batching scheduler in front of a pair scorer.
+
+    Requests (one clue and its candidate answers) from any number of threads,
+    slots and puzzles are queued as pairs. A scheduler thread cuts the queue
+    into batches of up to max_batch pairs, waiting at most max_delay after
+    the oldest pair arrived for a batch to fill, and runs them on a pool of
+    `workers` threads. No more than `workers` batches are in flight, so
+    while every worker is busy the queue keeps growing and the next batch is
+    bigger: under load batches fill up, and when idle a lone request waits
+    only max_delay. Submitters block once max_pending pairs are queued.
+
+        with RankingEngine(PairModel.load()) as engine:
+            scores = engine.submit("Capital of Italy", ["ROME", "OSLO"]).result()
+    """
+
+    def __init__(self, scorer, max_batch: int = 256, max_delay: float = 0.005, workers: int = 2,
+                 max_pending: int = 65536):
+        """
+        Args:
+            scorer (callable): list of (clue, answer) pairs -> array of scores,
+                e.g. a PairModel; called from several threads at once
+            max_batch (int): Pairs per scorer call at most
+            max_delay (float): Seconds the oldest queued pair waits for a batch to fill
+            workers (int): Scoring threads, and so batches in flight
+            max_pending (int): Queued pairs beyond which submit() blocks
+        """
+        self.scorer = scorer
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.workers = workers
+        self.max_pending = max_pending
+        self.stats = {"requests": 0, "batches": 0, "pairs": 0, "scoring_s": 0.0}
+
+        self._queue = deque()   # (request, pairs, offset, arrival time)
+        self._waiting = 0
+        self._closed = False
+        self._cond = threading.Condition()
+        self._results = threading.Lock()
+        self._slots = threading.BoundedSemaphore(workers)
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="ranker")
+        self._scheduler = threading.Thread(target=self._schedule, name="ranker-scheduler", daemon=True)
+        self._scheduler.start()
+
+    # ------------------------
+    # Submission
+    # ------------------------
+    def submit(self, clue: str, answers) -> Future:
+        """Queue one clue's candidates; the future resolves to their scores, in order."""
+        pairs = [(clue, answer) for answer in answers]
+        request = _Request(len(pairs))
+        if not pairs:
+            request.future.set_result(request.scores)
+            return request.future
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("RankingEngine is closed.")
+            while self._waiting and self._waiting + len(pairs) > self.max_pending:
+                self._cond.wait()
+            self._queue.append((request, pairs, 0, time.perf_counter()))
+            self._waiting += len(pairs)
+            self.stats["requests"] += 1
+            self._cond.notify_all()
+        return request.future
+
+    def rank(self, clues, candidates) -> list:
+        """
+        Order every clue's candidate list by descending score.
+
+        Args:
+            clues (list[str]): Clue texts
+            candidates (list[list[str]]): Candidate answers per clue
+
+        Returns:
+            list[list[str]]: Candidates re-ordered, best first; ties keep their order
+        """
+        futures = [self.submit(clue if isinstance(clue, str) else "", words)
+                   for clue, words in zip(clues, candidates)]
+        ranked = []
+        for words, future in zip(candidates, futures):
+            order = np.argsort(-future.result(), kind="stable")
+            ranked.append([words[i] for i in order.tolist()])
+        return ranked
+
+    def candidates(self, crossword, candidates: dict) -> dict:
+        """Re-rank per-slot candidate lists (clue ID -> words) by each slot's clue."""
+        clue_ids = list(candidates)
+        clues = [crossword.get_clue(clue_id) for clue_id in clue_ids]
+        return dict(zip(clue_ids, self.rank(clues, [candidates[clue_id] for clue_id in clue_ids])))
+
+    # ------------------------
+    # Scheduling
+    # ------------------------
+    def _schedule(self):
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+            # Wait for a free worker before cutting the batch, so it grows meanwhile
+            self._slots.acquire()
+            with self._cond:
+                deadline = self._queue[0][3] + self.max_delay
+                while self._waiting < self.max_batch and not self._closed:
+                    remaining = deadline - time.perf_counter()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+                batch = self._take()
+                self._cond.notify_all()
+            self._executor.submit(self._run, batch)
+
+    def _take(self) -> list:
+        """Pop up to max_batch pairs off the queue, splitting a request that does not fit."""
+        batch, size = [], 0
+        while self._queue and size < self.max_batch:
+            request, pairs, offset, arrived = self._queue.popleft()
+            room = self.max_batch - size
+            if len(pairs) - offset > room:
+                self._queue.appendleft((request, pairs, offset + room, arrived))
+                batch.append((request, pairs, offset, offset + room))
+                size += room
+            else:
+                batch.append((request, pairs, offset, len(pairs)))
+                size += len(pairs) - offset
+        self._waiting -= size
+        return batch
+
+    def _run(self, batch):
+        try:
+            pairs = [pair for _, chunk, start, stop in batch for pair in chunk[start:stop]]
+            started = time.perf_counter()
+            with instrumentation.span("ranking.pairs", pairs=len(pairs)):
+                scores = np.asarray(self.scorer(pairs), dtype=np.float32)
+            elapsed = time.perf_counter() - started
+            position = 0
+            with self._results:
+                self.stats["batches"] += 1
+                self.stats["pairs"] += len(pairs)
+                self.stats["scoring_s"] += elapsed
+                for request, _, start, stop in batch:
+                    request.scores[start:stop] = scores[position:position + stop - start]
+                    position += stop - start
+                    request.remaining -= stop - start
+                    if request.remaining == 0 and not request.future.done():
+                        request.future.set_result(request.scores)
+        except Exception as e:
+            for request, _, _, _ in batch:
+                if not request.future.done():
+                    request.future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    # ------------------------
+    # Lifecycle
+    # ------------------------
+    def close(self):
+        """Score what is still queued, then stop the scheduler and the worker pool."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._scheduler.join()
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ranking_source(engine: RankingEngine, source):
+    """Candidate source re-ranking another source's candidates with a RankingEngine (see CandidateCache)."""
+    def generate(clues, patterns):
+        return engine.rank(clues, source(clues, patterns))
+    scorer = getattr(engine.scorer, "name_or_path", type(engine.scorer).__name__)
+    generate.uses_clue = True
+    generate.fingerprint = f"ranked:{scorer}:{source_fingerprint(source)}"
+    return generate
@@ -0,0 +1,271 @@
+import os
+import sys
+import csv
+import time
+import argparse
+from itertools import islice
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from grid.grid_builder import CrosswordGrid
+from utils import instrumentation
+from utils.puzzle_io import iter_archive, list_puzzle_files, load_clue_df, puzzle_name_from_path
+
+MODES = ("validate", "solve")
+
+RESULT_FIELDS = [
+    "puzzle_name", "status", "rows", "cols", "slots", "elapsed",
+    "fill_pct", "letter_accuracy", "conflicts", "strategy", "error",
+]
+
+# Per-process state, set once by _init_worker
+_worker = {}
+
+
+def iter_tasks(source, chunksize: int = 10000):
+    """
+    Yield (puzzle_name, payload) pairs for a batch run.
+
+    For a directory the payload is the CSV path, so workers read their own
+    puzzle; for a combined archive it is the clue_df streamed out of it.
+    """
+    if os.path.isdir(source):
+        for path in list_puzzle_files(source):
+            yield puzzle_name_from_path(path), path
+    else:
+        yield from iter_archive(source, chunksize=chunksize)
+
+
+def solution_grid(crossword) -> np.ndarray:
+    """Grid of expected letters built from the answer column ("" where unknown)."""
+    expected = np.full(crossword.height * crossword.width, "", dtype=crossword.grid.dtype)
+    for sid, answer in enumerate(crossword.slot_answers):
+        cells = crossword.slot_cells[sid]
+        if isinstance(answer, str) and len(answer) == len(cells):
+            expected[cells] = list(answer.upper())
+    return expected.reshape(crossword.grid.shape)
+
+
+def letter_accuracy(crossword, expected) -> float:
+    """Returns % of cells with a known answer letter that hold that letter."""
+    known = expected != ""
+    total = int(known.sum())
+    correct = int((known & (crossword.grid == expected)).sum())
+    return (correct / total * 100) if total else 0
+
+
+def _validate(crossword) -> int:
+    """Place every known answer; returns the number of rejected placements."""
+    conflicts = 0
+    for clue_id, answer in zip(crossword.slot_names, crossword.slot_answers):
+        if not isinstance(answer, str):
+            continue
+        try:
+            crossword.place_word(clue_id, answer)
+        except ValueError:
+            conflicts += 1
+    return conflicts
+
+
+def _solve(crossword):
+    """Fill the grid from the worker's pattern index and return the FillResult."""
+    from solver.fill_engine import FillEngine
+
+    source = _worker.get("cache") or _worker["index"]
+    candidates = source.candidates(crossword, limit=_worker["limit"])
+    budget = dict(max_nodes=_worker["max_nodes"], time_limit=_worker["time_limit"])
+    if _worker.get("portfolio"):
+        from solver.portfolio import solve_portfolio
+        result = solve_portfolio(crossword, candidates, _worker["portfolio"], **budget)
+    else:
+        result = FillEngine(crossword, candidates, **budget).solve()
+    for clue_id, word in result.assignment.items():
+        crossword.place_word(clue_id, word)
+    return result
+
+
+def run_puzzle(name, payload, mode: str = "validate") -> dict:
+    """Build a CrosswordGrid for one puzzle, validate or solve it and score the result."""
+    row = dict.fromkeys(RESULT_FIELDS, "")
+    row["puzzle_name"] = name
+    started = time.perf_counter()
+    try:
+        clue_df = load_clue_df(payload) if isinstance(payload, str) else payload
+        crossword = CrosswordGrid(clue_df)
+        row.update(rows=crossword.height, cols=crossword.width, slots=len(crossword.slot_names))
+        expected = solution_grid(crossword)
+        if mode == "solve":
+            result = _solve(crossword)
+            row["conflicts"] = len(result.conflicts)
+            row["strategy"] = result.stats.get("strategy", "")
+        else:
+            row["conflicts"] = _validate(crossword)
+        row["fill_pct"] = round(float(crossword.calculate_completion_percentage_by_char()), 2)
+        row["letter_accuracy"] = round(float(letter_accuracy(crossword, expected)), 2)
+        row["status"] = "ok"
+    except Exception as e:
+        row["status"] = "error"
+        row["error"] = f"{type(e).__name__}: {e}"
+    row["elapsed"] = round(time.perf_counter() - started, 4)
+    return row
+
+
+def _traced_puzzle(name, payload, mode, trace_dir) -> dict:
+    """run_puzzle() with instrumentation on, writing <trace_dir>/<name>.json."""
+    instrumentation.reset()
+    instrumentation.set_puzzle(name)
+    with instrumentation.span("puzzle", mode=mode):
+        row = run_puzzle(name, payload, mode)
+    instrumentation.export_chrome_trace(os.path.join(trace_dir, f"{name}.json"))
+    return row
+
+
+def _init_worker(mode, index_path, limit, max_nodes, time_limit, trace_dir=None, cache_path=None, portfolio=None):
+    _worker.update(mode=mode, limit=limit, max_nodes=max_nodes, time_limit=time_limit, trace_dir=trace_dir,
+                   portfolio=portfolio)
+    if trace_dir is not None:
+        instrumentation.enable()
+    if mode == "solve":
+        from answer_generation.pattern_index import PatternIndex
+        # Memory-mapped, so every worker shares the same pages
+        _worker["index"] = PatternIndex.load(index_path)
+        if cache_path is not None:
+            from answer_generation.candidate_cache import CandidateCache, pattern_source
+            _worker["cache"] = CandidateCache(pattern_source(_worker["index"], limit), path=cache_path)
+
+
+def _run_chunk(tasks) -> list:
+    if _worker["trace_dir"] is not None:
+        return [_traced_puzzle(name, payload, _worker["mode"], _worker["trace_dir"]) for name, payload in tasks]
+    return [run_puzzle(name, payload, _worker["mode"]) for name, payload in tasks]
+
+
+def _chunks(iterable, size):
+    it = iter(iterable)
+    while chunk := list(islice(it, size)):
+        yield chunk
+
+
+def run_batch(source, output, mode: str = "validate", workers: int = None, chunksize: int = 4,
+              index_path=None, limit: int = None, max_nodes: int = None, time_limit: float = None,
+              read_chunksize: int = 10000, progress: bool = False, trace_dir=None, cache_path=None,
+              portfolio=None) -> int:
+    """
+    Validate or solve every puzzle of an archive on a process pool.
+
+    Puzzles are streamed from the source and dispatched in chunks of
+    `chunksize`; at most two chunks per worker are in flight, so memory stays
+    flat however large the archive is. Result rows are appended to the output
+    CSV as soon as their chunk finishes, so they are not in input order.
+
+    Args:
+        source (str): all_puzzles.csv-style archive or a directory of per-puzzle CSVs
+        output (str): Path of the results CSV
+        mode (str): "validate" places the known answers; "solve" fills from a pattern index
+        workers (int): Process count (defaults to os.cpu_count())
+        chunksize (int): Puzzles per task sent to a worker
+        index_path (str): PatternIndex file, required for mode="solve"
+        limit (int): Candidates per slot taken from the index
+        max_nodes (int): FillEngine node budget per puzzle
+        time_limit (float): FillEngine time budget per puzzle in seconds
+        read_chunksize (int): Rows per read when streaming an archive CSV
+        progress (bool): Show a tqdm progress bar
+        trace_dir (str): If set, instrument every puzzle and write its Chrome
+            trace (with a timer/counter summary) to <trace_dir>/<puzzle>.json
+        cache_path (str): Shared CandidateCache file put in front of the index
+            in mode="solve"; see answer_generation.candidate_cache
+        portfolio (list[str]): Strategy names from solver.portfolio.STRATEGIES
+            to race per puzzle in mode="solve", one process each; the
+            "strategy" column records the winner. Each puzzle then occupies
+            len(portfolio) processes, so lower `workers` to match.
+
+    Returns:
+        int: Number of puzzles processed
+    """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}', expected one of {MODES}.")
+    if mode == "solve" and index_path is None:
+        raise ValueError("mode='solve' needs a pattern index file (index_path).")
+    workers = workers or os.cpu_count() or 1
+    if trace_dir is not None:
+        os.makedirs(trace_dir, exist_ok=True)
+
+    bar = None
+    if progress:
+        from tqdm import tqdm
+        bar = tqdm(unit="puzzle")
+
+    # Workers parse CSVs with pandas; importing it before the pool starts lets
+    # fork-started workers inherit it instead of each importing it again
+    import pandas  # noqa: F401
+
+    done = 0
+    chunks = _chunks(iter_tasks(source, read_chunksize), chunksize)
+    init_args = (mode, index_path, limit, max_nodes, time_limit, trace_dir, cache_path, portfolio)
+    with open(output, "w", newline="") as f, \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=init_args) as pool:
+        writer = csv.DictWriter(f, fieldnames=RESULT_FIELDS)
+        writer.writeheader()
+        pending = set()
+        for chunk in chunks:
+            pending.add(pool.submit(_run_chunk, chunk))
+            if len(pending) < 2 * workers:
+                continue
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            done += _write_rows(writer, f, finished, bar)
+        done += _write_rows(writer, f, pending, bar)
+
+    if bar is not None:
+        bar.close()
+    return done
+
+
+def _write_rows(writer, f, futures, bar) -> int:
+    count = 0
+    for future in futures:
+        rows = future.result()
+        writer.writerows(rows)
+        count += len(rows)
+    f.flush()
+    if bar is not None:
+        bar.update(count)
+    return count
+
+
+def build_parser(parser=None) -> argparse.ArgumentParser:
+    parser = parser or argparse.ArgumentParser(description="Validate or solve every puzzle in an archive.")
+    parser.add_argument("source", help="all_puzzles.csv archive or a directory of per-puzzle CSVs")
+    parser.add_argument("-o", "--output", default="batch_results.csv", help="results CSV (default: %(default)s)")
+    parser.add_argument("--mode", choices=MODES, default="validate")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes (default: CPU count)")
+    parser.add_argument("--chunksize", type=int, default=4, help="puzzles per worker task")
+    parser.add_argument("--read-chunksize", type=int, default=10000, help="CSV rows per archive read")
+    parser.add_argument("--index", dest="index_path", help="PatternIndex file for --mode solve")
+    parser.add_argument("--limit", type=int, default=None, help="candidates per slot")
+    parser.add_argument("--max-nodes", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=None, help="seconds per puzzle")
+    parser.add_argument("--progress", action="store_true", help="show a progress bar")
+    parser.add_argument("--portfolio", nargs="?", const="mrv,degree,confidence,long",
+                        help="race comma-separated fill strategies per puzzle in --mode solve "
+                             "(default when given without a value: %(const)s)")
+    parser.add_argument("--candidate-cache", dest="cache_path",
+                        help="shared candidate cache (SQLite) used by every worker in --mode solve")
+    parser.add_argument("--trace-dir", help="write a per-puzzle Chrome trace JSON into this directory")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    started = time.perf_counter()
+    count = run_batch(
+        args.source, args.output, mode=args.mode, workers=args.workers, chunksize=args.chunksize,
+        index_path=args.index_path, limit=args.limit, max_nodes=args.max_nodes, time_limit=args.time_limit,
+        read_chunksize=args.read_chunksize, progress=args.progress, trace_dir=args.trace_dir,
+        cache_path=args.cache_path, portfolio=args.portfolio.split(",") if args.portfolio else None,
+    )
+    print(f"{count} puzzles in {time.perf_counter() - started:.1f}s -> {args.output}")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,48 @@
+import queue
+from dataclasses import dataclass
+
+HIGHLIGHT = "highlight"
+PLACE = "place"
+DONE = "done"
+
+
+@dataclass
+class SolveEvent:
+    """One step published by a solver for a consumer such as the GUI to replay."""
+    kind: str                   # HIGHLIGHT, PLACE or DONE
+    clue_ids: tuple = ()        # clues to highlight (HIGHLIGHT) or the placed clue (PLACE)
+    word: str = None            # placed word (PLACE)
+
+
+class SolveEventQueue:
+    """
+    Thread-safe channel from a solver thread to the GUI.
+
+    The solver only publishes; the consumer owns the grid and applies events
+    on its own thread, so solving never waits on drawing.
+    """
+
+    def __init__(self):
+        self._queue = queue.SimpleQueue()
+
+    def highlight(self, clue_ids):
+        self._queue.put(SolveEvent(HIGHLIGHT, tuple(clue_ids)))
+
+    def place(self, clue_id: str, word: str):
+        self._queue.put(SolveEvent(PLACE, (clue_id,), word))
+
+    def done(self):
+        self._queue.put(SolveEvent(DONE))
+
+    def drain(self, max_events: int = None) -> list:
+        """Pop up to max_events pending events (all of them if None) without blocking."""
+        events = []
+        while max_events is None or len(events) < max_events:
+            try:
+                events.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return events
+
+    def empty(self) -> bool:
+        return self._queue.empty()
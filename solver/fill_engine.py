@@ -0,0 +1,322 @@
+import sys
+import time
+from dataclasses import dataclass, field
+
+import numpy as np
+
+from grid.grid_builder import SLOT_LENGTH
+from utils import instrumentation
+
+
+@dataclass
+class FillResult:
+    """Outcome of a FillEngine.solve() call."""
+    assignment: dict            # clue ID -> placed word
+    complete: bool              # every slot in the grid received a word
+    conflicts: list = field(default_factory=list)  # [(clue ID, crossing clue ID or None, reason)]
+    stats: dict = field(default_factory=dict)
+
+
+class SearchAborted(Exception):
+    """Raised inside the search when a node or time budget runs out or the search is cancelled."""
+
+
+# Variable orderings: which open slot the search branches on next
+SLOT_ORDERS = ("mrv", "degree", "confidence", "long")
+# Value orderings: the order a slot's live candidates are tried in
+VALUE_ORDERS = ("ranked", "shuffled")
+# Revisions between time limit / cancel checks inside propagation; a
+# multiprocessing.Event.is_set() takes a cross-process lock
+INTERRUPT_EVERY = 256
+
+
+class FillEngine:
+    """
+    Constraint-propagation grid filler over per-slot candidate lists.
+
+    Domains are boolean NumPy masks over each slot's candidates. Crossing
+    consistency is enforced with AC-3 and the search is depth-first with full
+    propagation after every assignment. By default it branches on the slot
+    with the fewest live candidates (MRV, ties broken by crossing degree) and
+    tries candidates in the order given, so callers should pass them
+    best-first; slot_order and value_order select the other heuristics.
+    """
+
+    def __init__(self, crossword, candidates: dict, max_nodes: int = None, time_limit: float = None,
+                 slot_order: str = "mrv", value_order: str = "ranked", seed: int = 0, cancel=None):
+        """
+        Args:
+            crossword (CrosswordGrid): Grid to fill; existing letters are respected
+            candidates (dict): Clue ID like "12-Across" -> ranked list of candidate words.
+                Slots without candidates are left open.
+            max_nodes (int): Optional cap on search nodes
+            time_limit (float): Optional wall-clock cap in seconds
+            slot_order (str): Next slot to branch on, one of SLOT_ORDERS:
+                "mrv" fewest live candidates, "degree" most crossings,
+                "confidence" best-ranked live candidate, "long" longest slot;
+                the others break ties by fewest live candidates
+            value_order (str): "ranked" tries candidates in the given order,
+                "shuffled" in a random order drawn from seed
+            seed (int): Seed for value_order="shuffled"
+            cancel: Optional flag with is_set(), such as a multiprocessing.Event;
+                once set, the search stops as if its budget ran out
+        """
+        if slot_order not in SLOT_ORDERS:
+            raise ValueError(f"Unknown slot_order '{slot_order}', expected one of {SLOT_ORDERS}.")
+        if value_order not in VALUE_ORDERS:
+            raise ValueError(f"Unknown value_order '{value_order}', expected one of {VALUE_ORDERS}.")
+        self.crossword = crossword
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.slot_order = slot_order
+        self.value_order = value_order
+        self.cancel = cancel
+        self._rng = np.random.default_rng(seed)
+
+        n = len(crossword.slot_names)
+        lengths = crossword.slot_table[:, SLOT_LENGTH]
+        self.words = [np.array([], dtype=object) for _ in range(n)]
+        self.codes = [np.zeros((0, int(length)), dtype=np.uint8) for length in lengths]
+        self.active = np.zeros(n, dtype=bool)
+
+        for clue_id, words in candidates.items():
+            sid = crossword.get_slot_id(clue_id)
+            length = int(lengths[sid])
+            seen = dict.fromkeys(w.upper() for w in words if len(w) == length)
+            words = [w for w in seen if w.isascii()]
+            if not words:
+                continue
+            self.words[sid] = np.array(words, dtype=object)
+            self.codes[sid] = np.frombuffer("".join(words).encode("ascii"), dtype=np.uint8).reshape(len(words), length)
+            self.active[sid] = True
+
+        # arcs[a] holds (offset in a, crossing slot b, offset in b)
+        self.arcs = [[] for _ in range(n)]
+        for a, b, i, j, _ in crossword.crossing_edges.tolist():
+            self.arcs[a].append((i, b, j))
+            self.arcs[b].append((j, a, i))
+        self.degree = np.array([len(arcs) for arcs in self.arcs], dtype=np.int64)
+        self.lengths = lengths.astype(np.int64)
+
+        self.domains = []
+        self.sizes = np.zeros(n, dtype=np.int64)
+        self.trail = []
+        self.stats = {}
+        # slot id -> candidate index tried first by the search, e.g. a previous solve's choice
+        self.hints = {}
+        self.chosen = {}
+
+    # ------------------------
+    # Domains
+    # ------------------------
+    def _initial_domain(self, sid, flat):
+        """Candidate mask of one slot filtered by the letters already in the grid."""
+        mask = np.ones(len(self.words[sid]), dtype=bool)
+        for offset, letter in enumerate(flat[self.crossword.slot_cells[sid]].tolist()):
+            if letter != " " and letter.isascii():
+                mask &= self.codes[sid][:, offset] == ord(letter)
+        return mask
+
+    def _initial_domains(self):
+        flat = self.crossword.grid.reshape(-1)
+        return [self._initial_domain(sid, flat) for sid in range(len(self.crossword.slot_cells))]
+
+    def _set_domain(self, sid, mask):
+        self.trail.append((sid, self.domains[sid]))
+        self.domains[sid] = mask
+        self.sizes[sid] = int(mask.sum())
+
+    def _undo(self, mark):
+        while len(self.trail) > mark:
+            sid, mask = self.trail.pop()
+            self.domains[sid] = mask
+            self.sizes[sid] = int(mask.sum())
+
+    def _revise(self, a, i, b, j):
+        """Drop candidates of slot a whose letter at offset i has no support in slot b."""
+        self.stats["revisions"] += 1
+        allowed = np.zeros(256, dtype=bool)
+        allowed[self.codes[b][self.domains[b], j]] = True
+        revised = self.domains[a] & allowed[self.codes[a][:, i]]
+        if self.sizes[a] == int(revised.sum()):
+            return False
+        self._set_domain(a, revised)
+        return True
+
+    def _propagate(self, queue):
+        """
+        AC-3 from the given slots outward.
+
+        Returns:
+            tuple | None: (wiped-out slot, crossing slot) on failure, else None
+        """
+        pending = set(queue)
+        queue = list(queue)
+        while queue:
+            if self.stats["revisions"] >= self._next_interrupt:
+                self._check_interrupt()
+            b = queue.pop()
+            pending.discard(b)
+            for j, a, i in self.arcs[b]:
+                if not (self.active[a] and self.active[b]):
+                    continue
+                if self._revise(a, i, b, j):
+                    if self.sizes[a] == 0:
+                        self.stats["wipeouts"] += 1
+                        return a, b
+                    if a not in pending:
+                        pending.add(a)
+                        queue.append(a)
+        return None
+
+    # ------------------------
+    # Search
+    # ------------------------
+    def _select_slot(self):
+        """Open slot to branch on under slot_order; the lowest slot id wins remaining ties."""
+        open_slots = np.flatnonzero(self.active & ~self.assigned)
+        if not len(open_slots):
+            return None
+        sizes, degree = self.sizes[open_slots], self.degree[open_slots]
+        if self.slot_order == "mrv":
+            keys = (-degree, sizes)
+        elif self.slot_order == "degree":
+            keys = (sizes, -degree)
+        elif self.slot_order == "long":
+            keys = (-degree, sizes, -self.lengths[open_slots])
+        else:  # confidence
+            best_rank = np.array([int(np.argmax(self.domains[sid])) for sid in open_slots.tolist()])
+            keys = (-degree, sizes, best_rank)
+        # lexsort is stable and sorts by the last key first
+        return int(open_slots[np.lexsort(keys)[0]])
+
+    def _check_interrupt(self):
+        self._next_interrupt = self.stats["revisions"] + INTERRUPT_EVERY
+        if self.time_limit is not None and time.perf_counter() - self._started > self.time_limit:
+            raise SearchAborted("time limit reached")
+        if self.cancel is not None and self.cancel.is_set():
+            raise SearchAborted("cancelled")
+
+    def _check_budget(self):
+        self.stats["nodes"] += 1
+        if self.max_nodes is not None and self.stats["nodes"] > self.max_nodes:
+            raise SearchAborted("node limit reached")
+        self._check_interrupt()
+
+    def _record_progress(self):
+        filled = int(self.assigned.sum())
+        if filled > self._best_filled:
+            self._best_filled = filled
+            self._best = {
+                sid: int(np.flatnonzero(self.domains[sid])[0]) for sid in np.flatnonzero(self.assigned).tolist()
+            }
+
+    def _search(self):
+        sid = self._select_slot()
+        if sid is None:
+            return True
+        self._check_budget()
+
+        order = np.flatnonzero(self.domains[sid])
+        if self.value_order == "shuffled":
+            order = self._rng.permutation(order)
+        hint = self.hints.get(sid)
+        if hint is not None and self.domains[sid][hint]:
+            order = np.concatenate([[hint], order[order != hint]])
+        for idx in order.tolist():
+            mark = len(self.trail)
+            choice = np.zeros_like(self.domains[sid])
+            choice[idx] = True
+            self._set_domain(sid, choice)
+            self.assigned[sid] = True
+            if self._propagate([sid]) is None:
+                self._record_progress()
+                if self._search():
+                    return True
+            self.assigned[sid] = False
+            self._undo(mark)
+            self.stats["backtracks"] += 1
+        return False
+
+    def _relax(self, base, queue, conflicts):
+        """
+        Root propagation from the queued slots over the base domains. A slot
+        that cannot be made consistent is dropped from the problem and the
+        propagation restarted, so the rest of the grid can still be filled.
+        """
+        names = self.crossword.slot_names
+        while True:
+            self.domains = list(base)
+            self.sizes = np.array([int(m.sum()) for m in base], dtype=np.int64)
+            self.trail = []
+            failure = self._propagate([sid for sid in queue if self.active[sid]])
+            if failure is None:
+                return
+            a, b = failure
+            self.active[a] = False
+            self.stats["relaxed_slots"] += 1
+            conflicts.append((names[a], names[b], "no candidate consistent with crossings"))
+
+    def _prepare(self, conflicts):
+        """Set up the propagated root domains the search starts from."""
+        names = self.crossword.slot_names
+        base = self._initial_domains()
+        for sid, mask in enumerate(base):
+            if self.active[sid] and not mask.any():
+                self.active[sid] = False
+                conflicts.append((names[sid], None, "no candidate matches the letters in the grid"))
+        self._relax(base, np.flatnonzero(self.active).tolist(), conflicts)
+
+    @instrumentation.timed("fill.solve")
+    def solve(self) -> FillResult:
+        """Run propagation and search; the grid itself is not modified (see apply())."""
+        self._started = time.perf_counter()
+        self.stats = {"nodes": 0, "backtracks": 0, "revisions": 0, "wipeouts": 0, "relaxed_slots": 0}
+        self._next_interrupt = 0
+        conflicts = []
+        names = self.crossword.slot_names
+
+        aborted = None
+        # _prepare may pre-assign slots the search should leave alone
+        self.assigned = np.zeros(len(names), dtype=bool)
+        try:
+            self._prepare(conflicts)
+        except SearchAborted as e:
+            aborted = str(e)
+
+        self._best, self._best_filled = {}, -1
+        solved = False
+        if aborted is None:
+            limit = sys.getrecursionlimit()
+            sys.setrecursionlimit(max(limit, 4 * len(names) + 100))
+            try:
+                solved = self._search()
+            except SearchAborted as e:
+                aborted = str(e)
+            finally:
+                sys.setrecursionlimit(limit)
+
+        if solved:
+            chosen = {sid: int(np.flatnonzero(self.domains[sid])[0]) for sid in np.flatnonzero(self.active).tolist()}
+        else:
+            chosen = self._best
+        self.chosen = chosen
+        assignment = {names[sid]: self.words[sid][idx] for sid, idx in chosen.items()}
+
+        if instrumentation.enabled:
+            for name in ("nodes", "backtracks", "wipeouts", "relaxed_slots"):
+                instrumentation.count(f"fill.{name}", self.stats[name])
+        self.stats["solved"] = solved
+        self.stats["aborted"] = aborted
+        self.stats["elapsed"] = time.perf_counter() - self._started
+        return FillResult(
+            assignment=assignment,
+            complete=len(assignment) == len(names),
+            conflicts=conflicts,
+            stats=dict(self.stats),
+        )
+
+    def apply(self, result: FillResult):
+        """Write a result's words into the crossword grid with place_word."""
+        for clue_id, word in result.assignment.items():
+            self.crossword.place_word(clue_id, word)
@@ -0,0 +1,193 @@
+import numpy as np
+
+from grid.regions import slot_adjacency
+from solver.fill_engine import FillEngine, FillResult
+
+
+class IncrementalSolver(FillEngine):
+    """
+    FillEngine that re-solves a grid warm after edits.
+
+    Letters in the grid are constraints, except those this solver wrote
+    itself with apply() and that nobody has overwritten since: a human
+    correction can therefore displace the solver's earlier words, and the
+    next apply() clears the solver letters that are no longer part of the fill.
+
+    It subscribes to the grid's cell changes. The propagated root domains of
+    the last solve are kept, and the next solve() only rebuilds the slots
+    running through edited cells: when letters were only added, their
+    domains are narrowed in place; when a letter was removed or replaced,
+    those slots and their crossing neighbourhood (radius crossings away)
+    restart from their letter-filtered candidates. Every other slot of the
+    previous fill is pinned to its previous word and counts as assigned, so
+    propagation runs from that neighbourhood alone and the search only
+    branches on the rebuilt slots, trying each one's previous word first. A
+    pinned word that the rebuilt slots cannot cross is released back to its
+    letter-filtered candidates.
+
+    Slots further away keep domains pruned under the old letters. If the
+    warm search fails, solve() falls back to a cold solve.
+
+        solver = IncrementalSolver(crossword, candidates)
+        solver.apply(solver.solve())
+        crossword.set_cell(3, 4, "E")       # a human correction
+        solver.apply(solver.solve())        # warm: searches only around (3, 4)
+    """
+
+    def __init__(self, crossword, candidates: dict, radius: int = 1, **kwargs):
+        """
+        Args:
+            crossword (CrosswordGrid): Grid to fill; edits to it are tracked
+            candidates (dict): Clue ID -> ranked candidate words, as for FillEngine
+            radius (int): Crossing hops around a loosened slot that are rebuilt too
+            **kwargs: Passed to FillEngine (budgets, orderings, cancel)
+        """
+        super().__init__(crossword, candidates, **kwargs)
+        self.radius = radius
+        self._has_candidates = self.active.copy()
+        self._adjacency = slot_adjacency(crossword)
+        self._root = None
+        self._letters = None
+        self._dirty = set()
+        self._owned = {}    # cell -> letter written by apply()
+        crossword.subscribe(self._on_cells_changed)
+
+    def _on_cells_changed(self, cells):
+        self._dirty.update(cells.tolist())
+
+    def close(self):
+        """Stop tracking the grid's edits."""
+        self.crossword.unsubscribe(self._on_cells_changed)
+
+    def invalidate(self):
+        """Make the next solve() start cold."""
+        self._root = None
+
+    def _constraint_letters(self):
+        """The grid's letters with cells still holding this solver's own letters blanked."""
+        letters = self.crossword.grid.reshape(-1).copy()
+        for cell, letter in list(self._owned.items()):
+            if letters[cell] == letter:
+                letters[cell] = " "
+            else:
+                del self._owned[cell]
+        return letters
+
+    def _initial_domains(self):
+        flat = self._constraint_letters()
+        return [self._initial_domain(sid, flat) for sid in range(len(self.crossword.slot_cells))]
+
+    def _neighbourhood(self, slots, hops):
+        reached, frontier = set(slots), set(slots)
+        for _ in range(hops):
+            frontier = {other for sid in frontier for other in self._adjacency[sid]} - reached
+            reached |= frontier
+        return reached
+
+    def _prepare(self, conflicts):
+        flat = self._constraint_letters()
+        if self._root is None:
+            self.active = self._has_candidates.copy()
+            super()._prepare(conflicts)
+            self.stats["warm"] = False
+            root = list(self.domains)
+        else:
+            root = self._prepare_warm(flat, conflicts)
+            self.stats["warm"] = True
+        self._root = (root, self.active.copy(), list(conflicts))
+        self._letters = flat.copy()
+        self._dirty.clear()
+
+    def _prepare_warm(self, flat, conflicts) -> list:
+        """
+        Rebuild the slots around the edited cells and pin the rest of the
+        previous fill. Returns the unpropagated domains to keep as the next
+        root: propagated ones would carry this fill's pins.
+        """
+        names = self.crossword.slot_names
+        root_domains, root_active, root_conflicts = self._root
+
+        cells = np.array(sorted(self._dirty), dtype=np.int64)
+        changed = cells[flat[cells] != self._letters[cells]]
+        loosened = bool((self._letters[changed] != " ").any())
+        touched = {int(sid) for sid in self.crossword.cell_slots[changed, :2].ravel() if sid >= 0}
+        reset = self._neighbourhood(touched, self.radius) if loosened else touched
+        reset_names = {names[sid] for sid in reset}
+
+        domains = list(root_domains)
+        self.active = root_active.copy()
+        conflicts.extend(c for c in root_conflicts if c[0] not in reset_names)
+        for sid in reset:
+            mask = self._initial_domain(sid, flat)
+            if not loosened:
+                mask &= root_domains[sid]
+            domains[sid] = mask
+            self.active[sid] = self._has_candidates[sid]
+            if self.active[sid] and not mask.any():
+                self.active[sid] = False
+                conflicts.append((names[sid], None, "no candidate matches the letters in the grid"))
+
+        root = list(domains)
+        pinned = set()
+        for sid, idx in self.chosen.items():
+            if sid not in reset and self.active[sid] and domains[sid][idx]:
+                domains[sid] = np.zeros_like(domains[sid])
+                domains[sid][idx] = True
+                pinned.add(sid)
+
+        # The ring around the rebuilt slots is queued too, so the rebuilt
+        # domains are revised against their pinned or unchanged neighbours
+        while True:
+            self.domains = list(domains)
+            self.sizes = np.array([int(m.sum()) for m in domains], dtype=np.int64)
+            self.trail = []
+            queue = sorted(self._neighbourhood(reset, 1))
+            failure = self._propagate([sid for sid in queue if self.active[sid]])
+            if failure is None:
+                break
+            a, b = failure
+            if a in pinned:
+                # Release the pinned word and rebuild the slot like an edited one
+                pinned.discard(a)
+                reset.add(a)
+                domains[a] = self._initial_domain(a, flat)
+            else:
+                self.active[a] = False
+                self.stats["relaxed_slots"] += 1
+                conflicts.append((names[a], names[b], "no candidate consistent with crossings"))
+        self.assigned[sorted(pinned)] = True
+        self.stats["reset_slots"] = len(reset)
+        self.stats["pinned_slots"] = len(pinned)
+        return root
+
+    def solve(self) -> FillResult:
+        warm = self._root is not None
+        result = super().solve()
+        if warm and not result.stats["solved"] and result.stats["aborted"] is None:
+            self._root = None
+            result = super().solve()
+            result.stats["warm_fallback"] = True
+        if result.stats["aborted"] is not None:
+            # Domains cut short by a budget are not a valid starting point
+            self._root = None
+        self.hints = dict(self.chosen)
+        return result
+
+    def apply(self, result: FillResult):
+        """
+        Write a result into the grid, first clearing letters of this solver's
+        earlier fill that the new one no longer uses.
+        """
+        target = {}
+        for clue_id, word in result.assignment.items():
+            target.update(zip(self.crossword.slot_cells[self.crossword.get_slot_id(clue_id)].tolist(), word))
+        flat = self.crossword.grid.reshape(-1)
+        for cell, letter in list(self._owned.items()):
+            if flat[cell] == letter and target.get(cell) != letter:
+                self.crossword.set_cell(*divmod(cell, self.crossword.width), " ")
+                del self._owned[cell]
+        for clue_id, word in result.assignment.items():
+            cells = self.crossword.slot_cells[self.crossword.get_slot_id(clue_id)].tolist()
+            blank = [cell for cell in cells if flat[cell] == " "]
+            self.crossword.place_word(clue_id, word)
+            self._owned.update((cell, flat[cell]) for cell in blank)
@@ -0,0 +1,120 @@
+import time
+import queue
+import multiprocessing as mp
+
+from solver.fill_engine import FillEngine, FillResult
+from utils import instrumentation
+
+# Named FillEngine configurations a portfolio can race
+STRATEGIES = {
+    "mrv": {"slot_order": "mrv"},
+    "degree": {"slot_order": "degree"},
+    "confidence": {"slot_order": "confidence"},
+    "long": {"slot_order": "long"},
+    "mrv-shuffled": {"slot_order": "mrv", "value_order": "shuffled", "seed": 1},
+}
+DEFAULT_PORTFOLIO = ("mrv", "degree", "confidence", "long")
+
+# Seconds a cancelled worker gets to report before it is terminated
+CANCEL_GRACE = 2.0
+
+
+def _run_strategy(crossword, candidates, name, max_nodes, time_limit, cancel, results):
+    """Worker: solve with one strategy and report (name, FillResult or None, error)."""
+    try:
+        engine = FillEngine(crossword, candidates, max_nodes=max_nodes, time_limit=time_limit,
+                            cancel=cancel, **STRATEGIES[name])
+        results.put((name, engine.solve(), None))
+    except Exception as e:
+        results.put((name, None, f"{type(e).__name__}: {e}"))
+
+
+def _summary(result: FillResult, error) -> dict:
+    if result is None:
+        return {"error": error}
+    stats = result.stats
+    return {key: stats.get(key) for key in ("solved", "aborted", "nodes", "backtracks", "elapsed")}
+
+
+def solve_portfolio(crossword, candidates: dict, strategies=DEFAULT_PORTFOLIO, max_nodes: int = None,
+                    time_limit: float = None) -> FillResult:
+    """
+    Race several fill strategies on the same grid, one process each.
+
+    The first strategy to return a consistent fill of every slot that has
+    candidates wins, and the others are cancelled through a shared event they
+    poll between search nodes. If none finishes within time_limit, the
+    partial fill covering the most slots is returned. The grid itself is not
+    modified; pass the result to FillEngine.apply().
+
+    Args:
+        crossword (CrosswordGrid): Grid to fill; existing letters are respected
+        candidates (dict): Clue ID -> ranked candidate words, as for FillEngine
+        strategies: Names from STRATEGIES
+        max_nodes (int): Node budget per strategy
+        time_limit (float): Wall-clock budget for the whole race in seconds
+
+    Returns:
+        FillResult: The winner's result; stats["strategy"] names it and
+        stats["portfolio"] summarizes every strategy that reported
+    """
+    strategies = list(strategies)
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies {unknown}, expected names from {sorted(STRATEGIES)}.")
+    if not strategies:
+        raise ValueError("A portfolio needs at least one strategy.")
+
+    started = time.perf_counter()
+    ctx = mp.get_context()
+    cancel, results = ctx.Event(), ctx.Queue()
+    with instrumentation.span("fill.portfolio", strategies=len(strategies)):
+        workers = [
+            ctx.Process(target=_run_strategy, daemon=True,
+                        args=(crossword, candidates, name, max_nodes, time_limit, cancel, results))
+            for name in strategies
+        ]
+        for worker in workers:
+            worker.start()
+
+        reports, winner = {}, None
+        deadline = None if time_limit is None else started + time_limit + CANCEL_GRACE
+        while len(reports) < len(workers):
+            timeout = None if deadline is None else max(0.0, deadline - time.perf_counter())
+            try:
+                name, result, error = results.get(timeout=timeout)
+            except queue.Empty:
+                break
+            reports[name] = (result, error)
+            if result is not None and result.stats["solved"]:
+                winner = name
+                break
+
+        # Cooperative cancellation; the queue is drained before joining so
+        # no worker blocks on a full pipe
+        cancel.set()
+        while len(reports) < len(workers):
+            try:
+                name, result, error = results.get(timeout=CANCEL_GRACE)
+            except queue.Empty:
+                break
+            reports[name] = (result, error)
+        for worker in workers:
+            worker.join(timeout=CANCEL_GRACE)
+            if worker.is_alive():
+                worker.terminate()
+                worker.join()
+
+    finished = [name for name in reports if reports[name][0] is not None]
+    if winner is None:
+        if not finished:
+            errors = "; ".join(f"{name}: {error}" for name, (_, error) in reports.items())
+            raise RuntimeError(f"No portfolio strategy returned a result ({errors or 'time limit reached'}).")
+        winner = max(finished, key=lambda name: len(reports[name][0].assignment))
+
+    result = reports[winner][0]
+    result.stats["strategy"] = winner
+    result.stats["portfolio"] = {name: _summary(*reports[name]) for name in reports}
+    result.stats["elapsed"] = time.perf_counter() - started
+    instrumentation.count(f"fill.portfolio_wins.{winner}")
+    return result
@@ -0,0 +1,149 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from grid.grid_builder import EDGE_ACROSS, EDGE_DOWN, EDGE_ACROSS_OFFSET, EDGE_DOWN_OFFSET
+from grid.regions import decompose
+from solver.fill_engine import FillEngine, FillResult
+from utils import instrumentation
+
+# Per-process grid, set once by _init_worker
+_worker = {}
+
+
+def _init_worker(crossword):
+    _worker["crossword"] = crossword
+
+
+def _solve_region(candidates, max_nodes, time_limit) -> FillResult:
+    """Worker: fill one region; slots outside it get no candidates and stay open."""
+    return FillEngine(_worker["crossword"], candidates, max_nodes=max_nodes, time_limit=time_limit).solve()
+
+
+def _region_candidates(crossword, candidates, region, pinned=None) -> dict:
+    names = crossword.slot_names
+    found = {names[sid]: candidates.get(names[sid], []) for sid in region.slots}
+    for clue_id, word in (pinned or {}).items():
+        if clue_id in found:
+            found[clue_id] = [word]
+    return found
+
+
+def boundary_conflicts(crossword, assignment: dict) -> list:
+    """
+    Crossing cells where two assigned words disagree.
+
+    Returns:
+        list[tuple[str, str, str]]: (across clue ID, down clue ID, reason)
+    """
+    names = crossword.slot_names
+    conflicts = []
+    for a, d, i, j in crossword.crossing_edges[
+        :, [EDGE_ACROSS, EDGE_DOWN, EDGE_ACROSS_OFFSET, EDGE_DOWN_OFFSET]
+    ].tolist():
+        across, down = assignment.get(names[a]), assignment.get(names[d])
+        if across is not None and down is not None and across[i] != down[j]:
+            conflicts.append((names[a], names[d], f"'{across}' and '{down}' disagree at a shared cell"))
+    return conflicts
+
+
+def solve_by_regions(crossword, candidates: dict, fixed: dict = None, max_region: int = None,
+                     workers: int = None, max_nodes: int = None, time_limit: float = None) -> FillResult:
+    """
+    Fill a grid region by region on a process pool.
+
+    Fixed answers, plus slots with a single candidate, are written into a
+    copy of the grid first, which usually splits the slot-crossing graph
+    into independent components (see grid.regions.decompose). Each region is
+    solved as its own FillEngine problem, and the pieces are merged. Regions
+    cut apart at a shared slot may pick different words for it; those slots
+    are pinned to the word of the largest region that filled them and the
+    other regions re-solved once. Crossings still in conflict afterwards are
+    reported and their later word dropped. The grid itself is not modified;
+    pass the result to FillEngine.apply().
+
+    Args:
+        crossword (CrosswordGrid): Grid to fill; existing letters are respected
+        candidates (dict): Clue ID -> ranked candidate words, as for FillEngine
+        fixed (dict): Clue ID -> word placed before decomposing
+        max_region (int): Split components above this many slots at cut slots
+        workers (int): Pool size (defaults to os.cpu_count())
+        max_nodes, time_limit: FillEngine budget per region
+
+    Returns:
+        FillResult: Merged fill; stats holds the region count and sizes
+    """
+    import pickle
+
+    started = time.perf_counter()
+    fixed = dict(fixed or {})
+    for clue_id, words in candidates.items():
+        if len(words) == 1 and clue_id not in fixed:
+            fixed[clue_id] = words[0]
+
+    # Work on a copy so the caller's grid and its listeners are untouched
+    work = pickle.loads(pickle.dumps(crossword))
+    conflicts = []
+    for clue_id, word in list(fixed.items()):
+        try:
+            work.place_word(clue_id, word)
+        except ValueError as e:
+            conflicts.append((clue_id, None, str(e)))
+            del fixed[clue_id]
+    regions = decompose(work, fixed=fixed, max_size=max_region)
+
+    with instrumentation.span("fill.regions", regions=len(regions)), \
+            ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(work,)) as pool:
+        jobs = [
+            pool.submit(_solve_region, _region_candidates(work, candidates, region), max_nodes, time_limit)
+            for region in regions
+        ]
+        results = [job.result() for job in jobs]
+
+        # Cut slots filled differently by neighbouring regions: keep the
+        # largest region's word and re-solve the others around it
+        names = work.slot_names
+        pinned = {}
+        for region, result in zip(regions, results):
+            for sid in region.boundary:
+                word = result.assignment.get(names[sid])
+                if word is not None:
+                    pinned.setdefault(names[sid], word)
+        redo = []
+        for k, (region, result) in enumerate(zip(regions, results)):
+            for sid in region.boundary:
+                word = result.assignment.get(names[sid])
+                if word is not None and word != pinned[names[sid]]:
+                    redo.append(k)
+                    break
+        jobs = {
+            k: pool.submit(_solve_region, _region_candidates(work, candidates, regions[k], pinned), max_nodes,
+                           time_limit)
+            for k in redo
+        }
+        for k, job in jobs.items():
+            results[k] = job.result()
+
+    assignment = dict(fixed)
+    for result in results:
+        conflicts.extend(result.conflicts)
+        for clue_id, word in result.assignment.items():
+            assignment.setdefault(clue_id, word)
+    for across, down, reason in boundary_conflicts(work, assignment):
+        conflicts.append((across, down, reason))
+        assignment.pop(down, None)
+
+    stats = {
+        "regions": len(regions),
+        "region_sizes": [len(region) for region in regions],
+        "fixed": len(fixed),
+        "resolved_regions": len(redo),
+        "nodes": sum(r.stats.get("nodes", 0) for r in results),
+        "solved": all(r.stats.get("solved") for r in results),
+        "elapsed": time.perf_counter() - started,
+    }
+    return FillResult(
+        assignment={clue_id: str(word) for clue_id, word in assignment.items()},
+        complete=len(assignment) == len(work.slot_names),
+        conflicts=conflicts,
+        stats=stats,
+    )
@@ -0,0 +1,460 @@
+"""
+Local HTTP solve service.
+
+    python -m solver.service --index answers.xwi [--port 8765] [--workers 4]
+
+POST /solve with a puzzle in the clue_df schema, either as CSV (the
+processed puzzle format) or as JSON (a list of row objects, or
+{"clues": [...]}). The reply holds the fill, a confidence per slot and the
+filled grid. GET /health reports counters.
+
+The (clue, pattern) candidate lookups of concurrent requests are batched
+into one candidate-source call. Nothing else is batched: with the pattern
+source a lookup encodes nothing, and a clue-aware source such as
+retrieval_source encodes the clues of one micro-batch in a single call.
+Parsing, hashing and grid building run on the loop's default thread pool,
+solves on a process pool. Results are cached by puzzle content hash, and
+once max_pending solves are queued new requests get 503 with Retry-After.
+The server only binds loopback addresses.
+"""
+import io
+import os
+import sys
+import json
+import time
+import signal
+import asyncio
+import hashlib
+import argparse
+import ipaddress
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+from grid.grid_builder import CrosswordGrid
+from utils.puzzle_io import normalize_columns
+from utils.validation import validate_clue_df
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+MAX_BODY = 4 * 1024 * 1024
+HASH_COLUMNS = ["number", "start_col", "start_row", "end_col", "end_row", "clue"]
+
+STATUS_TEXT = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+               413: "Payload Too Large", 500: "Internal Server Error", 503: "Service Unavailable"}
+
+
+class RequestError(Exception):
+    """A request the service rejects; carries the HTTP status to answer with."""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def parse_puzzle(body: bytes, content_type: str = "") -> "pd.DataFrame":
+    """Decode a CSV or JSON request body into a clue_df with normalized column names."""
+    import pandas as pd
+
+    try:
+        if "json" in content_type or body.lstrip()[:1] in (b"[", b"{"):
+            data = json.loads(body)
+            records = data.get("clues") if isinstance(data, dict) else data
+            if not isinstance(records, list):
+                raise ValueError("expected a list of clue rows or {\"clues\": [...]}")
+            df = pd.DataFrame.from_records(records)
+        else:
+            df = pd.read_csv(io.BytesIO(body))
+        df = normalize_columns(df)
+        validate_clue_df(df)
+    except (ValueError, KeyError, TypeError, pd.errors.ParserError) as e:
+        raise RequestError(400, f"Invalid puzzle: {e}") from None
+    return df
+
+
+def puzzle_hash(clue_df) -> str:
+    """Content hash over the columns a solve depends on (answers are for checking only)."""
+    table = clue_df[HASH_COLUMNS].sort_values(["start_row", "start_col", "end_row"], kind="stable")
+    return hashlib.sha1(table.to_csv(index=False).encode("utf-8")).hexdigest()
+
+
+class MicroBatcher:
+    """
+    Coalesces concurrent submissions into single calls of a batch function.
+
+    Items submitted within max_delay of each other (or until max_batch items
+    are waiting) are passed to fn together on the executor, and each caller
+    gets back the slice of results for its own items.
+    """
+
+    def __init__(self, fn, max_batch: int = 1024, max_delay: float = 0.005, executor=None):
+        """
+        Args:
+            fn (callable): list of items -> list of results, one per item
+            max_batch (int): Items that trigger an immediate flush
+            max_delay (float): Seconds the first waiting item may wait for company
+            executor: Where fn runs; defaults to a single thread, so fn never
+                runs concurrently with itself
+        """
+        self.fn = fn
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.executor = executor or ThreadPoolExecutor(1, thread_name_prefix="batcher")
+        self._pending = []
+        self._waiting = 0
+        self._timer = None
+        self.stats = {"batches": 0, "items": 0}
+
+    async def submit(self, items) -> list:
+        items = list(items)
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((items, future))
+        self._waiting += len(items)
+        if self._waiting >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.max_delay, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._waiting = self._pending, [], 0
+        if batch:
+            asyncio.ensure_future(self._run(batch))
+
+    async def _run(self, batch):
+        items = [item for chunk, _ in batch for item in chunk]
+        self.stats["batches"] += 1
+        self.stats["items"] += len(items)
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.executor, self.fn, items)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for chunk, future in batch:
+            if not future.done():
+                future.set_result(results[start:start + len(chunk)])
+            start += len(chunk)
+
+
+def _init_worker():
+    # Workers are forked after serve() installed its signal handlers: restore
+    # the defaults so SIGTERM ends a worker, and leave Ctrl-C to the parent
+    signal.set_wakeup_fd(-1)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _solve_job(crossword, candidates, max_nodes, time_limit) -> dict:
+    """Process-pool worker: run the fill search for one puzzle."""
+    from solver.fill_engine import FillEngine
+
+    result = FillEngine(crossword, candidates, max_nodes=max_nodes, time_limit=time_limit).solve()
+    return {
+        "assignment": {clue_id: str(word) for clue_id, word in result.assignment.items()},
+        "complete": result.complete,
+        "conflicts": [list(c) for c in result.conflicts],
+        "stats": {key: result.stats.get(key) for key in ("solved", "aborted", "nodes", "backtracks", "elapsed")},
+    }
+
+
+class SolveService:
+    """
+    asyncio front end for the fill pipeline.
+
+    A request's slots are turned into (clue, pattern) queries, which join
+    those of concurrent requests in one candidate-source call; the fill runs
+    on a process pool. Pandas and grid work (parsing, hashing, building the
+    grid and the reply) runs on the loop's default executor, so the event
+    loop only moves bytes and futures. Confidence is the reciprocal rank of the placed word
+    among its slot's candidates (1.0 for the top candidate).
+    """
+
+    def __init__(self, source, workers: int = None, max_pending: int = None, cache_size: int = 1024,
+                 max_nodes: int = None, time_limit: float = 10.0, limit: int = None,
+                 batch_size: int = 1024, batch_delay: float = 0.005):
+        """
+        Args:
+            source (callable): (clues, patterns) -> candidate word lists, e.g.
+                answer_generation.candidate_cache.pattern_source(index)
+            workers (int): Solve processes (defaults to os.cpu_count())
+            max_pending (int): Solves queued or running before requests get 503;
+                defaults to twice the worker count
+            cache_size (int): Results kept by puzzle hash
+            max_nodes, time_limit: FillEngine budget per puzzle
+            limit (int): Candidates per slot passed to the solver
+            batch_size, batch_delay: MicroBatcher flush thresholds
+        """
+        from answer_generation.candidate_cache import CandidateCache
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = max_pending or 2 * self.workers
+        self.max_nodes = max_nodes
+        self.time_limit = time_limit
+        self.limit = limit
+        self.cache_size = cache_size
+        self.candidates = CandidateCache(source)
+        self.batcher = MicroBatcher(self._lookup, max_batch=batch_size, max_delay=batch_delay)
+        self.pool = None
+        self._results = OrderedDict()   # puzzle hash -> response body
+        self._inflight = {}             # puzzle hash -> future of a running solve
+        self.pending = 0
+        self.stats = {"requests": 0, "solves": 0, "cache_hits": 0, "rejected": 0, "errors": 0}
+
+    def _lookup(self, queries):
+        return self.candidates.get_many([c for c, _ in queries], [p for _, p in queries])
+
+    # ------------------------
+    # Solving
+    # ------------------------
+    async def solve(self, clue_df) -> dict:
+        """Solve one puzzle, sharing the result with identical concurrent or earlier requests."""
+        key = await asyncio.get_running_loop().run_in_executor(None, puzzle_hash, clue_df)
+        if key in self._results:
+            self._results.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return dict(self._results[key], cached=True)
+        if key in self._inflight:
+            self.stats["cache_hits"] += 1
+            return dict(await asyncio.shield(self._inflight[key]), cached=True)
+        if self.pending >= self.max_pending:
+            self.stats["rejected"] += 1
+            raise RequestError(503, "Solver is saturated, retry later.")
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        self.pending += 1
+        try:
+            response = await self._solve(key, clue_df)
+            future.set_result(response)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        finally:
+            self.pending -= 1
+            del self._inflight[key]
+
+        self._results[key] = response
+        if len(self._results) > self.cache_size:
+            self._results.popitem(last=False)
+        return dict(response, cached=False)
+
+    async def _solve(self, key, clue_df) -> dict:
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        crossword, queries = await loop.run_in_executor(None, self._prepare, clue_df)
+        found = await self.batcher.submit(queries)
+        names = crossword.slot_names
+        candidates = {clue_id: words[:self.limit] if self.limit else words for clue_id, words in zip(names, found)}
+
+        outcome = await loop.run_in_executor(
+            self.pool, _solve_job, crossword, candidates, self.max_nodes, self.time_limit
+        )
+        self.stats["solves"] += 1
+        response = await loop.run_in_executor(None, self._reply, key, crossword, candidates, outcome)
+        response["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        return response
+
+    @staticmethod
+    def _prepare(clue_df):
+        """Executor: build the grid and its (clue, pattern) candidate queries."""
+        crossword = CrosswordGrid(clue_df)
+        queries = [(clue, crossword.slot_pattern(clue_id))
+                   for clue, clue_id in zip(crossword.slot_clues, crossword.slot_names)]
+        return crossword, queries
+
+    @staticmethod
+    def _reply(key, crossword, candidates, outcome) -> dict:
+        """Executor: place the solver's fill and assemble the response body."""
+        confidence = {}
+        for clue_id, word in outcome["assignment"].items():
+            crossword.place_word(clue_id, word)
+            confidence[clue_id] = round(1.0 / (1 + candidates[clue_id].index(word)), 4)
+        return {
+            "puzzle_hash": key,
+            "complete": outcome["complete"],
+            "fill": outcome["assignment"],
+            "confidence": confidence,
+            "grid": ["".join(row) for row in crossword.grid.tolist()],
+            "fill_pct": round(float(crossword.calculate_completion_percentage_by_char()), 2),
+            "conflicts": outcome["conflicts"],
+            "stats": outcome["stats"],
+        }
+
+    def health(self) -> dict:
+        return dict(
+            self.stats, pending=self.pending, max_pending=self.max_pending, workers=self.workers,
+            cached_results=len(self._results), batches=self.batcher.stats["batches"],
+            batched_queries=self.batcher.stats["items"], candidate_hit_rate=round(self.candidates.hit_rate(), 4),
+        )
+
+    # ------------------------
+    # HTTP
+    # ------------------------
+    async def _read_request(self, reader):
+        """(method, path, headers, body), or None once the client has closed the connection."""
+        line = await reader.readline()
+        if not line:
+            return None
+        try:
+            method, target, _ = line.decode("latin-1").split(" ", 2)
+        except ValueError:
+            raise RequestError(400, "Malformed request line.") from None
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length > MAX_BODY:
+            raise RequestError(413, f"Body larger than {MAX_BODY} bytes.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    @staticmethod
+    def _write_response(writer, status: int, payload: dict, keep_alive: bool):
+        body = json.dumps(payload).encode("utf-8")
+        head = [
+            f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}",
+            "Content-Type: application/json",
+            f"Content-Length: {len(body)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+        ]
+        if status == 503:
+            head.append("Retry-After: 1")
+        writer.write(("\r\n".join(head) + "\r\n\r\n").encode("latin-1") + body)
+
+    async def handle(self, reader, writer):
+        """Serve requests on one connection until the client closes it or asks to."""
+        try:
+            while True:
+                keep_alive = False
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, path, headers, body = request
+                    keep_alive = headers.get("connection", "").lower() != "close"
+                    status, payload = 200, await self._dispatch(method, path, headers, body)
+                except RequestError as e:
+                    status, payload = e.status, {"error": str(e)}
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except asyncio.CancelledError:
+            # Shutdown: asyncio.streams would log a cancelled handler task as an error
+            pass
+        finally:
+            writer.close()
+
+    async def _dispatch(self, method, path, headers, body) -> dict:
+        if path == "/health":
+            return self.health()
+        if path != "/solve":
+            raise RequestError(404, f"No route for {path}.")
+        if method != "POST":
+            raise RequestError(405, "Use POST /solve.")
+        self.stats["requests"] += 1
+        clue_df = await asyncio.get_running_loop().run_in_executor(
+            None, parse_puzzle, body, headers.get("content-type", "")
+        )
+        return await self.solve(clue_df)
+
+    async def serve(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT, ready=None):
+        """
+        Run until cancelled, or until SIGTERM / SIGINT arrives, which returns
+        normally. ready(port) is called once the socket is listening. Either
+        way queued solves are dropped and the pool is shut down, waiting for
+        running solves (bounded by time_limit), so no worker outlives the service.
+        """
+        if not _is_loopback(host):
+            raise ValueError(f"The solve service only binds loopback addresses, not '{host}'.")
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        stopped = []
+
+        def stop():
+            stopped.append(True)
+            task.cancel()
+
+        handled = []
+        for sig in (signal.SIGTERM, signal.SIGINT):
+            try:
+                loop.add_signal_handler(sig, stop)
+                handled.append(sig)
+            except (NotImplementedError, RuntimeError):
+                pass  # Windows, or not running in the main thread
+        self.pool = ProcessPoolExecutor(self.workers, initializer=_init_worker)
+        try:
+            server = await asyncio.start_server(self.handle, host, port)
+            async with server:
+                if ready is not None:
+                    ready(server.sockets[0].getsockname()[1])
+                await server.serve_forever()
+        except asyncio.CancelledError:
+            if not stopped:
+                raise
+        finally:
+            for sig in handled:
+                loop.remove_signal_handler(sig)
+            self.pool.shutdown(wait=True, cancel_futures=True)
+
+
+def _is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve puzzle solves over HTTP on loopback.")
+    parser.add_argument("--index", required=True, help="PatternIndex file the candidates come from")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="loopback address (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("-j", "--workers", type=int, default=None, help="solve processes (default: CPU count)")
+    parser.add_argument("--max-pending", type=int, default=None, help="queued solves before 503 (default: 2 x workers)")
+    parser.add_argument("--limit", type=int, default=200, help="candidates per slot")
+    parser.add_argument("--max-nodes", type=int, default=None)
+    parser.add_argument("--time-limit", type=float, default=10.0, help="seconds per puzzle")
+    args = parser.parse_args(argv)
+
+    from answer_generation.candidate_cache import pattern_source
+    from answer_generation.pattern_index import PatternIndex
+
+    service = SolveService(
+        pattern_source(PatternIndex.load(args.index), args.limit), workers=args.workers,
+        max_pending=args.max_pending, max_nodes=args.max_nodes, time_limit=args.time_limit,
+    )
+    try:
+        asyncio.run(service.serve(args.host, args.port,
+                                  ready=lambda port: print(f"Serving on http://{args.host}:{port}", flush=True)))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+import os
+import sys
+
+import pandas as pd
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from grid.grid_builder import CrosswordGrid
+
+SAMPLES = os.path.join(ROOT, "data", "puzzle_samples", "processed_puzzle_samples")
+
+# 3x3 word square, the same words across and down:
+#   C A T
+#   A R E
+#   T E N
+SQUARE = {
+    "1-Across": "CAT", "4-Across": "ARE", "5-Across": "TEN",
+    "1-Down": "CAT", "2-Down": "ARE", "3-Down": "TEN",
+}
+
+
+def square_df() -> pd.DataFrame:
+    """clue_df of the word square, with answers."""
+    rows = [
+        # number, start_col, start_row, end_col, end_row, clue, answer
+        (1, 0, 0, 2, 0, "Feline", "CAT"),
+        (4, 0, 1, 2, 1, "Exist", "ARE"),
+        (5, 0, 2, 2, 2, "Decade", "TEN"),
+        (1, 0, 0, 0, 2, "Mouser", "CAT"),
+        (2, 1, 0, 1, 2, "Live", "ARE"),
+        (3, 2, 0, 2, 2, "Perfect score", "TEN"),
+    ]
+    return pd.DataFrame(rows, columns=["number", "start_col", "start_row", "end_col", "end_row", "clue", "answer"])
+
+
+@pytest.fixture
+def square():
+    return CrosswordGrid(square_df())
+
+
+@pytest.fixture
+def square_candidates():
+    """Ranked candidates per slot; the first guesses for 1-Across and 5-Across lead nowhere."""
+    return {
+        "1-Across": ["COT", "CAT"], "4-Across": ["ARE"], "5-Across": ["TIN", "TEN"],
+        "1-Down": ["CAT"], "2-Down": ["ARE"], "3-Down": ["TEN"],
+    }
+
+
+def rows(crossword) -> list:
+    return ["".join(row) for row in crossword.grid.tolist()]
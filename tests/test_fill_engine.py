@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+
+from conftest import SQUARE, rows
+from solver.fill_engine import FillEngine
+
+
+def test_solve_fills_the_square_by_propagation(square, square_candidates):
+    result = FillEngine(square, square_candidates).solve()
+
+    assert result.complete and result.stats["solved"]
+    assert result.assignment == SQUARE
+    assert result.conflicts == []
+    # COT and TIN are pruned by propagation before any branching
+    assert result.stats["backtracks"] == 0
+    # solve() leaves the grid alone; apply() writes the fill
+    assert rows(square) == ["   ", "   ", "   "]
+
+
+def test_apply_writes_the_fill(square, square_candidates):
+    engine = FillEngine(square, square_candidates)
+    engine.apply(engine.solve())
+    assert rows(square) == ["CAT", "ARE", "TEN"]
+    assert square.is_filled()
+
+
+def test_letters_in_the_grid_constrain_the_fill(square):
+    square.set_cell(0, 0, "B")
+    candidates = {"1-Across": ["CAT", "BAT"], "1-Down": ["CAT", "BAT"]}
+    result = FillEngine(square, candidates).solve()
+    assert result.assignment == {"1-Across": "BAT", "1-Down": "BAT"}
+
+
+def test_search_backtracks_out_of_a_dead_end(square):
+    # Propagation at the root cannot rule out the other words; one of the
+    # search's first choices wipes out a crossing slot and is undone
+    candidates = {
+        "1-Across": ["TAR", "NET", "CAT"], "4-Across": ["ERA", "ARE"], "5-Across": ["RAT", "TEN"],
+        "1-Down": ["TAR", "NET", "CAT"], "2-Down": ["ERA", "ARE"], "3-Down": ["RAT", "TEN"],
+    }
+    result = FillEngine(square, candidates).solve()
+    assert result.stats["solved"]
+    assert result.stats["backtracks"] > 0
+    assert result.stats["wipeouts"] > 0
+    assert result.assignment == SQUARE
+
+
+def test_slot_without_candidates_stays_open(square, square_candidates):
+    del square_candidates["5-Across"]
+    result = FillEngine(square, square_candidates).solve()
+    assert not result.complete
+    assert "5-Across" not in result.assignment
+    assert result.assignment["3-Down"] == "TEN"
+
+
+def test_unfillable_slot_is_reported_and_dropped(square, square_candidates):
+    square_candidates["2-Down"] = ["OWL"]
+    engine = FillEngine(square, square_candidates)
+    result = engine.solve()
+    dropped = {clue_id for clue_id, _, _ in result.conflicts}
+    assert dropped and result.stats["relaxed_slots"] == len(dropped)
+    assert all(reason == "no candidate consistent with crossings" for _, _, reason in result.conflicts)
+    # What is left is filled; place_word would raise on a crossing clash
+    assert result.stats["solved"]
+    assert set(result.assignment) == set(SQUARE) - dropped
+    engine.apply(result)
+
+
+def test_node_limit_aborts(square, square_candidates):
+    result = FillEngine(square, square_candidates, max_nodes=1).solve()
+    assert result.stats["aborted"] == "node limit reached"
+    assert not result.stats["solved"]
+
+
+def test_cancel_aborts(square, square_candidates):
+    cancel = threading.Event()
+    cancel.set()
+    result = FillEngine(square, square_candidates, cancel=cancel).solve()
+    assert result.stats["aborted"] == "cancelled"
+
+
+@pytest.mark.parametrize("slot_order", ["mrv", "degree", "confidence", "long"])
+def test_every_slot_order_solves(square, square_candidates, slot_order):
+    result = FillEngine(square, square_candidates, slot_order=slot_order).solve()
+    assert result.assignment == SQUARE
+
+
+def test_unknown_order_raises(square, square_candidates):
+    with pytest.raises(ValueError):
+        FillEngine(square, square_candidates, slot_order="random")
@@ -0,0 +1,78 @@
+import pytest
+
+from conftest import square_df
+from grid.grid_builder import CrosswordGrid
+
+
+def test_place_word_updates_counters(square):
+    square.place_word("1-Across", "cat")
+    assert square.filled_count == 3
+    assert square.slot_filled.tolist() == [3, 0, 0, 1, 1, 1]
+    assert square.is_solved("1-Across")
+    assert not square.is_solved("1-Down")
+    assert square.calculate_completion_percentage_by_char() == pytest.approx(100 * 3 / 9)
+
+
+def test_overlapping_letters_count_once(square):
+    square.place_word("1-Across", "CAT")
+    square.place_word("1-Down", "CAT")
+    assert square.filled_count == 5
+    assert square.solved_slots == {square.get_slot_id("1-Across"), square.get_slot_id("1-Down")}
+
+
+def test_set_cell_fills_and_clears(square):
+    for col, letter in enumerate("ARE"):
+        square.set_cell(1, col, letter)
+    assert square.is_solved("4-Across")
+    square.set_cell(1, 1, " ")
+    assert not square.is_solved("4-Across")
+    assert square.filled_count == 2
+    # Rewriting a letter with itself changes nothing
+    square.set_cell(1, 0, "A")
+    assert square.filled_count == 2
+
+
+def test_is_filled(square):
+    for clue_id, word in (("1-Across", "CAT"), ("4-Across", "ARE"), ("5-Across", "TEN")):
+        assert not square.is_filled()
+        square.place_word(clue_id, word)
+    assert square.is_filled()
+    assert len(square.solved_slots) == 6
+
+
+def test_listeners_see_changed_cells(square):
+    seen = []
+    square.subscribe(lambda cells: seen.append(sorted(cells.tolist())))
+    square.place_word("1-Across", "CAT")
+    square.place_word("1-Down", "CAT")   # (0, 0) already holds C
+    square.set_cell(2, 2, "N")
+    assert seen == [[0, 1, 2], [3, 6], [8]]
+
+
+def test_unsubscribe(square):
+    seen = []
+    listener = seen.append
+    square.subscribe(listener)
+    square.unsubscribe(listener)
+    square.place_word("1-Across", "CAT")
+    assert seen == []
+
+
+@pytest.mark.parametrize("row, col", [(-1, 0), (0, -1), (3, 0), (0, 3)])
+def test_set_cell_rejects_cells_outside_the_grid(square, row, col):
+    with pytest.raises(ValueError, match="outside"):
+        square.set_cell(row, col, "A")
+    assert square.filled_count == 0
+
+
+@pytest.mark.parametrize("letter", ["■", "XY", "", "1", "É", "?"])
+def test_set_cell_rejects_non_letters(square, letter):
+    with pytest.raises(ValueError, match="single letter"):
+        square.set_cell(1, 1, letter)
+    assert square.grid[1, 1] == " "
+
+
+def test_set_cell_rejects_black_squares():
+    crossword = CrosswordGrid(square_df().iloc[[0, 3]])
+    with pytest.raises(ValueError, match="black square"):
+        crossword.set_cell(1, 1, "A")
@@ -0,0 +1,96 @@
+import pytest
+
+from conftest import rows
+
+
+def test_conflicting_word_raises_and_leaves_grid(square):
+    square.place_word("1-Across", "CAT")
+    with pytest.raises(ValueError, match="Conflict"):
+        square.place_word("1-Down", "BAT")
+    assert rows(square) == ["CAT", "   ", "   "]
+    assert square.get_slot_id("1-Down") not in square.placed_slots
+    # A rejected placement leaves nothing to undo
+    assert square.undo()
+    assert not square.undo()
+
+
+def test_wrong_length_raises(square):
+    with pytest.raises(ValueError):
+        square.place_word("1-Across", "CATS")
+
+
+def test_erase_word_keeps_letters_of_placed_crossings(square):
+    square.place_word("1-Across", "CAT")
+    square.place_word("2-Down", "ARE")
+    square.erase_word("1-Across")
+    assert rows(square) == [" A ", " R ", " E "]
+    assert square.get_slot_id("1-Across") not in square.placed_slots
+    assert square.filled_count == 3
+
+
+def test_erase_word_of_unplaced_slot_raises(square):
+    square.set_cell(0, 0, "C")
+    with pytest.raises(ValueError, match="No word placed"):
+        square.erase_word("1-Across")
+    assert rows(square)[0] == "C  "
+
+
+def test_undo_and_redo(square):
+    square.place_word("1-Across", "CAT")
+    square.set_cell(1, 1, "R")
+    sid = square.get_slot_id("1-Across")
+
+    assert square.undo()
+    assert rows(square) == ["CAT", "   ", "   "]
+    assert square.undo()
+    assert rows(square) == ["   ", "   ", "   "]
+    assert sid not in square.placed_slots
+    assert square.filled_count == 0
+    assert not square.solved_slots
+    assert not square.undo()
+
+    assert square.redo()
+    assert rows(square) == ["CAT", "   ", "   "]
+    assert sid in square.placed_slots
+    assert square.is_solved("1-Across")
+    assert square.redo()
+    assert rows(square)[1] == " R "
+    assert not square.redo()
+
+
+def test_undo_of_erase_restores_placement(square):
+    square.place_word("1-Across", "CAT")
+    square.erase_word("1-Across")
+    square.undo()
+    assert rows(square)[0] == "CAT"
+    assert square.get_slot_id("1-Across") in square.placed_slots
+
+
+def test_new_edit_clears_redo(square):
+    square.place_word("1-Across", "CAT")
+    square.undo()
+    square.place_word("4-Across", "ARE")
+    assert not square.redo()
+
+
+def test_rollback_to_checkpoint(square):
+    square.place_word("1-Across", "CAT")
+    mark = square.checkpoint()
+    square.place_word("1-Down", "CAT")
+    square.place_word("5-Across", "TEN")
+    square.set_cell(1, 1, "R")
+
+    square.rollback(mark)
+    assert rows(square) == ["CAT", "   ", "   "]
+    assert square.placed_slots == {square.get_slot_id("1-Across")}
+    assert square.filled_count == 3
+    assert not square.redo()
+
+
+def test_undo_notifies_listeners(square):
+    square.place_word("1-Across", "CAT")
+    seen = []
+    square.subscribe(lambda cells: seen.append(sorted(cells.tolist())))
+    square.undo()
+    square.redo()
+    assert seen == [[0, 1, 2], [0, 1, 2]]
@@ -0,0 +1,77 @@
+import pytest
+
+from conftest import SQUARE, rows
+from solver.incremental import IncrementalSolver
+
+
+@pytest.fixture
+def candidates():
+    """The square, or the same square with B in the corner."""
+    words = {clue_id: [word] for clue_id, word in SQUARE.items()}
+    words["1-Across"] = words["1-Down"] = ["CAT", "BAT"]
+    return words
+
+
+@pytest.fixture
+def solver(square, candidates):
+    solver = IncrementalSolver(square, candidates)
+    solver.apply(solver.solve())
+    yield solver
+    solver.close()
+
+
+def test_first_solve_is_cold(solver, square):
+    assert rows(square) == ["CAT", "ARE", "TEN"]
+    assert solver.stats["warm"] is False
+
+
+def test_resolve_without_edits_searches_nothing(solver):
+    result = solver.solve()
+    assert result.stats["warm"]
+    assert result.stats["nodes"] == 0
+    assert result.stats["reset_slots"] == 0
+    assert result.assignment == SQUARE
+
+
+def test_added_letter_searches_only_its_slots(solver, square):
+    square.set_cell(0, 0, "B")
+    result = solver.solve()
+
+    assert result.stats["warm"] and not result.stats.get("warm_fallback")
+    assert result.stats["reset_slots"] == 2
+    assert result.stats["pinned_slots"] == 4
+    assert result.stats["nodes"] <= 2
+    assert result.assignment == dict(SQUARE, **{"1-Across": "BAT", "1-Down": "BAT"})
+    solver.apply(result)
+    assert rows(square) == ["BAT", "ARE", "TEN"]
+
+
+def test_correction_displaces_solver_letters(solver, square):
+    # (0, 1) was written by the solver; a human A -> O makes CAT and ARE impossible
+    square.set_cell(0, 1, "O")
+    result = solver.solve()
+    assert "1-Across" not in result.assignment
+    assert "2-Down" not in result.assignment
+    assert {clue_id for clue_id, _, _ in result.conflicts} == {"1-Across", "2-Down"}
+
+
+def test_cleared_letter_is_refilled(solver, square):
+    square.set_cell(1, 1, " ")
+    result = solver.solve()
+    assert result.stats["warm"]
+    assert result.assignment == SQUARE
+    solver.apply(result)
+    assert rows(square) == ["CAT", "ARE", "TEN"]
+
+
+def test_apply_keeps_the_human_letter(solver, square):
+    square.set_cell(0, 1, "O")
+    solver.apply(solver.solve())
+    assert rows(square) == ["COT", "ARE", "TEN"]
+
+
+def test_invalidate_starts_cold(solver):
+    solver.invalidate()
+    result = solver.solve()
+    assert result.stats["warm"] is False
+    assert result.assignment == SQUARE
@@ -0,0 +1,74 @@
+import os
+import shutil
+
+import numpy as np
+
+from conftest import SAMPLES, square_df
+from grid import puzzle_cache
+from grid.grid_builder import CrosswordGrid
+from grid.puzzle_cache import PuzzleCache, compile_puzzles, default_cache_path, is_fresh, load_puzzles
+from utils.puzzle_io import load_clue_df, puzzle_name_from_path
+
+PUZZLES = ["crossword_2022_06_05.csv", "crossword_2022_06_12.csv"]
+
+
+def _puzzle_dir(path):
+    os.makedirs(path)
+    for name in PUZZLES:
+        shutil.copy(os.path.join(SAMPLES, name), path)
+    return str(path)
+
+
+def test_from_slots_matches_clue_df(square):
+    df = square_df()
+    built = CrosswordGrid.from_slots(
+        df["number"], df["start_row"], df["start_col"], df["end_row"], df["end_col"], df["clue"], df["answer"]
+    )
+    assert built.slot_names == square.slot_names
+    assert np.array_equal(built.slot_table, square.slot_table)
+    assert [c.tolist() for c in built.cell_slots] == [c.tolist() for c in square.cell_slots]
+
+
+def test_round_trip(tmp_path):
+    source = _puzzle_dir(tmp_path / "puzzles")
+    cache = load_puzzles(source)
+    assert len(cache) == len(PUZZLES)
+    for (name, cached), file in zip(cache, PUZZLES):
+        direct = CrosswordGrid(load_clue_df(os.path.join(source, file)))
+        assert name == puzzle_name_from_path(file)
+        assert cached.slot_names == direct.slot_names
+        assert cached.slot_answers == direct.slot_answers
+        assert np.array_equal(cached.slot_table, direct.slot_table)
+
+
+def test_moved_directory_keeps_its_cache(tmp_path):
+    source = _puzzle_dir(tmp_path / "puzzles")
+    compile_puzzles(source)
+    moved = str(tmp_path / "moved")
+    shutil.copytree(source, moved)
+    assert is_fresh(default_cache_path(moved), moved)
+
+
+def test_edited_source_is_stale(tmp_path):
+    source = _puzzle_dir(tmp_path / "puzzles")
+    compile_puzzles(source)
+    with open(os.path.join(source, PUZZLES[0]), "a", encoding="utf-8") as f:
+        f.write("\n")
+    assert not is_fresh(default_cache_path(source), source)
+
+
+def test_touched_source_is_hashed_once(tmp_path, monkeypatch):
+    source = _puzzle_dir(tmp_path / "puzzles")
+    path = compile_puzzles(source)
+    touched = os.path.join(source, PUZZLES[0])
+    stat = os.stat(touched)
+    os.utime(touched, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    hashed = []
+    real_sha1 = puzzle_cache._sha1
+    monkeypatch.setattr(puzzle_cache, "_sha1", lambda p: hashed.append(p) or real_sha1(p))
+    assert is_fresh(path, source)
+    assert is_fresh(path, source)
+    assert hashed == [touched]
+    # The header rewrite leaves the arrays readable
+    assert PuzzleCache.load(path).names == load_puzzles(source).names
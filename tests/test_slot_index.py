@@ -0,0 +1,57 @@
+import pytest
+
+from conftest import rows, square_df
+from grid.grid_builder import ACROSS, DOWN, SLOT_DIRECTION, SLOT_LENGTH, CrosswordGrid
+
+
+def test_slots_follow_clue_df_rows(square):
+    assert square.slot_names == ["1-Across", "4-Across", "5-Across", "1-Down", "2-Down", "3-Down"]
+    assert square.get_slot_id("2-Down") == 4
+    assert square.slot_table[:, SLOT_DIRECTION].tolist() == [ACROSS] * 3 + [DOWN] * 3
+    assert square.slot_table[:, SLOT_LENGTH].tolist() == [3] * 6
+
+
+def test_slot_cells_are_flat_indices(square):
+    assert square.slot_cells[square.get_slot_id("4-Across")].tolist() == [3, 4, 5]
+    assert square.slot_cells[square.get_slot_id("3-Down")].tolist() == [2, 5, 8]
+    # (1, 2) is the last cell of 4-Across and the middle of 3-Down
+    assert square.cell_slots[5].tolist() == [1, 5, 2, 1]
+
+
+def test_unknown_clue_raises(square):
+    with pytest.raises(ValueError, match="7-Across"):
+        square.get_slot_id("7-Across")
+
+
+def test_clue_lookup(square):
+    assert square.get_clue("3-Down") == "Perfect score"
+    assert square.across_clues[5] == "Decade"
+    assert square.down_clues[2] == "Live"
+
+
+def test_clue_dicts_are_read_only(square):
+    with pytest.raises(TypeError):
+        square.across_clues[1] = "Kitten"
+
+
+def test_slot_pattern_reads_the_grid(square):
+    square.set_cell(0, 1, "A")
+    assert square.slot_pattern("1-Across") == " A "
+    assert square.slot_pattern("2-Down") == "A  "
+
+
+def test_crossing_slots(square):
+    assert square.crossing_slots("4-Across") == [("1-Down", 0, 1), ("2-Down", 1, 1), ("3-Down", 2, 1)]
+
+
+def test_crossing_edges_cover_every_shared_cell(square):
+    # Every cell of the square is shared by one Across and one Down slot
+    assert len(square.crossing_edges) == 9
+    assert sorted(square.crossing_edges[:, -1].tolist()) == list(range(9))
+
+
+def test_black_squares():
+    df = square_df().iloc[[0, 3]]      # only 1-Across and 1-Down
+    crossword = CrosswordGrid(df)
+    assert rows(crossword) == ["   ", " ■■", " ■■"]
+
@@ -0,0 +1,89 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from conftest import SAMPLES, square_df
+from utils.puzzle_io import load_clue_df
+from utils.validation import REPORT_COLUMNS, validate_archive, validate_clue_df
+
+
+def archive(*puzzles) -> pd.DataFrame:
+    """Concatenate (name, clue_df) pairs into an archive frame."""
+    return pd.concat([df.assign(puzzle_name=name) for name, df in puzzles], ignore_index=True)
+
+
+def checks(report) -> list:
+    return sorted(zip(report["puzzle_name"], report["row"], report["check"]))
+
+
+def test_bundled_archive_is_clean():
+    df = load_clue_df(os.path.join(SAMPLES, "all_puzzles.csv"))
+    report = validate_archive(df)
+    assert list(report.columns) == REPORT_COLUMNS
+    assert report.empty
+
+
+def test_clean_square_passes():
+    assert validate_archive(archive(("a", square_df()), ("b", square_df()))).empty
+
+
+def test_frame_without_puzzle_name_is_one_puzzle():
+    assert validate_archive(square_df()).empty
+
+
+def test_missing_column_raises():
+    with pytest.raises(ValueError, match="end_row"):
+        validate_archive(square_df().drop(columns="end_row"))
+
+
+def test_bad_coordinates_and_direction():
+    df = square_df()
+    df.loc[0, "start_col"] = np.nan
+    df.loc[1, "end_row"] = 2          # 4-Across now runs diagonally
+    report = validate_archive(df)
+    assert ("", 0, "coordinates") in checks(report)
+    assert ("", 1, "direction") in checks(report)
+
+
+def test_duplicate_and_overlap():
+    df = pd.concat([square_df(), square_df().iloc[[0]]], ignore_index=True)
+    found = {(row, check) for _, row, check in checks(validate_archive(df))}
+    assert {(0, "duplicate"), (6, "duplicate"), (0, "overlap"), (6, "overlap")} <= found
+
+
+def test_answer_length_and_crossing():
+    df = square_df()
+    df.loc[1, "answer"] = "ARENA"     # 4-Across
+    df.loc[4, "answer"] = "ORE"       # 2-Down disagrees with 1-Across at (0, 1)
+    report = validate_archive(df)
+    found = {(row, check) for _, row, check in checks(report)}
+    assert (1, "answer_length") in found
+    assert {(0, "crossing"), (4, "crossing")} <= found
+    message = report.loc[(report["row"] == 4) & (report["check"] == "crossing"), "message"].iloc[0]
+    assert "1-Across" in message
+
+
+def test_numbering():
+    df = square_df()
+    df.loc[1, "number"] = 7           # 4-Across
+    report = validate_archive(df)
+    assert checks(report) == [("", 1, "numbering")]
+    assert report["message"].iloc[0] == "start cell (1, 0) should be numbered 4"
+
+
+def test_errors_are_reported_per_puzzle():
+    bad = square_df()
+    bad.loc[5, "answer"] = "TON"
+    report = validate_archive(archive(("good", square_df()), ("bad", bad)))
+    assert set(report["puzzle_name"]) == {"bad"}
+    # Rows are labelled by the archive's index: 3-Down of the second puzzle
+    assert 11 in report["row"].tolist()
+
+
+def test_validate_clue_df_rejects_nulls():
+    df = square_df()
+    df.loc[2, "end_col"] = None
+    with pytest.raises(ValueError, match="null"):
+        validate_clue_df(df)
@@ -0,0 +1,18 @@
+"""
+Fingerprints for candidate sources, so a cache file is only ever read back
+through the source (and the data behind it) that filled it.
+"""
+import hashlib
+
+
+def digest(chunks) -> str:
+    """Short blake2b hex digest of an iterable of byte strings."""
+    h = hashlib.blake2b(digest_size=8)
+    for chunk in chunks:
+        h.update(chunk)
+    return h.hexdigest()
+
+
+def source_fingerprint(source) -> str:
+    """What a cache file records about the source that filled it."""
+    return getattr(source, "fingerprint", None) or f"{source.__module__}.{source.__qualname__}"
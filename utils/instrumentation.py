@@ -0,0 +1,154 @@
+"""
+Opt-in timers, counters and spans for the solver's hot paths.
+
+Everything is a no-op until enable() is called: span() hands back a shared
+null context and count() returns after one flag check, so instrumented code
+costs next to nothing in production. When enabled, spans become Chrome
+trace events (load the exported JSON in chrome://tracing or Perfetto) and
+every span also feeds a named timer, grouped per puzzle for the summary.
+"""
+import os
+import json
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+from functools import wraps
+
+enabled = False
+
+_NULL_SPAN = nullcontext()
+ALL_PUZZLES = object()
+_lock = threading.Lock()
+_events = []
+_puzzle = None
+_timers = {}     # puzzle -> name -> [calls, total seconds, max seconds]
+_counters = {}   # puzzle -> name -> value
+_origin = time.perf_counter()
+
+
+def enable():
+    global enabled
+    enabled = True
+
+
+def disable():
+    global enabled
+    enabled = False
+
+
+def reset():
+    """Drop all recorded events, timers and counters."""
+    global _puzzle, _origin
+    with _lock:
+        _events.clear()
+        _timers.clear()
+        _counters.clear()
+        _puzzle = None
+        _origin = time.perf_counter()
+
+
+def set_puzzle(name):
+    """Attribute subsequent timers and counters to a puzzle (None for none)."""
+    global _puzzle
+    _puzzle = name
+
+
+def count(name: str, n: int = 1):
+    """Add n to a named counter."""
+    if not enabled:
+        return
+    with _lock:
+        counters = _counters.setdefault(_puzzle, {})
+        counters[name] = counters.get(name, 0) + n
+
+
+@contextmanager
+def _span(name, args):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        ended = time.perf_counter()
+        elapsed = ended - started
+        event = {
+            "name": name, "cat": name.split(".", 1)[0], "ph": "X",
+            "ts": (started - _origin) * 1e6, "dur": elapsed * 1e6,
+            "pid": os.getpid(), "tid": threading.get_ident(),
+        }
+        if _puzzle is not None or args:
+            event["args"] = dict(args, puzzle=_puzzle) if _puzzle is not None else dict(args)
+        with _lock:
+            _events.append(event)
+            timer = _timers.setdefault(_puzzle, {}).setdefault(name, [0, 0.0, 0.0])
+            timer[0] += 1
+            timer[1] += elapsed
+            timer[2] = max(timer[2], elapsed)
+
+
+def span(name: str, **args):
+    """Context manager timing a block as a trace event and a named timer."""
+    if not enabled:
+        return _NULL_SPAN
+    return _span(name, args)
+
+
+def timed(name: str = None):
+    """Decorator form of span(); the name defaults to the function's qualified name."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not enabled:
+                return fn(*args, **kwargs)
+            with _span(label, {}):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+# ------------------------
+# Export
+# ------------------------
+def summary(puzzle=ALL_PUZZLES) -> dict:
+    """
+    Timers and counters recorded so far.
+
+    Returns:
+        dict: puzzle -> {"timers": {name: {"calls", "total_ms", "mean_ms", "max_ms"}},
+        "counters": {name: value}}; only the given puzzle if one is passed
+    """
+    with _lock:
+        puzzles = set(_timers) | set(_counters)
+        if puzzle is not ALL_PUZZLES:
+            puzzles &= {puzzle}
+        result = {}
+        for p in puzzles:
+            timers = {
+                name: {"calls": calls, "total_ms": total * 1000, "mean_ms": total * 1000 / calls, "max_ms": peak * 1000}
+                for name, (calls, total, peak) in _timers.get(p, {}).items()
+            }
+            result[p] = {"timers": timers, "counters": dict(_counters.get(p, {}))}
+        return result
+
+
+def format_summary(puzzle=ALL_PUZZLES) -> str:
+    """Plain-text table of summary(), one block per puzzle, slowest timers first."""
+    lines = []
+    for p, data in sorted(summary(puzzle).items(), key=lambda item: str(item[0])):
+        lines.append(f"== {p if p is not None else '(no puzzle)'} ==")
+        lines.append(f"{'timer':<32}{'calls':>8}{'total ms':>12}{'mean ms':>10}{'max ms':>10}")
+        for name, t in sorted(data["timers"].items(), key=lambda item: -item[1]["total_ms"]):
+            lines.append(f"{name:<32}{t['calls']:>8}{t['total_ms']:>12.3f}{t['mean_ms']:>10.3f}{t['max_ms']:>10.3f}")
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"{name:<32}{value:>8}")
+    return "\n".join(lines)
+
+
+def export_chrome_trace(path, puzzle=ALL_PUZZLES):
+    """Write recorded spans as Chrome trace-event JSON, with the summary under otherData."""
+    with _lock:
+        events = [e for e in _events if puzzle is ALL_PUZZLES or e.get("args", {}).get("puzzle") == puzzle]
+    other = {str(p): data for p, data in summary(puzzle).items()}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms", "otherData": other}, f)
@@ -0,0 +1,65 @@
+import os
+import glob
+from typing import TYPE_CHECKING
+
+# pandas is imported by the readers that need it, so listing puzzle files stays cheap
+if TYPE_CHECKING:
+    import pandas as pd
+
+ARCHIVE_FILENAME = "all_puzzles.csv"
+
+# The processed CSVs label the checking columns verbosely; the rest of the
+# code base refers to them by these short names.
+COLUMN_RENAMES = {
+    "answer (optional column, for checking only)": "answer",
+    "length (optional column, for checking only)": "length",
+}
+
+
+def normalize_columns(df: "pd.DataFrame") -> "pd.DataFrame":
+    """Rename the verbose optional columns to "answer" / "length"."""
+    return df.rename(columns=COLUMN_RENAMES)
+
+
+def load_clue_df(path) -> "pd.DataFrame":
+    """Read a single-puzzle CSV into a clue_df with normalized column names."""
+    import pandas as pd
+
+    return normalize_columns(pd.read_csv(path))
+
+
+def puzzle_name_from_path(path) -> str:
+    return os.path.splitext(os.path.basename(path))[0]
+
+
+def list_puzzle_files(directory) -> list:
+    """Per-puzzle CSVs in a directory, skipping the combined archive."""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, "*.csv"))
+        if os.path.basename(path) != ARCHIVE_FILENAME
+    )
+
+
+def iter_archive(path, chunksize: int = 10000):
+    """
+    Stream (puzzle_name, clue_df) pairs from a combined archive CSV.
+
+    The archive is read in chunks so only the puzzle being assembled is held in
+    memory. Rows of one puzzle are expected to be contiguous, as written by the
+    ingest step.
+    """
+    import pandas as pd
+
+    pending = None
+    for chunk in pd.read_csv(path, chunksize=chunksize):
+        chunk = normalize_columns(chunk)
+        if pending is not None:
+            chunk = pd.concat([pending, chunk], ignore_index=True)
+        # The last puzzle in a chunk may continue in the next one
+        last_name = chunk["puzzle_name"].iloc[-1]
+        tail = chunk["puzzle_name"] == last_name
+        for name, group in chunk[~tail].groupby("puzzle_name", sort=False):
+            yield name, group.drop(columns="puzzle_name").reset_index(drop=True)
+        pending = chunk[tail]
+    if pending is not None and len(pending):
+        yield pending["puzzle_name"].iloc[0], pending.drop(columns="puzzle_name").reset_index(drop=True)
@@ -1,9 +1,189 @@
-import pandas as pd
+import sys
+import argparse
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+COORDINATE_COLUMNS = ["start_col", "start_row", "end_col", "end_row"]
+REPORT_COLUMNS = ["puzzle_name", "row", "number", "direction", "check", "message"]
+
 
 def validate_clue_df(df):
     required = ["number", "start_col", "start_row", "end_col", "end_row", "clue"]
     for col in required:
         if col not in df.columns:
             raise ValueError(f"Missing required column: {col}")
-    if df[["start_col", "start_row", "end_col", "end_row"]].isnull().any().any():
+    if df[COORDINATE_COLUMNS].isnull().any().any():
         raise ValueError("Coordinate columns contain null values.")
+
+
+def validate_archive(df) -> "pd.DataFrame":
+    """
+    Check every puzzle of an archive at once and report problems per row.
+
+    Runs over the whole table with array operations, grouped by puzzle_name
+    (a frame without that column is treated as a single puzzle). Rows whose
+    coordinates are missing, negative or diagonal are reported and left out
+    of the geometry checks. Checks, as reported in the "check" column:
+
+        coordinates   null or negative coordinates
+        direction     slot is diagonal or runs backwards
+        duplicate     the same number and direction appear more than once
+        length        the length column disagrees with the slot's extent
+        answer_length the answer has a different length than the slot
+        overlap       two slots of the same direction share a cell
+        crossing      an Across and a Down answer disagree on a shared cell
+        numbering     the number does not match the start cell's position
+                      in row-major order of the puzzle's start cells
+
+    Args:
+        df (pd.DataFrame): Archive rows with normalized column names
+
+    Returns:
+        pd.DataFrame: One row per problem with REPORT_COLUMNS; "row" is the
+        index label of the offending archive row. Empty if everything passes.
+    """
+    import pandas as pd
+
+    missing = [col for col in ["number"] + COORDINATE_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+
+    n = len(df)
+    if "puzzle_name" in df.columns:
+        pid, names = pd.factorize(df["puzzle_name"], sort=False)
+    else:
+        pid, names = np.zeros(n, dtype=np.int64), np.array([""], dtype=object)
+    number = pd.to_numeric(df["number"], errors="coerce").to_numpy(dtype=float)
+    coords = df[COORDINATE_COLUMNS].apply(pd.to_numeric, errors="coerce").to_numpy(dtype=float)
+    sc, sr, ec, er = coords.T
+
+    errors = []  # (row positions, check, messages)
+
+    def report(rows, check, message):
+        if len(rows):
+            errors.append((np.asarray(rows), check, message))
+
+    bad_coords = np.isnan(coords).any(axis=1) | (coords < 0).any(axis=1) | np.isnan(number)
+    report(np.flatnonzero(bad_coords), "coordinates", "null, non-numeric or negative coordinates")
+    is_down = sr != er
+    bad_direction = ~bad_coords & ((is_down & (sc != ec)) | (er < sr) | (ec < sc))
+    report(np.flatnonzero(bad_direction), "direction", "slot is diagonal or runs backwards")
+
+    ok = np.flatnonzero(~(bad_coords | bad_direction))
+    lengths = np.nan_to_num(np.where(is_down, er - sr, ec - sc)).astype(np.int64) + 1
+
+    # Same number and direction twice in one puzzle
+    slot_key = pd.DataFrame({"p": pid[ok], "n": number[ok], "d": is_down[ok]})
+    dup = ok[slot_key.duplicated(keep=False).to_numpy()]
+    report(dup, "duplicate", "number and direction appear more than once")
+
+    if "length" in df.columns:
+        declared = pd.to_numeric(df["length"], errors="coerce").to_numpy(dtype=float)
+        rows = ok[~np.isnan(declared[ok]) & (declared[ok] != lengths[ok])]
+        report(rows, "length", [f"length column says {int(declared[i])}, slot spans {lengths[i]}" for i in rows])
+
+    answers = None
+    if "answer" in df.columns:
+        answers = df["answer"].where(df["answer"].notna(), "").astype(str).str.strip().str.upper().to_numpy()
+        answer_len = np.fromiter(map(len, answers), dtype=np.int64, count=n)
+        rows = ok[(answer_len[ok] > 0) & (answer_len[ok] != lengths[ok])]
+        report(rows, "answer_length", [f"answer '{answers[i]}' has {answer_len[i]} letters, slot spans {lengths[i]}"
+                                       for i in rows])
+
+    # One entry per (slot, cell); cells are keyed (puzzle, row, col)
+    cell_row = np.repeat(ok, lengths[ok])
+    offset = np.arange(len(cell_row)) - np.repeat(np.cumsum(lengths[ok]) - lengths[ok], lengths[ok])
+    down = is_down[cell_row]
+    r = sr[cell_row].astype(np.int64) + np.where(down, offset, 0)
+    c = sc[cell_row].astype(np.int64) + np.where(down, 0, offset)
+    cell_key = (pid[cell_row].astype(np.int64) << 40) | (r << 20) | c
+
+    # Overlap: a (cell, direction) covered by more than one slot
+    dir_key = (cell_key << 1) | down
+    order = np.argsort(dir_key, kind="stable")
+    sorted_key = dir_key[order]
+    same = sorted_key[1:] == sorted_key[:-1]
+    clash = np.zeros(len(order), dtype=bool)
+    clash[1:] |= same
+    clash[:-1] |= same
+    report(np.unique(cell_row[order[clash]]), "overlap", "shares a cell with another slot of the same direction")
+
+    # Crossing: letters of the Across and Down entries in a shared cell differ
+    if answers is not None and len(cell_row):
+        has_letter = offset < answer_len[cell_row]
+        text = "".join(answers[ok])
+        letters = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32)
+        starts = np.zeros(n, dtype=np.int64)
+        starts[ok] = np.cumsum(answer_len[ok]) - answer_len[ok]
+        entries = pd.DataFrame({
+            "key": cell_key[has_letter],
+            "row": cell_row[has_letter],
+            "letter": letters[starts[cell_row[has_letter]] + offset[has_letter]],
+        })
+        lettered_down = down[has_letter]
+        crossed = entries[~lettered_down].merge(entries[lettered_down], on="key", suffixes=("_a", "_d"))
+        crossed = crossed[crossed["letter_a"] != crossed["letter_d"]]
+        for own, other in (("row_a", "row_d"), ("row_d", "row_a")):
+            report(crossed[own].to_numpy(), "crossing", [
+                f"disagrees with {_slot_label(number[j], is_down[j])} at a shared cell" for j in crossed[other]
+            ])
+
+    # Numbering: distinct start cells, ranked row-major per puzzle, are numbered 1, 2, 3...
+    start_key = (pid[ok].astype(np.int64) << 40) | (sr[ok].astype(np.int64) << 20) | sc[ok].astype(np.int64)
+    unique, inverse = np.unique(start_key, return_inverse=True)
+    first = np.searchsorted(unique >> 40, unique >> 40, side="left")
+    expected = (np.arange(len(unique)) - first + 1)[inverse]
+    rows = ok[number[ok] != expected]
+    report(rows, "numbering", [f"start cell ({int(sr[i])}, {int(sc[i])}) should be numbered {e}"
+                               for i, e in zip(rows, expected[number[ok] != expected])])
+
+    if not errors:
+        return pd.DataFrame(columns=REPORT_COLUMNS)
+    rows = np.concatenate([e[0] for e in errors]).astype(np.int64)
+    checks = np.concatenate([np.full(len(e[0]), e[1], dtype=object) for e in errors])
+    messages = np.concatenate([
+        np.asarray(e[2], dtype=object) if not isinstance(e[2], str) else np.full(len(e[0]), e[2], dtype=object)
+        for e in errors
+    ])
+    report_df = pd.DataFrame({
+        "puzzle_name": np.asarray(names, dtype=object)[pid[rows]],
+        "row": df.index.to_numpy()[rows],
+        "number": pd.array(np.where(np.isnan(number[rows]), -1, number[rows]).astype(np.int64)),
+        "direction": np.where(is_down[rows], "Down", "Across"),
+        "check": checks,
+        "message": messages,
+    })
+    report_df["_pos"] = rows
+    return report_df.sort_values(["_pos", "check"], kind="stable").drop(columns="_pos").reset_index(drop=True)
+
+
+def _slot_label(number, down) -> str:
+    return f"{int(number)}-{'Down' if down else 'Across'}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Validate every puzzle of an archive CSV.")
+    parser.add_argument("archive", help="all_puzzles.csv archive or a single-puzzle CSV")
+    parser.add_argument("-o", "--output", help="write the per-row error report as CSV")
+    args = parser.parse_args(argv)
+
+    from utils.puzzle_io import load_clue_df
+
+    df = load_clue_df(args.archive)
+    report = validate_archive(df)
+    puzzles = df["puzzle_name"].nunique() if "puzzle_name" in df.columns else 1
+    bad = report["puzzle_name"].nunique()
+    print(f"{len(df)} rows, {puzzles} puzzles: {len(report)} problems in {bad} puzzles")
+    if len(report):
+        print(report["check"].value_counts().to_string())
+    if args.output:
+        report.to_csv(args.output, index=False)
+    return 1 if len(report) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())